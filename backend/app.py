@@ -6,18 +6,21 @@ import uuid
 import logging
 from logging.handlers import RotatingFileHandler
 from config import Config
-from services.resume_parser import ResumeParser
-from services.ai_agent import AIAgent
-from services.document_manager import DocumentManager
-from models.candidate import CandidateStore
+from services import container
+from services.ranking import RankingEngine
+from services.progress import ProgressStream
 from utils.validators import validate_file, validate_document_type
-from utils.exceptions import ValidationError, ProcessingError, NotFoundError
-from routes import candidates, health
+from utils.http import OrjsonProvider, init_compression
+from utils.exceptions import ValidationError, ProcessingError, NotFoundError, ConflictError, OverloadedError
+from routes import candidates, health, ranking, events
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = OrjsonProvider(app)
 CORS(app)
+if Config.COMPRESSION_ENABLED:
+    init_compression(app, min_bytes=Config.COMPRESS_MIN_BYTES, level=Config.COMPRESS_LEVEL)
 
 # Setup logging
 if not os.path.exists('logs'):
@@ -29,11 +32,26 @@ app.logger.addHandler(file_handler)
 app.logger.setLevel(logging.INFO)
 app.logger.info('Resume Parser API startup')
 
-# Initialize services
-resume_parser = ResumeParser(app.config['OLLAMA_MODEL'])
-ai_agent = AIAgent(app.config['OLLAMA_MODEL'])
-document_manager = DocumentManager(app.config['RESUME_FOLDER'])
-candidate_store = CandidateStore(app.config['DATA_FOLDER'])
+# Initialize services (built by the same container the Celery workers use)
+parse_cache = container.parse_cache()
+pdf_extractor = container.pdf_extractor()
+ocr_engine = container.ocr_engine()
+ollama_client = container.ollama_client()
+queue_admission = container.queue_admission()
+resume_parser = container.resume_parser()
+template_cache = container.template_cache()
+ai_agent = container.ai_agent()
+document_manager = container.document_manager()
+candidate_store = container.candidate_store()
+# An empty index is backfilled by the Celery workers (or `python celery_worker.py backfill-ranking`)
+ranking_index = container.ranking_index()
+ranking_engine = RankingEngine(ranking_index)
+duplicate_index = container.duplicate_index()
+progress_publisher = container.progress_publisher()
+progress_stream = (
+    ProgressStream(progress_publisher, heartbeat=Config.SSE_HEARTBEAT, max_seconds=Config.SSE_MAX_SECONDS)
+    if progress_publisher else None
+)
 
 # --- REGISTER ROUTES ---
 candidates.register_routes(
@@ -41,9 +59,12 @@ candidates.register_routes(
     resume_parser=resume_parser,
     ai_agent=ai_agent,
     document_manager=document_manager,
-    candidate_store=candidate_store
+    candidate_store=candidate_store,
+    admission=queue_admission,
 )
-health.register_routes(app)
+health.register_routes(app, parse_cache=parse_cache, template_cache=template_cache, ollama_client=ollama_client)
+ranking.register_routes(app, ranking_engine=ranking_engine, candidate_store=candidate_store)
+events.register_routes(app, progress_stream=progress_stream, candidate_store=candidate_store)
 
 # Error handlers still in app.py
 @app.errorhandler(ValidationError)
@@ -55,6 +76,12 @@ def handle_processing_error(e):
 @app.errorhandler(NotFoundError)
 def handle_not_found_error(e):
     return {"error": str(e), "type": "not_found"}, 404
+@app.errorhandler(ConflictError)
+def handle_conflict_error(e):
+    return {"error": str(e), "type": "conflict"}, 409
+@app.errorhandler(OverloadedError)
+def handle_overloaded_error(e):
+    return {"error": str(e), "type": "overloaded", "retry_after": e.retry_after}, 429, {"Retry-After": str(e.retry_after)}
 @app.errorhandler(Exception)
 def handle_generic_error(e):
     app.logger.error(f'Unhandled exception: {str(e)}', exc_info=True)
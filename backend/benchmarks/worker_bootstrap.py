@@ -0,0 +1,84 @@
+"""
+Benchmark Celery worker bootstrap: building services through the Flask app
+(`from app import ...`) versus the lazy service container.
+
+Each measurement runs in a fresh interpreter against a throwaway data folder,
+so nothing is shared between runs and the real data/ and logs/ stay untouched.
+
+    python benchmarks/worker_bootstrap.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Child program: time worker module import, then the first task of a given kind
+CHILD = r"""
+import json, sys, time
+started = time.perf_counter()
+import config
+config.Config.DATA_FOLDER = sys.argv[3]
+import celery_worker
+from tasks.generate_doc_request import generate_doc_request_background, _generate_for_candidate
+imported = time.perf_counter()
+
+mode, task = sys.argv[1], sys.argv[2]
+if task == "doc_request":
+    # A missing candidate exercises bootstrap and one store lookup without calling Ollama
+    if mode == "app":
+        from app import candidate_store, ai_agent
+        _generate_for_candidate(candidate_store, ai_agent, "missing", None, False)
+    else:
+        generate_doc_request_background.run("missing")
+else:
+    # Everything process_resume_background builds before its first Ollama call
+    if mode == "app":
+        from app import resume_parser, candidate_store, ranking_index, duplicate_index
+    else:
+        from services import container
+        container.resume_parser(), container.candidate_store()
+        container.ranking_index(), container.duplicate_index()
+done = time.perf_counter()
+print(json.dumps({"import": imported - started, "first_task": done - imported}))
+"""
+
+
+def run_once(mode: str, task: str) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+        wall_start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, mode, task, os.path.join(workdir, "data")],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        )
+        wall = time.perf_counter() - wall_start
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    result["wall"] = wall
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'task':<12} {'bootstrap':<10} {'worker import':>14} {'first task':>12} {'process wall':>13}   (median of {args.runs})")
+    for task in ("doc_request", "parse"):
+        for mode in ("app", "container"):
+            runs = [run_once(mode, task) for _ in range(args.runs)]
+            median = {k: statistics.median(r[k] for r in runs) * 1000 for k in ("import", "first_task", "wall")}
+            print(
+                f"{task:<12} {mode:<10} {median['import']:>12.1f}ms {median['first_task']:>10.1f}ms "
+                f"{median['wall']:>11.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
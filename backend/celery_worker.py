@@ -1,5 +1,53 @@
 from celery import Celery
+from celery.signals import worker_ready
+from kombu import Queue
+import logging
 import os
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Dedicated queues so a bulk backfill never sits in front of an interactive request
+PARSING_QUEUE = "parsing"
+MESSAGING_QUEUE = "messaging"
+BULK_QUEUE = "bulk"
+QUEUES = (PARSING_QUEUE, MESSAGING_QUEUE, BULK_QUEUE)
+
+# With the Redis broker 0 is the highest priority. Each step is a separate
+# Redis list ("<queue>" for 0, "<queue>:<step>" otherwise), drained in order.
+PRIORITY_STEPS = [0, 3, 6, 9]
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 3
+PRIORITY_BULK = 9
+PRIORITY_SEP = ":"
+
+TASK_ROUTES = {
+    "tasks.process_resume_background": {"queue": PARSING_QUEUE, "priority": PRIORITY_DEFAULT},
+    "tasks.ocr_document_background": {"queue": PARSING_QUEUE, "priority": PRIORITY_DEFAULT},
+    "tasks.generate_doc_request_background": {"queue": MESSAGING_QUEUE, "priority": PRIORITY_DEFAULT},
+    "tasks.generate_doc_requests_chunk": {"queue": BULK_QUEUE, "priority": PRIORITY_BULK},
+}
+
+
+def queue_settings(queue):
+    """
+    Worker settings for one queue, from CELERY_<QUEUE>_CONCURRENCY and
+    CELERY_<QUEUE>_PREFETCH. Parsing and messaging default to prefetch 1 so a
+    slow LLM call never holds reserved tasks hostage (tail latency); bulk
+    prefetches more for throughput.
+    """
+    defaults = {
+        PARSING_QUEUE: (4, 1),
+        MESSAGING_QUEUE: (2, 1),
+        BULK_QUEUE: (2, 4),
+    }
+    concurrency, prefetch = defaults[queue]
+    prefix = f"CELERY_{queue.upper()}"
+    return {
+        "concurrency": int(os.getenv(f"{prefix}_CONCURRENCY", concurrency)),
+        "prefetch_multiplier": int(os.getenv(f"{prefix}_PREFETCH", prefetch)),
+    }
+
 
 def make_celery(app_name=__name__):
     """
@@ -18,6 +66,17 @@ def make_celery(app_name=__name__):
         accept_content=["json"],
         timezone="UTC",
         enable_utc=True,
+        task_queues=[Queue(name) for name in QUEUES],
+        task_default_queue=PARSING_QUEUE,
+        task_routes=TASK_ROUTES,
+        task_default_priority=PRIORITY_DEFAULT,
+        broker_transport_options={
+            "priority_steps": PRIORITY_STEPS,
+            "sep": PRIORITY_SEP,
+            "queue_order_strategy": "priority",
+        },
+        # Default for a worker consuming every queue; per-queue workers override it
+        worker_prefetch_multiplier=int(os.getenv("CELERY_PREFETCH", 1)),
     )
 
     return celery
@@ -25,10 +84,54 @@ def make_celery(app_name=__name__):
 
 celery_app = make_celery("hire_buddy")
 
+
+def backfill_ranking_index(force=False):
+    """Index every stored candidate for ranking; without `force`, only while the index is empty."""
+    from services import container
+    from services.ranking import backfill_from_store
+
+    index = container.ranking_index()
+    if not force and index.count() > 0:
+        return 0
+    indexed = backfill_from_store(index, container.candidate_store())
+    logger.info(f"Ranking index backfilled with {indexed} candidates")
+    return indexed
+
+
+@worker_ready.connect
+def _backfill_on_worker_ready(**kwargs):
+    # Runs once per worker node rather than on every web process start; upserts make a race harmless
+    try:
+        backfill_ranking_index()
+    except Exception as e:
+        logger.warning(f"Ranking index backfill failed: {e}")
+
 import tasks.parse_resume_llm
 import tasks.generate_doc_request
+import tasks.ocr_document
 
 if __name__ == "__main__":
-    print("✅ Registered Celery tasks:")
-    for task_name in celery_app.tasks.keys():
-        print(f" - {task_name}")
+    # python celery_worker.py <queue>: run a worker for one queue with its own concurrency and prefetch
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill-ranking":
+        # python celery_worker.py backfill-ranking: re-index every stored candidate once
+        logging.basicConfig(level=logging.INFO)
+        print(f"Indexed {backfill_ranking_index(force=True)} candidates for ranking")
+    elif len(sys.argv) > 1 and sys.argv[1] in QUEUES:
+        queue = sys.argv[1]
+        settings = queue_settings(queue)
+        celery_app.conf.worker_prefetch_multiplier = settings["prefetch_multiplier"]
+        celery_app.worker_main([
+            "worker",
+            "--loglevel=info",
+            f"--queues={queue}",
+            f"--concurrency={settings['concurrency']}",
+            f"--hostname={queue}@%h",
+            *sys.argv[2:],
+        ])
+    else:
+        print("✅ Registered Celery tasks:")
+        for task_name in celery_app.tasks.keys():
+            print(f" - {task_name}")
+        print("Queues:")
+        for queue in QUEUES:
+            print(f" - {queue}: {queue_settings(queue)}")
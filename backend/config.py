@@ -9,7 +9,9 @@ class Config:
     DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     
     # File upload settings
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  
+    # Request-level cap sized for batch uploads; each file is still limited to 16MB by validate_file
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 512 * 1024 * 1024))
+    BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', 500))
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'png', 'jpg', 'jpeg'}
     
     # Directories
@@ -24,6 +26,102 @@ class Config:
     OLLAMA_BASE_URL = os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434')
     OLLAMA_MODEL = os.environ.get('OLLAMA_MODEL', 'llama3:instruct')
     OLLAMA_TIMEOUT = 120  # seconds
+    OLLAMA_CONNECT_TIMEOUT = float(os.environ.get('OLLAMA_CONNECT_TIMEOUT', 5))
+    OLLAMA_PARSE_TIMEOUT = float(os.environ.get('OLLAMA_PARSE_TIMEOUT', 90))
+    OLLAMA_MESSAGE_TIMEOUT = float(os.environ.get('OLLAMA_MESSAGE_TIMEOUT', 60))
+    OLLAMA_POOL_SIZE = int(os.environ.get('OLLAMA_POOL_SIZE', 10))
+    OLLAMA_MAX_IN_FLIGHT = int(os.environ.get('OLLAMA_MAX_IN_FLIGHT', 4))
+    OLLAMA_MAX_RETRIES = int(os.environ.get('OLLAMA_MAX_RETRIES', 2))
+    OLLAMA_STREAM_PARSE = os.environ.get('OLLAMA_STREAM_PARSE', 'True').lower() == 'true'
+
+    # Redis shared by the cluster-wide LLM limiter and queue admission (defaults to the Celery broker)
+    REDIS_URL = os.environ.get('REDIS_URL') or os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+    # Cap on concurrent Ollama generations across every worker; a dead worker's slot frees after the lease
+    LLM_CLUSTER_LIMIT_ENABLED = os.environ.get('LLM_CLUSTER_LIMIT_ENABLED', 'True').lower() == 'true'
+    LLM_CLUSTER_MAX_IN_FLIGHT = int(os.environ.get('LLM_CLUSTER_MAX_IN_FLIGHT', 4))
+    LLM_SLOT_LEASE = float(os.environ.get('LLM_SLOT_LEASE', 600))  # seconds
+    LLM_SLOT_TIMEOUT = float(os.environ.get('LLM_SLOT_TIMEOUT', 300))  # seconds to wait for a slot
+    # Circuit breaker: open after this many consecutive failed or over-SLO calls, refuse calls for the cool-down
+    LLM_BREAKER_ENABLED = os.environ.get('LLM_BREAKER_ENABLED', 'True').lower() == 'true'
+    LLM_BREAKER_SHARED = os.environ.get('LLM_BREAKER_SHARED', 'True').lower() == 'true'  # state in Redis
+    LLM_BREAKER_FAILURES = int(os.environ.get('LLM_BREAKER_FAILURES', 5))
+    LLM_BREAKER_COOLDOWN = float(os.environ.get('LLM_BREAKER_COOLDOWN', 30))  # seconds
+    LLM_LATENCY_SLO = float(os.environ.get('LLM_LATENCY_SLO', 45))  # seconds
+    # Read timeouts from p95 latency per 1k prompt chars; the OLLAMA_*_TIMEOUT values become ceilings
+    LLM_ADAPTIVE_TIMEOUT = os.environ.get('LLM_ADAPTIVE_TIMEOUT', 'True').lower() == 'true'
+    LLM_TIMEOUT_HEADROOM = float(os.environ.get('LLM_TIMEOUT_HEADROOM', 2.0))
+    LLM_MIN_TIMEOUT = float(os.environ.get('LLM_MIN_TIMEOUT', 10))  # seconds
+    # Endpoints that enqueue work answer 429 once this many tasks are waiting
+    ADMISSION_ENABLED = os.environ.get('ADMISSION_ENABLED', 'True').lower() == 'true'
+    ADMISSION_QUEUES = os.environ.get('ADMISSION_QUEUES', 'parsing,messaging,bulk').split(',')
+    ADMISSION_MAX_QUEUE_DEPTH = int(os.environ.get('ADMISSION_MAX_QUEUE_DEPTH', 2000))  # per queue
+    ADMISSION_RETRY_AFTER = int(os.environ.get('ADMISSION_RETRY_AFTER', 30))  # seconds, at the limit
+    # Stage events from workers over Redis pub/sub, pushed to browsers as Server-Sent Events
+    PROGRESS_EVENTS_ENABLED = os.environ.get('PROGRESS_EVENTS_ENABLED', 'True').lower() == 'true'
+    SSE_HEARTBEAT = float(os.environ.get('SSE_HEARTBEAT', 15))  # seconds
+    SSE_MAX_SECONDS = float(os.environ.get('SSE_MAX_SECONDS', 600))  # clients reconnect after this
+    # Candidate GETs carry ETags; 0 makes clients revalidate (cheap 304) on every read
+    HTTP_CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', 0))  # seconds
+    # Serve candidate reads from the JSON SQLite keeps per row instead of decoding and re-encoding blobs
+    PRERENDERED_JSON = os.environ.get('PRERENDERED_JSON', 'True').lower() == 'true'
+    # gzip (or brotli, when installed) for JSON responses of at least COMPRESS_MIN_BYTES
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+
+    # Long resumes are split on section boundaries and extracted chunk by chunk in parallel
+    RESUME_CHUNK_CHARS = int(os.environ.get('RESUME_CHUNK_CHARS', 4000))
+    RESUME_MAX_PARALLEL_CHUNKS = int(os.environ.get('RESUME_MAX_PARALLEL_CHUNKS', 4))
+
+    # Skip the LLM when the deterministic extractor clears the threshold on every required field
+    FAST_PATH_ENABLED = os.environ.get('FAST_PATH_ENABLED', 'True').lower() == 'true'
+    FAST_PATH_REQUIRED_FIELDS = os.environ.get(
+        'FAST_PATH_REQUIRED_FIELDS', 'name,email,phone,experience_years,skills'
+    ).split(',')
+    FAST_PATH_MIN_CONFIDENCE = float(os.environ.get('FAST_PATH_MIN_CONFIDENCE', 0.8))
+    # Skill taxonomy (canonical names + aliases); defaults to services/skills_taxonomy.json
+    SKILLS_TAXONOMY_PATH = os.environ.get('SKILLS_TAXONOMY_PATH') or None
+
+    # PDF text extraction: backend (auto|pypdf|PyPDF2), per-file page/time budgets, page-parallelism
+    PDF_BACKEND = os.environ.get('PDF_BACKEND', 'auto')
+    PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+    PDF_TIME_BUDGET = float(os.environ.get('PDF_TIME_BUDGET', 30))
+    PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 8))
+    PDF_MAX_WORKERS = int(os.environ.get('PDF_MAX_WORKERS', 4))
+
+    # OCR for scanned resumes and uploaded identity documents
+    OCR_ENABLED = os.environ.get('OCR_ENABLED', 'True').lower() == 'true'
+    OCR_LANG = os.environ.get('OCR_LANG', 'eng')
+    OCR_MAX_WORKERS = int(os.environ.get('OCR_MAX_WORKERS', 2))
+    OCR_MAX_PAGES = int(os.environ.get('OCR_MAX_PAGES', 10))
+    # Seconds Tesseract may spend on one page image before it is killed
+    OCR_IMAGE_TIMEOUT = float(os.environ.get('OCR_IMAGE_TIMEOUT', 60))
+    TESSERACT_CMD = os.environ.get('TESSERACT_CMD') or None
+
+    # Candidate-to-job BM25 ranking
+    RANKING_MAX_TERMS_PER_DOC = int(os.environ.get('RANKING_MAX_TERMS_PER_DOC', 256))
+    RANKING_SKILL_WEIGHT = float(os.environ.get('RANKING_SKILL_WEIGHT', 3.0))
+
+    # Near-duplicate resumes (MinHash/LSH): link at DEDUPE_THRESHOLD, copy the parse at DEDUPE_REUSE_MIN_SIMILARITY
+    DEDUPE_ENABLED = os.environ.get('DEDUPE_ENABLED', 'True').lower() == 'true'
+    DEDUPE_THRESHOLD = float(os.environ.get('DEDUPE_THRESHOLD', 0.8))
+    DEDUPE_REUSE_PARSE = os.environ.get('DEDUPE_REUSE_PARSE', 'True').lower() == 'true'
+    DEDUPE_REUSE_MIN_SIMILARITY = float(os.environ.get('DEDUPE_REUSE_MIN_SIMILARITY', 0.9))
+
+    # LLM-written document request templates, shared per designation bucket and tone
+    MESSAGE_TEMPLATE_CACHE_ENABLED = os.environ.get('MESSAGE_TEMPLATE_CACHE_ENABLED', 'True').lower() == 'true'
+    MESSAGE_TEMPLATE_TTL = int(os.environ.get('MESSAGE_TEMPLATE_TTL', 7 * 24 * 3600))  # seconds
+    MESSAGE_TEMPLATE_MAX_ENTRIES = int(os.environ.get('MESSAGE_TEMPLATE_MAX_ENTRIES', 500))
+    MESSAGE_TONE = os.environ.get('MESSAGE_TONE', 'formal')
+
+    # Bulk document requests: candidates per Celery chunk and chunks in flight at once
+    BULK_DOC_REQUEST_MAX = int(os.environ.get('BULK_DOC_REQUEST_MAX', 5000))
+    DOC_REQUEST_CHUNK_SIZE = int(os.environ.get('DOC_REQUEST_CHUNK_SIZE', 25))
+    DOC_REQUEST_CONCURRENCY = int(os.environ.get('DOC_REQUEST_CONCURRENCY', 4))
+
+    # Resume parse cache (keyed by file hash + model + prompt version)
+    PARSE_CACHE_ENABLED = os.environ.get('PARSE_CACHE_ENABLED', 'True').lower() == 'true'
+    PARSE_CACHE_MAX_BYTES = int(os.environ.get('PARSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
     
     # Security
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
@@ -1,27 +1,98 @@
 import os
+import re
 import json
 import math
 import sqlite3
-from typing import Dict, Any, Optional
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Sequence, Tuple
+from utils.exceptions import ConflictError
 
 
 class CandidateStore:
     """SQLite-backed store for candidate records."""
 
+    # Plain columns, cheap to select
+    COLUMN_FIELDS = (
+        'id', 'name', 'email', 'curr_company', 'resume_filename', 'resume_path',
+        'status', 'created_at', 'updated_at', 'resume_text', 'duplicate_of',
+    )
+    # JSON blob columns and the value used when they are empty
+    BLOB_FIELDS = {'parsed_data': {}, 'documents': {}, 'document_requests': []}
+    # Individual parsed resume fields, pulled out of parsed_data inside SQLite
+    PARSED_FIELDS = (
+        'phone', 'current_company', 'designation', 'skills', 'experience_years', 'education', 'location',
+    )
+    # Default projection for list pages
+    SUMMARY_FIELDS = (
+        'id', 'name', 'email', 'curr_company', 'status', 'created_at', 'updated_at',
+        'designation', 'skills', 'experience_years', 'location', 'duplicate_of',
+    )
+
+    # Keys of a full record, in the order _row_to_dict returns them
+    RECORD_FIELDS = (
+        'id', 'name', 'email', 'curr_company', 'resume_filename', 'resume_path',
+        'parsed_data', 'documents', 'document_requests', 'status', 'duplicate_of', 'created_at', 'updated_at',
+    )
+
+    # Per-connection tuning. WAL lets Flask readers proceed while Celery workers
+    # write; synchronous=NORMAL is durable across application crashes in WAL mode.
+    CONNECTION_PRAGMAS = (
+        "PRAGMA synchronous = NORMAL",
+        "PRAGMA cache_size = -16000",      # ~16MB page cache
+        "PRAGMA mmap_size = 268435456",    # 256MB memory-mapped reads
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA foreign_keys = ON",
+    )
+    # Size of sqlite3's per-connection prepared statement cache
+    STATEMENT_CACHE_SIZE = 256
+
+    # Full-text search columns and their bm25 weights (candidate_id is stored but not indexed)
+    SEARCH_COLUMNS = {
+        'name': 10.0, 'email': 5.0, 'company': 3.0, 'designation': 4.0,
+        'skills': 6.0, 'location': 3.0, 'resume_text': 1.0,
+    }
+
     def __init__(self, data_folder: str):
         self.data_folder = data_folder
         os.makedirs(self.data_folder, exist_ok=True)
         self.db_path = os.path.join(self.data_folder, 'traqcheck.db')
+        self._local = threading.local()
         self._initialize_database()
 
     def _get_connection(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path, timeout=30)
+        """
+        Return this thread's connection, opening it on first use.
+
+        Connections are reused across calls so prepared statements stay cached;
+        a connection is never shared across threads or carried over a fork.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        conn = sqlite3.connect(self.db_path, timeout=30, cached_statements=self.STATEMENT_CACHE_SIZE)
         conn.row_factory = sqlite3.Row
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
         return conn
 
+    def close(self) -> None:
+        """Close the calling thread's connection, if any."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            if self._local.pid == os.getpid():
+                conn.close()
+            self._local.conn = None
+
     def _initialize_database(self) -> None:
         """Create table if not exists and ensure new columns exist."""
         with self._get_connection() as conn:
+            # journal_mode is persistent on the database file, so setting it once is enough
+            conn.execute("PRAGMA journal_mode = WAL")
+
             # Initial table creation (with new columns)
             conn.execute(
                 """
@@ -44,36 +115,391 @@ class CandidateStore:
 
             # Ensure new columns exist (for backward compatibility)
             existing_cols = {r[1] for r in conn.execute("PRAGMA table_info(candidates)").fetchall()}
-            for col in ["name", "email", "curr_company"]:
+            for col in ["name", "email", "curr_company", "resume_text", "duplicate_of", "api_json", "summary_json"]:
                 if col not in existing_cols:
                     conn.execute(f"ALTER TABLE candidates ADD COLUMN {col} TEXT;")
+
+            # Keyset pagination indexes; ORDER BY must use the bare column to hit them
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_candidates_created ON candidates (created_at, id)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_candidates_status_created ON candidates (status, created_at, id)"
+            )
+
+            # Per-status row counts kept current by triggers, so totals never scan the table
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS candidate_counts (
+                    status TEXT PRIMARY KEY,
+                    cnt INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_candidates_count_insert AFTER INSERT ON candidates
+                BEGIN
+                    INSERT INTO candidate_counts (status, cnt) VALUES (COALESCE(NEW.status, ''), 1)
+                    ON CONFLICT(status) DO UPDATE SET cnt = cnt + 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_candidates_count_delete AFTER DELETE ON candidates
+                BEGIN
+                    UPDATE candidate_counts SET cnt = cnt - 1 WHERE status = COALESCE(OLD.status, '');
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_candidates_count_update AFTER UPDATE OF status ON candidates
+                WHEN OLD.status IS NOT NEW.status
+                BEGIN
+                    UPDATE candidate_counts SET cnt = cnt - 1 WHERE status = COALESCE(OLD.status, '');
+                    INSERT INTO candidate_counts (status, cnt) VALUES (COALESCE(NEW.status, ''), 1)
+                    ON CONFLICT(status) DO UPDATE SET cnt = cnt + 1;
+                END;
+                """
+            )
+            # Resync once at startup in case rows predate the triggers
+            conn.execute("DELETE FROM candidate_counts")
+            conn.execute(
+                """
+                INSERT INTO candidate_counts (status, cnt)
+                SELECT COALESCE(status, ''), COUNT(1) FROM candidates GROUP BY COALESCE(status, '')
+                """
+            )
+
+            # Table-wide change counter bumped by triggers on every write; list ETags derive from it
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS candidate_changes (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    version INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("INSERT OR IGNORE INTO candidate_changes (id, version) VALUES (0, 0)")
+            conn.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS trg_candidates_version_insert AFTER INSERT ON candidates
+                BEGIN
+                    UPDATE candidate_changes SET version = version + 1 WHERE id = 0;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_candidates_version_update AFTER UPDATE ON candidates
+                BEGIN
+                    UPDATE candidate_changes SET version = version + 1 WHERE id = 0;
+                END;
+                CREATE TRIGGER IF NOT EXISTS trg_candidates_version_delete AFTER DELETE ON candidates
+                BEGIN
+                    UPDATE candidate_changes SET version = version + 1 WHERE id = 0;
+                END;
+                """
+            )
+
+            # Batches group candidates created or processed together (bulk upload, bulk requests)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS batches (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT,
+                    total INTEGER,
+                    created_at TEXT
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS batch_items (
+                    batch_id TEXT NOT NULL,
+                    candidate_id TEXT NOT NULL,
+                    PRIMARY KEY (batch_id, candidate_id)
+                )
+                """
+            )
+
+            self._initialize_search_index(conn)
+            self._initialize_rendered_json(conn)
+            conn.commit()
+
+    # Values indexed for one candidate row; {row} is NEW or a table alias
+    _FTS_VALUES_SQL = """
+        {row}.rowid, {row}.id, {row}.name, {row}.email,
+        trim(COALESCE({row}.curr_company, '') || ' ' || COALESCE(json_extract({doc}, '$.parsed_data.current_company'), '')),
+        json_extract({doc}, '$.parsed_data.designation'),
+        (SELECT group_concat(value, ', ') FROM json_each({doc}, '$.parsed_data.skills')),
+        json_extract({doc}, '$.parsed_data.location'),
+        {row}.resume_text
+    """
+    _FTS_COLUMNS_SQL = "rowid, candidate_id, name, email, company, designation, skills, location, resume_text"
+
+    def _fts_values(self, row: str) -> str:
+        # Malformed legacy parsed_data must not make the write itself fail
+        doc = f"(CASE WHEN json_valid({row}.parsed_data) THEN {row}.parsed_data ELSE '{{}}' END)"
+        return self._FTS_VALUES_SQL.format(row=row, doc=doc)
+
+    def _initialize_search_index(self, conn: sqlite3.Connection) -> None:
+        """
+        FTS5 index over identity fields, parsed resume fields and resume text.
+
+        Index rows share the candidates rowid and are maintained by triggers,
+        so every write path (save, update, json_set, bulk status) keeps it
+        current. VACUUM may renumber rowids; call rebuild_search_index after one.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'candidates_fts'"
+        ).fetchone()
+        conn.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS candidates_fts USING fts5(
+                candidate_id UNINDEXED, name, email, company, designation, skills, location, resume_text,
+                tokenize = "unicode61 remove_diacritics 2 tokenchars '+#'",
+                prefix = '2 3'
+            )
+            """
+        )
+        conn.executescript(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_insert AFTER INSERT ON candidates
+            BEGIN
+                INSERT INTO candidates_fts ({self._FTS_COLUMNS_SQL}) SELECT {self._fts_values('NEW')};
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_delete AFTER DELETE ON candidates
+            BEGIN
+                DELETE FROM candidates_fts WHERE rowid = OLD.rowid;
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_candidates_fts_update
+            AFTER UPDATE OF name, email, curr_company, parsed_data, resume_text ON candidates
+            BEGIN
+                DELETE FROM candidates_fts WHERE rowid = OLD.rowid;
+                INSERT INTO candidates_fts ({self._FTS_COLUMNS_SQL}) SELECT {self._fts_values('NEW')};
+            END;
+            """
+        )
+        if not exists:
+            weights = ", ".join(str(w) for w in (0.0, *self.SEARCH_COLUMNS.values()))
+            conn.execute(
+                "INSERT INTO candidates_fts (candidates_fts, rank) VALUES ('rank', ?)",
+                (f"bm25({weights})",),
+            )
+            self._fill_search_index(conn)
+
+    def _fill_search_index(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            f"INSERT INTO candidates_fts ({self._FTS_COLUMNS_SQL}) SELECT {self._fts_values('c')} FROM candidates c"
+        )
+
+    def rebuild_search_index(self) -> None:
+        """Repopulate the full-text index from the candidates table."""
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM candidates_fts")
+            self._fill_search_index(conn)
+            conn.execute("INSERT INTO candidates_fts (candidates_fts) VALUES ('optimize')")
             conn.commit()
 
+    def _render_expr(self, row: str, field: str) -> str:
+        """SQL for one field as JSON, matching what _row_to_dict/_row_to_projection decode to."""
+        doc = f"(CASE WHEN json_valid({row}.parsed_data) THEN {row}.parsed_data ELSE '{{}}' END)"
+        if field in self.BLOB_FIELDS:
+            default = json.dumps(self.BLOB_FIELDS[field])
+            return f"json(CASE WHEN json_valid({row}.{field}) THEN {row}.{field} ELSE '{default}' END)"
+        if field == 'skills':
+            path = "'$.parsed_data.skills'"
+            return (f"json(CASE WHEN json_type({doc}, {path}) IN ('array', 'object') "
+                    f"THEN json_extract({doc}, {path}) ELSE '[]' END)")
+        if field in self.PARSED_FIELDS:
+            # Nested values come back as JSON text from json_extract; "|| ''" drops the JSON
+            # subtype so json_object quotes them as strings too instead of nesting them
+            path = f"'$.parsed_data.{field}'"
+            return (f"(CASE WHEN json_type({doc}, {path}) IN ('array', 'object') "
+                    f"THEN json_extract({doc}, {path}) || '' ELSE json_extract({doc}, {path}) END)")
+        return f"{row}.{field}"
+
+    def _render_object(self, row: str, fields: Sequence[str]) -> str:
+        return "json_object(" + ", ".join(f"'{f}', {self._render_expr(row, f)}" for f in fields) + ")"
+
+    def _initialize_rendered_json(self, conn: sqlite3.Connection) -> None:
+        """
+        Keep each candidate's API JSON next to its row.
+
+        api_json is the full record and summary_json the default list
+        projection, both rendered by SQLite in triggers so every write path
+        keeps them current. Reads can then splice the text into a response
+        without decoding the blobs in Python.
+        """
+        summary_fields = self._normalize_fields(self.SUMMARY_FIELDS)
+
+        def render(row):
+            return (f"api_json = {self._render_object(row, self.RECORD_FIELDS)}, "
+                    f"summary_json = {self._render_object(row, summary_fields)}")
+
+        # Only rendered inputs are listed, so the trigger's own UPDATE does not fire it again
+        watched = ", ".join(self.RECORD_FIELDS)
+        conn.executescript(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_candidates_render_insert AFTER INSERT ON candidates
+            BEGIN
+                UPDATE candidates SET {render('NEW')} WHERE rowid = NEW.rowid;
+            END;
+            CREATE TRIGGER IF NOT EXISTS trg_candidates_render_update AFTER UPDATE OF {watched} ON candidates
+            BEGIN
+                UPDATE candidates SET {render('NEW')} WHERE rowid = NEW.rowid;
+            END;
+            """
+        )
+        # Rows written before the triggers existed
+        conn.execute(
+            f"UPDATE candidates AS c SET {render('c')} "
+            "WHERE c.api_json IS NULL OR c.summary_json IS NULL"
+        )
+
+    _INSERT_SQL = """
+        INSERT INTO candidates (
+            id, name, email, curr_company, resume_filename, resume_path,
+            parsed_data, documents, document_requests, status, created_at, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def _insert_params(self, candidate: Dict[str, Any]) -> tuple:
+        return (
+            candidate.get('id'),
+            candidate.get('name'),
+            candidate.get('email'),
+            candidate.get('curr_company'),
+            candidate.get('resume_filename'),
+            candidate.get('resume_path'),
+            json.dumps(candidate.get('parsed_data') or {}),
+            json.dumps(candidate.get('documents') or {}),
+            json.dumps(candidate.get('document_requests') or []),
+            candidate.get('status'),
+            candidate.get('created_at'),
+            candidate.get('updated_at'),
+        )
+
     def save_candidate(self, candidate: Dict[str, Any]) -> None:
         with self._get_connection() as conn:
-            conn.execute(
+            conn.execute(self._INSERT_SQL, self._insert_params(candidate))
+            conn.commit()
+
+    def save_candidates(self, candidates: List[Dict[str, Any]], batch_id: Optional[str] = None,
+                        batch_kind: str = 'upload') -> None:
+        """Insert many candidates (and optionally their batch) in a single transaction."""
+        with self._get_connection() as conn:
+            conn.executemany(self._INSERT_SQL, [self._insert_params(c) for c in candidates])
+            if batch_id:
+                self._insert_batch(conn, batch_id, batch_kind, [c['id'] for c in candidates])
+            conn.commit()
+
+    def create_batch(self, batch_id: str, kind: str, candidate_ids: List[str]) -> None:
+        with self._get_connection() as conn:
+            self._insert_batch(conn, batch_id, kind, candidate_ids)
+            conn.commit()
+
+    def _insert_batch(self, conn: sqlite3.Connection, batch_id: str, kind: str, candidate_ids: List[str]) -> None:
+        conn.execute(
+            "INSERT INTO batches (id, kind, total, created_at) VALUES (?, ?, ?, ?)",
+            (batch_id, kind, len(candidate_ids), datetime.utcnow().isoformat()),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO batch_items (batch_id, candidate_id) VALUES (?, ?)",
+            [(batch_id, cid) for cid in candidate_ids],
+        )
+
+    def get_batch_progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Aggregate the current status of every candidate in a batch."""
+        with self._get_connection() as conn:
+            batch = conn.execute(
+                "SELECT id, kind, total, created_at FROM batches WHERE id = ?",
+                (batch_id,),
+            ).fetchone()
+            if not batch:
+                return None
+            cur = conn.execute(
                 """
-                INSERT INTO candidates (
-                    id, name, email, curr_company, resume_filename, resume_path,
-                    parsed_data, documents, document_requests, status, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT c.status AS status, COUNT(1) AS cnt
+                FROM batch_items b JOIN candidates c ON c.id = b.candidate_id
+                WHERE b.batch_id = ?
+                GROUP BY c.status
                 """,
-                (
-                    candidate.get('id'),
-                    candidate.get('name'),
-                    candidate.get('email'),
-                    candidate.get('curr_company'),
-                    candidate.get('resume_filename'),
-                    candidate.get('resume_path'),
-                    json.dumps(candidate.get('parsed_data') or {}),
-                    json.dumps(candidate.get('documents') or {}),
-                    json.dumps(candidate.get('document_requests') or []),
-                    candidate.get('status'),
-                    candidate.get('created_at'),
-                    candidate.get('updated_at'),
-                ),
+                (batch_id,),
             )
+            counts = {r['status']: r['cnt'] for r in cur.fetchall()}
+
+        return {
+            'id': batch['id'],
+            'kind': batch['kind'],
+            'total': batch['total'],
+            'created_at': batch['created_at'],
+            'status_counts': counts,
+        }
+
+    def get_batch_statuses(self, batch_id: str) -> Optional[Dict[str, str]]:
+        """Current status of each batch member keyed by candidate id; None if the batch does not exist."""
+        with self._get_connection() as conn:
+            if not conn.execute("SELECT 1 FROM batches WHERE id = ?", (batch_id,)).fetchone():
+                return None
+            cur = conn.execute(
+                """
+                SELECT b.candidate_id AS id, c.status AS status
+                FROM batch_items b JOIN candidates c ON c.id = b.candidate_id
+                WHERE b.batch_id = ?
+                """,
+                (batch_id,),
+            )
+            return {r['id']: r['status'] for r in cur.fetchall()}
+
+    def bulk_update_status(self, candidate_ids: List[str], status: str) -> int:
+        """Set the status of many candidates in one statement; returns rows changed."""
+        if not candidate_ids:
+            return 0
+        now = datetime.utcnow().isoformat()
+        with self._get_connection() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _bulk_ids (id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM _bulk_ids")
+            conn.executemany("INSERT OR IGNORE INTO _bulk_ids (id) VALUES (?)", [(cid,) for cid in candidate_ids])
+            cur = conn.execute(
+                "UPDATE candidates SET status = ?, updated_at = ? WHERE id IN (SELECT id FROM _bulk_ids)",
+                (status, now),
+            )
+            conn.execute("DELETE FROM _bulk_ids")
             conn.commit()
+            return cur.rowcount
+
+    def start_status_batch(self, batch_id: str, kind: str, new_status: str,
+                           candidate_ids: Optional[List[str]] = None,
+                           current_status: Optional[str] = None,
+                           skip_statuses: Sequence[str] = (),
+                           limit: Optional[int] = None) -> List[str]:
+        """
+        Move the selected candidates to new_status with one UPDATE and record
+        them as a batch, in a single transaction. Selects by id list or by
+        current status; rows in skip_statuses are left alone. Returns the ids
+        actually moved.
+        """
+        if candidate_ids is None and current_status is None:
+            raise ValueError("Select candidates by ids or by current status")
+        conditions, params = [], []
+        with self._get_connection() as conn:
+            if candidate_ids is not None:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS _bulk_ids (id TEXT PRIMARY KEY)")
+                conn.execute("DELETE FROM _bulk_ids")
+                conn.executemany("INSERT OR IGNORE INTO _bulk_ids (id) VALUES (?)", [(cid,) for cid in candidate_ids])
+                conditions.append("id IN (SELECT id FROM _bulk_ids)")
+            if current_status is not None:
+                conditions.append("status = ?")
+                params.append(current_status)
+            if skip_statuses:
+                conditions.append(f"status NOT IN ({','.join('?' * len(skip_statuses))})")
+                params.extend(skip_statuses)
+            # LIMIT is not available on UPDATE in every SQLite build, so bound the selection instead
+            selection = f"SELECT rowid FROM candidates WHERE {' AND '.join(conditions)}"
+            if limit is not None:
+                selection += " LIMIT ?"
+                params.append(limit)
+            rows = conn.execute(
+                f"UPDATE candidates SET status = ?, updated_at = ? WHERE rowid IN ({selection}) RETURNING id",
+                [new_status, datetime.utcnow().isoformat(), *params],
+            ).fetchall()
+            moved = [r['id'] for r in rows]
+            if moved:
+                self._insert_batch(conn, batch_id, kind, moved)
+            if candidate_ids is not None:
+                conn.execute("DELETE FROM _bulk_ids")
+            conn.commit()
+            return moved
 
     def get_candidate(self, candidate_id: str) -> Optional[Dict[str, Any]]:
         with self._get_connection() as conn:
@@ -86,73 +512,355 @@ class CandidateStore:
                 return None
             return self._row_to_dict(row)
 
-    def update_candidate(self, candidate_id: str, candidate: Dict[str, Any]) -> None:
-        existing = self.get_candidate(candidate_id)
-        if not existing:
-            raise ValueError(f"Candidate {candidate_id} not found")
+    def get_candidate_json(self, candidate_id: str) -> Optional[Tuple[str, str]]:
+        """The stored API JSON of one candidate and its updated_at, or None if it does not exist."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT api_json, updated_at FROM candidates WHERE id = ?", (candidate_id,)
+            ).fetchone()
+            return (row['api_json'], row['updated_at']) if row else None
 
-        merged = {**existing, **candidate}  # new data overrides old
+    def get_updated_at(self, candidate_id: str) -> Optional[str]:
+        """updated_at of one candidate without reading its blobs; None if it does not exist."""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT updated_at FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+            return row['updated_at'] if row else None
 
+    def get_version(self) -> int:
+        """Counter bumped on every insert, update and delete of a candidate."""
         with self._get_connection() as conn:
-            conn.execute(
-                """
-                UPDATE candidates
-                SET name = ?, email = ?, curr_company = ?, resume_filename = ?, resume_path = ?,
-                    parsed_data = ?, documents = ?, document_requests = ?, status = ?,
-                    created_at = ?, updated_at = ?
-                WHERE id = ?
-                """,
-                (
-                    merged.get('name'),
-                    merged.get('email'),
-                    merged.get('curr_company'),
-                    merged.get('resume_filename'),
-                    merged.get('resume_path'),
-                    json.dumps(merged.get('parsed_data') or {}),
-                    json.dumps(merged.get('documents') or {}),
-                    json.dumps(merged.get('document_requests') or []),
-                    merged.get('status'),
-                    merged.get('created_at'),
-                    merged.get('updated_at'),
-                    candidate_id,
-                ),
+            row = conn.execute("SELECT version FROM candidate_changes WHERE id = 0").fetchone()
+            return int(row[0]) if row else 0
+
+    def get_candidates_by_ids(self, candidate_ids: Sequence[str],
+                              fields: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Projections (SUMMARY_FIELDS by default) for the given ids, keyed by id; missing ids are omitted."""
+        if not candidate_ids:
+            return {}
+        fields = self._normalize_fields(fields or self.SUMMARY_FIELDS)
+        placeholders = ",".join("?" * len(candidate_ids))
+        with self._get_connection() as conn:
+            cur = conn.execute(
+                f"SELECT {', '.join(self._select_expr(f) for f in fields)} FROM candidates WHERE id IN ({placeholders})",
+                list(candidate_ids),
             )
+            return {row['id']: self._row_to_projection(row, fields) for row in cur.fetchall()}
+
+    def update_candidate(self, candidate_id: str, candidate: Dict[str, Any],
+                         expected_updated_at: Optional[str] = None) -> None:
+        """
+        Write only the given columns in a single UPDATE.
+
+        JSON blob columns are replaced wholesale; use set_json_fields or
+        append_document_request to change part of one. updated_at is stamped
+        automatically when not supplied. With expected_updated_at the write
+        only applies if the row is unchanged since it was read.
+
+        Raises:
+            ValueError: If the candidate does not exist or a field is unknown
+            ConflictError: If expected_updated_at no longer matches
+        """
+        assignments, params = self._column_assignments(candidate)
+        self._apply_update(candidate_id, assignments, params, expected_updated_at)
+
+    def set_json_fields(self, candidate_id: str, column: str, values: Dict[str, Any],
+                        changes: Optional[Dict[str, Any]] = None,
+                        expected_updated_at: Optional[str] = None) -> None:
+        """
+        Set paths inside a JSON blob column in place with json_set, e.g.
+        set_json_fields(cid, 'documents', {'$.pan': {...}}), optionally
+        together with plain column changes in the same statement.
+        """
+        if column not in self.BLOB_FIELDS:
+            raise ValueError(f"Not a JSON column: {column}")
+        expr = f"COALESCE({column}, '{json.dumps(self.BLOB_FIELDS[column])}')"
+        json_params = []
+        for path, value in values.items():
+            expr = f"json_set({expr}, ?, json(?))"
+            json_params.extend([path, json.dumps(value)])
+
+        assignments, params = self._column_assignments(changes or {})
+        self._apply_update(
+            candidate_id,
+            [f"{column} = {expr}"] + assignments,
+            json_params + params,
+            expected_updated_at,
+        )
+
+    def append_document_request(self, candidate_id: str, entry: Dict[str, Any],
+                                changes: Optional[Dict[str, Any]] = None) -> None:
+        """Append one entry to the document_requests log without rewriting it."""
+        assignments, params = self._column_assignments(changes or {})
+        self._apply_update(
+            candidate_id,
+            [
+                # Older rows may hold the list double-encoded as a JSON string
+                """document_requests = json_insert(
+                    CASE json_type(document_requests)
+                        WHEN 'array' THEN document_requests
+                        WHEN 'text' THEN json_extract(document_requests, '$')
+                        ELSE '[]'
+                    END, '$[#]', json(?))"""
+            ] + assignments,
+            [json.dumps(entry)] + params,
+            None,
+        )
+
+    def _column_assignments(self, changes: Dict[str, Any]) -> Tuple[List[str], List[Any]]:
+        assignments, params = [], []
+        for key, value in changes.items():
+            if key == 'id':
+                continue
+            if key in self.BLOB_FIELDS:
+                value = json.dumps(value or self.BLOB_FIELDS[key])
+            elif key not in self.COLUMN_FIELDS:
+                raise ValueError(f"Unknown candidate field: {key}")
+            assignments.append(f"{key} = ?")
+            params.append(value)
+        if 'updated_at' not in changes:
+            assignments.append("updated_at = ?")
+            params.append(datetime.utcnow().isoformat())
+        return assignments, params
+
+    def _apply_update(self, candidate_id: str, assignments: List[str], params: List[Any],
+                      expected_updated_at: Optional[str]) -> None:
+        sql = f"UPDATE candidates SET {', '.join(assignments)} WHERE id = ?"
+        params = [*params, candidate_id]
+        if expected_updated_at is not None:
+            sql += " AND updated_at = ?"
+            params.append(expected_updated_at)
+
+        with self._get_connection() as conn:
+            cur = conn.execute(sql, params)
             conn.commit()
+            if cur.rowcount:
+                return
+            exists = conn.execute("SELECT 1 FROM candidates WHERE id = ?", (candidate_id,)).fetchone()
+
+        if not exists:
+            raise ValueError(f"Candidate {candidate_id} not found")
+        raise ConflictError(f"Candidate {candidate_id} was modified concurrently")
+
+    def list_candidates(self, page: int, per_page: int, status: Optional[str] = None,
+                        after: Optional[Tuple[str, str]] = None, with_total: bool = True,
+                        fields: Optional[Sequence[str]] = None, rendered: bool = False) -> Dict[str, Any]:
+        """
+        List candidates newest first.
 
-    def list_candidates(self, page: int, per_page: int, status: Optional[str] = None) -> Dict[str, Any]:
-        offset = (page - 1) * per_page
+        Pass `after` as a (created_at, id) cursor from a previous page's
+        `next_cursor` for keyset pagination; `page` is then ignored and deep
+        pages cost the same as the first. The total comes from the
+        trigger-maintained candidate_counts table and can be skipped entirely.
+
+        `fields` selects a projection (see SUMMARY_FIELDS); None returns full
+        records. JSON blobs are only read and decoded when requested.
+
+        With `rendered`, full records and the default projection come back as
+        their stored JSON text (result['rendered'] is True) instead of dicts.
+        """
+        conditions = []
         params = []
-        where_clause = ""
         if status:
-            where_clause = "WHERE status = ?"
+            conditions.append("status = ?")
             params.append(status)
+        if after:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        offset = 0 if after else (page - 1) * per_page
 
         with self._get_connection() as conn:
-            # total count
-            cur = conn.execute(f"SELECT COUNT(1) as cnt FROM candidates {where_clause}", params)
-            total = int(cur.fetchone()[0])
+            # items (served by idx_candidates_created / idx_candidates_status_created)
+            rendered_column = None
+            if rendered and fields is None:
+                rendered_column = 'api_json'
+            elif rendered and tuple(fields) == self.SUMMARY_FIELDS:
+                rendered_column = 'summary_json'
 
-            # items
+            if rendered_column:
+                select_list = f"id, created_at, {rendered_column}"
+                to_dict = lambda r: r[rendered_column]
+            elif fields is None:
+                select_list = """id, name, email, curr_company, resume_filename, resume_path,
+                       parsed_data, documents, document_requests, status, duplicate_of, created_at, updated_at"""
+                to_dict = self._row_to_dict
+            else:
+                fields = self._normalize_fields(fields)
+                select_list = ", ".join(self._select_expr(f) for f in fields)
+                to_dict = lambda r: self._row_to_projection(r, fields)
             cur = conn.execute(
                 f"""
-                SELECT id, name, email, curr_company, resume_filename, resume_path,
-                       parsed_data, documents, document_requests, status, created_at, updated_at
+                SELECT {select_list}
                 FROM candidates
                 {where_clause}
-                ORDER BY datetime(created_at) DESC
+                ORDER BY created_at DESC, id DESC
                 LIMIT ? OFFSET ?
                 """,
                 (*params, per_page, offset),
             )
-            items = [self._row_to_dict(r) for r in cur.fetchall()]
+            rows = cur.fetchall()
+            items = [to_dict(r) for r in rows]
+
+            total = self._count(conn, status) if with_total else None
+
+        next_cursor = None
+        if len(rows) == per_page:
+            next_cursor = f"{rows[-1]['created_at']},{rows[-1]['id']}"
 
-        pages = max(1, math.ceil(total / per_page)) if per_page else 1
+        pages = None
+        if total is not None:
+            pages = max(1, math.ceil(total / per_page)) if per_page else 1
         return {
             'items': items,
             'total': total,
             'pages': pages,
+            'next_cursor': next_cursor,
+            'rendered': rendered_column is not None,
         }
 
+    def search_candidates(self, query: str, page: int, per_page: int, status: Optional[str] = None,
+                          with_total: bool = True, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Full-text search ranked by weighted bm25 (best match first).
+
+        `query` uses the syntax of build_search_query. Each item is the
+        requested projection (SUMMARY_FIELDS by default) plus `score`
+        (higher is better) and a highlighted `snippet`.
+
+        Raises:
+            ValueError: If the query has no searchable terms or is malformed
+        """
+        match = self.build_search_query(query)
+        fields = self._normalize_fields(fields or self.SUMMARY_FIELDS)
+        # A correlated lookup keeps the planner driving from the FTS index; a JOIN on status scans candidates
+        status_filter = (
+            "AND (SELECT status FROM candidates WHERE rowid = candidates_fts.rowid) = ?" if status else ""
+        )
+        match_params = [match, status] if status else [match]
+
+        try:
+            with self._get_connection() as conn:
+                cur = conn.execute(
+                    f"""
+                    WITH hits AS (
+                        SELECT candidates_fts.rowid AS hit_rowid,
+                               candidates_fts.rank AS rank,
+                               snippet(candidates_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet
+                        FROM candidates_fts
+                        WHERE candidates_fts MATCH ? {status_filter}
+                        ORDER BY candidates_fts.rank
+                        LIMIT ? OFFSET ?
+                    )
+                    SELECT {', '.join(self._select_expr(f) for f in fields)}, hits.rank, hits.snippet
+                    FROM hits JOIN candidates ON candidates.rowid = hits.hit_rowid
+                    ORDER BY hits.rank
+                    """,
+                    (*match_params, per_page, (page - 1) * per_page),
+                )
+                items = []
+                for row in cur.fetchall():
+                    item = self._row_to_projection(row, fields)
+                    item['score'] = round(-row['rank'], 4)
+                    item['snippet'] = row['snippet']
+                    items.append(item)
+
+                total = None
+                if with_total:
+                    total = conn.execute(
+                        f"SELECT COUNT(1) FROM candidates_fts WHERE candidates_fts MATCH ? {status_filter}",
+                        match_params,
+                    ).fetchone()[0]
+        except sqlite3.OperationalError as e:
+            # FTS5 reports query syntax problems (e.g. a bare NOT) as OperationalError
+            if 'fts5' in str(e) or 'syntax' in str(e):
+                raise ValueError(f"Invalid search query: {query}")
+            raise
+
+        pages = None
+        if total is not None:
+            pages = max(1, math.ceil(total / per_page)) if per_page else 1
+        return {'items': items, 'total': total, 'pages': pages, 'query': match}
+
+    _SEARCH_TOKEN_RE = re.compile(r'(?:(?P<column>[a-z_]+):)?(?:"(?P<phrase>[^"]*)"|(?P<term>[^\s"]+))')
+
+    @classmethod
+    def build_search_query(cls, query: str) -> str:
+        """
+        Turn user input into a safe FTS5 MATCH expression.
+
+        Terms are ANDed; `OR` and `NOT` (upper case) are passed through,
+        `term*` is a prefix query, "quoted words" a phrase, and
+        `column:term` restricts a term to one of SEARCH_COLUMNS.
+        Everything else is quoted, so user input can never break the syntax.
+        """
+        parts: List[str] = []
+        for match in cls._SEARCH_TOKEN_RE.finditer(query or ''):
+            column, phrase, term = match.group('column'), match.group('phrase'), match.group('term')
+            if term in ('OR', 'NOT') and not column:
+                if parts and parts[-1] not in ('OR', 'NOT'):
+                    parts.append(term)
+                continue
+            if column and column not in cls.SEARCH_COLUMNS:
+                # Not a column filter after all ("c++:" or a URL); search the text as typed
+                term, column = match.group(0), None
+            text = phrase if phrase is not None else term
+            prefix = phrase is None and text.endswith('*')
+            text = text.rstrip('*').replace('"', '')
+            if not re.search(r'\w', text):
+                continue
+            expr = f'"{text}"' + ('*' if prefix else '')
+            parts.append(f'{column} : {expr}' if column else expr)
+        while parts and parts[-1] in ('OR', 'NOT'):
+            parts.pop()
+        if not parts:
+            raise ValueError("Search query has no searchable terms")
+        return ' '.join(parts)
+
+    def _count(self, conn: sqlite3.Connection, status: Optional[str]) -> int:
+        if status:
+            row = conn.execute("SELECT cnt FROM candidate_counts WHERE status = ?", (status,)).fetchone()
+            return int(row[0]) if row else 0
+        return int(conn.execute("SELECT COALESCE(SUM(cnt), 0) FROM candidate_counts").fetchone()[0])
+
+    @staticmethod
+    def parse_cursor(cursor: str) -> Tuple[str, str]:
+        """Split an `after` cursor of the form '<created_at>,<id>'."""
+        created_at, sep, candidate_id = (cursor or '').partition(',')
+        if not sep or not created_at or not candidate_id:
+            raise ValueError("Cursor must be of the form '<created_at>,<id>'")
+        return created_at, candidate_id
+
+    def _normalize_fields(self, fields: Sequence[str]) -> List[str]:
+        """Validate a projection; id and created_at are always kept for cursors."""
+        allowed = set(self.COLUMN_FIELDS) | set(self.BLOB_FIELDS) | set(self.PARSED_FIELDS)
+        unknown = [f for f in fields if f not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        normalized = ['id', 'created_at']
+        for f in fields:
+            if f not in normalized:
+                normalized.append(f)
+        return normalized
+
+    def _select_expr(self, field: str) -> str:
+        if field in self.PARSED_FIELDS:
+            # Malformed legacy blobs read as missing instead of failing the whole query
+            return (f"CASE WHEN json_valid(parsed_data) "
+                    f"THEN json_extract(parsed_data, '$.parsed_data.{field}') END AS {field}")
+        return field
+
+    def _row_to_projection(self, row: sqlite3.Row, fields: Sequence[str]) -> Dict[str, Any]:
+        item = {}
+        for f in fields:
+            value = row[f]
+            if f in self.BLOB_FIELDS:
+                value = self._safe_json_load(value, self.BLOB_FIELDS[f])
+            elif f == 'skills':
+                # json_extract returns arrays as JSON text
+                value = self._safe_json_load(value, [])
+            item[f] = value
+        return item
+
     def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
         return {
             'id': row['id'],
@@ -165,6 +873,7 @@ class CandidateStore:
             'documents': self._safe_json_load(row['documents'], {}),
             'document_requests': self._safe_json_load(row['document_requests'], []),
             'status': row['status'],
+            'duplicate_of': row['duplicate_of'],
             'created_at': row['created_at'],
             'updated_at': row['updated_at'],
         }
@@ -1,29 +1,95 @@
-from flask import Blueprint, current_app, request, jsonify, send_from_directory
+from flask import Blueprint, Response, current_app, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
+from celery import chain, group
 from datetime import datetime
+import csv
+import hashlib
+import io
 import uuid
-from tasks.generate_doc_request import generate_doc_request_background
+import zipfile
+from tasks.generate_doc_request import generate_doc_request_background, generate_doc_requests_chunk
 from tasks.parse_resume_llm import process_resume_background
-from utils.exceptions import ValidationError, ProcessingError, NotFoundError
+from tasks.ocr_document import ocr_document_background
+from celery_worker import (
+    PARSING_QUEUE, MESSAGING_QUEUE, BULK_QUEUE, PRIORITY_INTERACTIVE, PRIORITY_BULK,
+)
+from utils.exceptions import ValidationError, ProcessingError, NotFoundError, OverloadedError
 from celery.exceptions import TimeoutError, OperationalError
 from utils.validators import validate_file, validate_document_type
+from utils.http import raw_json_response
 import os
 
 bp = Blueprint("candidates", __name__)
 
+RESUME_EXTENSIONS = {"pdf", "docx", "doc"}
+MAX_RESUME_BYTES = 16 * 1024 * 1024
+
+# Statuses a batch member can sit in while its background task is still running / after it failed
+IN_PROGRESS_STATUSES = {"parsing_resume", "document_request_pending"}
+FAILED_STATUSES = {"parse_failed", "task_failed", "document_request_failed"}
+
 # Dependency injection globals
-g_resume_parser = g_ai_agent = g_document_manager = g_candidate_store = None
+g_resume_parser = g_ai_agent = g_document_manager = g_candidate_store = g_admission = None
 
 
-def register_routes(app, *, resume_parser, ai_agent, document_manager, candidate_store):
-    global g_resume_parser, g_ai_agent, g_document_manager, g_candidate_store
+def register_routes(app, *, resume_parser, ai_agent, document_manager, candidate_store, admission=None):
+    global g_resume_parser, g_ai_agent, g_document_manager, g_candidate_store, g_admission
     g_resume_parser = resume_parser
     g_ai_agent = ai_agent
     g_document_manager = document_manager
     g_candidate_store = candidate_store
+    g_admission = admission
     app.register_blueprint(bp)
 
 
+def _admit(tasks=1, queue=None):
+    """Raise OverloadedError (429 + Retry-After) before accepting work the queue cannot absorb."""
+    if g_admission is not None:
+        g_admission.admit(tasks, queue=queue)
+
+
+def _parse_fields(fields_arg):
+    """Projection named by a fields=a,b,c argument; unknown names are a 400."""
+    return validate_fields([f.strip() for f in fields_arg.split(",") if f.strip()])
+
+
+def validate_fields(fields):
+    """Return `fields` if it is a list of known projection names, else raise ValidationError (400)."""
+    if not isinstance(fields, list) or not all(isinstance(f, str) for f in fields):
+        raise ValidationError("fields must be a list of field names")
+    allowed = set(g_candidate_store.RECORD_FIELDS) | set(g_candidate_store.PARSED_FIELDS)
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def _etag(*parts):
+    return hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+
+
+def _cache_control():
+    max_age = current_app.config.get("HTTP_CACHE_MAX_AGE", 0)
+    return f"private, max-age={max_age}" if max_age > 0 else "private, no-cache"
+
+
+def _not_modified(etag):
+    """A bodiless 304 if the client already holds `etag`, else None."""
+    # Weak comparison: compression turns the tag weak, and If-None-Match compares weakly anyway
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = _cache_control()
+    return response
+
+
+def _cacheable(response, etag):
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = _cache_control()
+    return response
+
+
 @bp.route("/uploads/<path:filename>")
 def serve_upload(filename):
     uploads_dir = os.path.join(current_app.root_path, "uploads")
@@ -36,6 +102,7 @@ def upload_resume():
     Upload a resume and create a new candidate.
     Required form fields: file, name, email, curr_company
     """
+    _admit(queue=PARSING_QUEUE)
 
     try:
         # --- Validate uploaded file ---
@@ -90,13 +157,14 @@ def upload_resume():
 
         # --- Trigger Celery background task ---
         try:
-            task_result = process_resume_background.delay(candidate_id, resume_path)
+            task_result = process_resume_background.apply_async(
+                (candidate_id, resume_path), priority=PRIORITY_INTERACTIVE
+            )
             if not task_result or not hasattr(task_result, "id"):
                 raise ProcessingError("Failed to enqueue Celery task")
         except Exception as e:
             # Update candidate status to failed if Celery task fails
-            candidate["status"] = "task_failed"
-            g_candidate_store.update_candidate(candidate_id, candidate)
+            g_candidate_store.update_candidate(candidate_id, {"status": "task_failed"})
             raise ProcessingError(f"Celery task submission failed: {e}")
 
         # --- Return success response ---
@@ -123,54 +191,479 @@ def upload_resume():
         return jsonify({"error": f"Unexpected error: {e}"}), 500
 
 
+@bp.route("/candidates/upload-batch", methods=["POST"])
+def upload_resume_batch():
+    """
+    Upload many resumes in one request and parse them as a single Celery group.
+    Either:
+      - files: several resume files, with name/email/curr_company repeated once per
+        file in the same order, or described by a manifest
+      - archive: one ZIP of resumes, described by a manifest
+    manifest: CSV with columns filename, name, email, curr_company
+    """
+    try:
+        archive = request.files.get("archive")
+        files = [f for f in request.files.getlist("files") if f and f.filename.strip()]
+        if not archive and not files:
+            raise ValidationError("No files provided: send 'files' or a ZIP 'archive'")
+
+        manifest = _read_manifest(request.files["manifest"]) if "manifest" in request.files else None
+        if archive and manifest is None:
+            raise ValidationError("A CSV 'manifest' is required when uploading a ZIP archive")
+
+        batch_id = str(uuid.uuid4())
+        max_files = current_app.config.get("BATCH_MAX_FILES", 500)
+        candidates, rejected = [], []
+
+        def add_candidates(entries):
+            """Save validated (filename, meta, save) entries, once the queue can take one parse task each."""
+            if entries:
+                _admit(len(entries), queue=BULK_QUEUE)
+            for original_name, meta, save in entries:
+                add_candidate(original_name, meta, save)
+
+        def add_candidate(original_name, meta, save):
+            candidate_id = str(uuid.uuid4())
+            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            unique_filename = f"{candidate_id}_{timestamp}_{secure_filename(original_name)}"
+            try:
+                resume_path = save(unique_filename)
+            except Exception as e:
+                rejected.append({"filename": original_name, "error": f"Failed to save resume file: {e}"})
+                return
+            now = datetime.utcnow().isoformat()
+            candidates.append({
+                "id": candidate_id,
+                "name": meta["name"],
+                "email": meta["email"],
+                "curr_company": meta["curr_company"],
+                "resume_filename": unique_filename,
+                "resume_path": resume_path,
+                "parsed_data": None,
+                "documents": {"pan": None, "aadhaar": None},
+                "document_requests": [],
+                "status": "parsing_resume",
+                "created_at": now,
+                "updated_at": now,
+            })
+
+        if archive:
+            validate_file(archive, {"zip"})
+            try:
+                zf = zipfile.ZipFile(archive.stream)
+            except zipfile.BadZipFile:
+                raise ValidationError("Archive is not a valid ZIP file")
+            with zf:
+                members = [
+                    m for m in zf.infolist()
+                    if not m.is_dir() and not m.filename.startswith("__MACOSX/")
+                ]
+                if len(members) > max_files:
+                    raise ValidationError(f"Batch exceeds maximum of {max_files} files")
+                entries = []
+                for member in members:
+                    original_name = os.path.basename(member.filename)
+                    meta = manifest.get(original_name)
+                    error = _validate_batch_entry(original_name, member.file_size, meta)
+                    if error:
+                        rejected.append({"filename": original_name, "error": error})
+                        continue
+                    entries.append((original_name, meta, lambda fn, m=member: _save_zip_member(zf, m, fn)))
+                # Members are read while the archive is still open
+                add_candidates(entries)
+        else:
+            if len(files) > max_files:
+                raise ValidationError(f"Batch exceeds maximum of {max_files} files")
+            if manifest is None:
+                names = request.form.getlist("name")
+                emails = request.form.getlist("email")
+                companies = request.form.getlist("curr_company")
+                if not (len(names) == len(emails) == len(companies) == len(files)):
+                    raise ValidationError(
+                        "Provide name, email and curr_company once per file, or a CSV manifest"
+                    )
+                metas = [
+                    {"name": n, "email": e, "curr_company": c}
+                    for n, e, c in zip(names, emails, companies)
+                ]
+            else:
+                metas = [manifest.get(f.filename) for f in files]
+
+            entries = []
+            for file, meta in zip(files, metas):
+                try:
+                    validate_file(file, RESUME_EXTENSIONS)
+                except ValidationError as ve:
+                    rejected.append({"filename": file.filename, "error": str(ve)})
+                    continue
+                error = _validate_batch_entry(file.filename, None, meta)
+                if error:
+                    rejected.append({"filename": file.filename, "error": error})
+                    continue
+                entries.append(
+                    (file.filename, meta, lambda fn, f=file: g_document_manager.save_resume(f, fn))
+                )
+            add_candidates(entries)
+
+        if not candidates:
+            return jsonify({"error": "No valid resumes in batch", "rejected": rejected}), 400
+
+        # --- One transaction for every candidate row plus the batch membership ---
+        g_candidate_store.save_candidates(candidates, batch_id=batch_id, batch_kind="upload")
+
+        # --- Fan out parsing as a single Celery group ---
+        candidate_ids = [c["id"] for c in candidates]
+        try:
+            group_result = group(
+                process_resume_background.s(c["id"], c["resume_path"], batch_id) for c in candidates
+            ).apply_async(queue=BULK_QUEUE, priority=PRIORITY_BULK)
+        except Exception as e:
+            g_candidate_store.bulk_update_status(candidate_ids, "task_failed")
+            raise ProcessingError(f"Celery task submission failed: {e}")
+
+        return (
+            jsonify(
+                {
+                    "message": f"{len(candidates)} resumes uploaded, parsing in background",
+                    "batch_id": batch_id,
+                    "group_id": group_result.id,
+                    "accepted": [
+                        {"candidate_id": c["id"], "filename": c["resume_filename"]}
+                        for c in candidates
+                    ],
+                    "rejected": rejected,
+                    "status": "parsing_resume",
+                }
+            ),
+            202,
+        )
+
+    except ValidationError as ve:
+        return jsonify({"error": str(ve)}), 400
+
+    except ProcessingError as pe:
+        return jsonify({"error": str(pe)}), 500
+
+    except OverloadedError:
+        raise
+
+    except Exception as e:
+        # Catch-all fallback
+        return jsonify({"error": f"Unexpected error: {e}"}), 500
+
+
+@bp.route("/candidates/batches/<batch_id>", methods=["GET"])
+def get_batch(batch_id):
+    try:
+        batch = g_candidate_store.get_batch_progress(batch_id)
+        if not batch:
+            raise NotFoundError(f"Batch {batch_id} not found")
+
+        counts = batch["status_counts"]
+        in_progress = sum(n for st, n in counts.items() if st in IN_PROGRESS_STATUSES)
+        failed = sum(n for st, n in counts.items() if st in FAILED_STATUSES)
+        batch["progress"] = {
+            "in_progress": in_progress,
+            "failed": failed,
+            "done": batch["total"] - in_progress - failed,
+        }
+        return jsonify({"batch": batch}), 200
+    except NotFoundError:
+        raise
+    except Exception:
+        raise ProcessingError("Failed to retrieve batch progress")
+
+
+def _read_manifest(manifest_file):
+    """Parse a CSV manifest into {filename: {name, email, curr_company}}."""
+    try:
+        reader = csv.DictReader(io.TextIOWrapper(manifest_file.stream, encoding="utf-8-sig"))
+        manifest = {}
+        for row in reader:
+            row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+            filename = row.get("filename")
+            if filename:
+                manifest[os.path.basename(filename)] = {
+                    "name": row.get("name"),
+                    "email": row.get("email"),
+                    "curr_company": row.get("curr_company") or row.get("company"),
+                }
+        return manifest
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ValidationError(f"Invalid manifest CSV: {e}")
+
+
+def _validate_batch_entry(filename, size, meta):
+    """Return an error message for a batch entry, or None if it is acceptable."""
+    if not filename or not secure_filename(filename):
+        return "Invalid filename"
+    if "." not in filename or filename.rsplit(".", 1)[1].lower() not in RESUME_EXTENSIONS:
+        return f'Invalid file type. Allowed types: {", ".join(RESUME_EXTENSIONS)}'
+    if size is not None and size == 0:
+        return "File is empty"
+    if size is not None and size > MAX_RESUME_BYTES:
+        return "File size exceeds maximum limit of 16MB"
+    if not meta or not all([meta.get("name"), meta.get("email"), meta.get("curr_company")]):
+        return "Missing required fields: name, email, curr_company are mandatory"
+    return None
+
+
+def _save_zip_member(zf, member, filename):
+    with zf.open(member) as src:
+        return g_document_manager.save_resume_stream(src, filename)
+
+
 @bp.route("/candidates", methods=["GET"])
 def list_candidates():
+    """
+    List candidates newest first.
+    Query params: page, per_page, status,
+      after=<created_at>,<id>  keyset cursor (from pagination.next_cursor)
+      count=exact|none         whether to include the total (default: exact for
+                               page mode, none for cursor mode)
+      fields=a,b,c | full      projection (default: summary fields only)
+    """
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     status = request.args.get("status", None)
+    after = request.args.get("after", None)
+    count = request.args.get("count", "none" if after else "exact")
     if per_page > 100:
         per_page = 100
+    if page < 1 or per_page < 1:
+        raise ValidationError("page and per_page must be positive integers")
+    if count not in ("exact", "none"):
+        raise ValidationError("count must be 'exact' or 'none'")
+
+    fields_arg = request.args.get("fields", "")
+    if fields_arg == "full":
+        fields = None
+    else:
+        fields = _parse_fields(fields_arg) or list(g_candidate_store.SUMMARY_FIELDS)
+    # Stored JSON only exists for full records and the summary projection
+    rendered = current_app.config.get("PRERENDERED_JSON", False) and (
+        fields is None or tuple(fields) == g_candidate_store.SUMMARY_FIELDS
+    )
+
+    cursor = None
+    if after:
+        try:
+            cursor = g_candidate_store.parse_cursor(after)
+        except ValueError as e:
+            raise ValidationError(str(e))
 
     try:
-        candidates = g_candidate_store.list_candidates(page, per_page, status)
+        # Read before the page so a concurrent write can only make the tag stale, never the body
+        etag = _etag("list", g_candidate_store.get_version(), *sorted(request.args.items(multi=True)))
+        not_modified = _not_modified(etag)
+        if not_modified is not None:
+            return not_modified
+
+        candidates = g_candidate_store.list_candidates(
+            page, per_page, status, after=cursor, with_total=(count == "exact"), fields=fields,
+            rendered=rendered,
+        )
+        pagination = {
+            "page": None if cursor else page,
+            "per_page": per_page,
+            "total": candidates["total"],
+            "pages": candidates["pages"],
+            "next_cursor": candidates["next_cursor"],
+        }
+        if candidates["rendered"]:
+            # Splice the stored JSON of each row instead of decoding and re-encoding it
+            body = '{"candidates":[%s],"pagination":%s}' % (
+                ",".join(candidates["items"]), current_app.json.dumps(pagination)
+            )
+            response = raw_json_response(body)
+        else:
+            response = jsonify({"candidates": candidates["items"], "pagination": pagination})
+        return _cacheable(response, etag)
+    except ValueError as e:
+        raise ValidationError(str(e))
+    except Exception:
+        raise ProcessingError("Failed to retrieve candidates")
+
+
+@bp.route("/candidates/search", methods=["GET"])
+def search_candidates():
+    """
+    Full-text search over name, email, company, designation, skills,
+    location and resume text, best match first.
+    Query params: q (required; terms are ANDed, supports OR, NOT, prefix*,
+      "phrases" and column:term), page, per_page, status,
+      count=exact|none (default: exact), fields=a,b,c (default: summary fields)
+    """
+    q = request.args.get("q", "").strip()
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", 10, type=int)
+    status = request.args.get("status", None)
+    count = request.args.get("count", "exact")
+    if not q:
+        raise ValidationError("q is required")
+    if per_page > 100:
+        per_page = 100
+    if page < 1 or per_page < 1:
+        raise ValidationError("page and per_page must be positive integers")
+    if count not in ("exact", "none"):
+        raise ValidationError("count must be 'exact' or 'none'")
+
+    fields = _parse_fields(request.args.get("fields", "")) or None
+
+    try:
+        results = g_candidate_store.search_candidates(
+            q, page, per_page, status, with_total=(count == "exact"), fields=fields
+        )
         return (
             jsonify(
                 {
-                    "candidates": candidates["items"],
+                    "candidates": results["items"],
+                    "query": results["query"],
                     "pagination": {
                         "page": page,
                         "per_page": per_page,
-                        "total": candidates["total"],
-                        "pages": candidates["pages"],
+                        "total": results["total"],
+                        "pages": results["pages"],
                     },
                 }
             ),
             200,
         )
+    except ValueError as e:
+        raise ValidationError(str(e))
     except Exception:
-        raise ProcessingError("Failed to retrieve candidates")
+        raise ProcessingError("Failed to search candidates")
 
 
 @bp.route("/candidates/<candidate_id>", methods=["GET"])
 def get_candidate(candidate_id):
     try:
+        # Answer revalidations from updated_at alone, before any blob is read or decoded
+        updated_at = g_candidate_store.get_updated_at(candidate_id)
+        if updated_at is not None:
+            not_modified = _not_modified(_etag("candidate", candidate_id, updated_at))
+            if not_modified is not None:
+                return not_modified
+
+        if current_app.config.get("PRERENDERED_JSON", False):
+            stored = g_candidate_store.get_candidate_json(candidate_id)
+            if not stored:
+                raise NotFoundError(f"Candidate {candidate_id} not found")
+            api_json, updated_at = stored
+            response = raw_json_response('{"candidate":%s}' % api_json)
+            return _cacheable(response, _etag("candidate", candidate_id, updated_at))
+
         candidate = g_candidate_store.get_candidate(candidate_id)
         if not candidate:
             raise NotFoundError(f"Candidate {candidate_id} not found")
-        return jsonify({"candidate": candidate}), 200
+        response = jsonify({"candidate": candidate})
+        return _cacheable(response, _etag("candidate", candidate_id, candidate["updated_at"]))
     except NotFoundError:
         raise
     except Exception:
         raise ProcessingError("Failed to retrieve candidate details")
 
 
+@bp.route("/candidates/request-documents", methods=["POST"])
+def request_documents_bulk():
+    """
+    Request documents from many candidates in one call.
+    JSON body: either candidate_ids (list) or status (every candidate
+    currently in that status), plus optional tone and force_refresh.
+    Matching rows are marked pending in one statement and recorded as a
+    batch; generation runs as chunked Celery work with at most
+    DOC_REQUEST_CONCURRENCY chunks in flight. Poll /candidates/batches/<batch_id>.
+    """
+    # Chained chunks enqueue one message per lane at a time
+    _admit(current_app.config.get("DOC_REQUEST_CONCURRENCY", 4), queue=BULK_QUEUE)
+
+    try:
+        body = request.get_json(silent=True) or {}
+        candidate_ids = body.get("candidate_ids")
+        status = body.get("status")
+        if (candidate_ids is None) == (status is None):
+            raise ValidationError("Provide either 'candidate_ids' or 'status'")
+        if candidate_ids is not None and (
+            not isinstance(candidate_ids, list) or not all(isinstance(c, str) for c in candidate_ids)
+        ):
+            raise ValidationError("'candidate_ids' must be a list of ids")
+        tone = body.get("tone")
+        if tone is not None and tone not in g_ai_agent.TONES:
+            raise ValidationError(f"tone must be one of: {', '.join(g_ai_agent.TONES)}")
+        force_refresh = bool(body.get("force_refresh", False))
+
+        max_candidates = current_app.config.get("BULK_DOC_REQUEST_MAX", 5000)
+        if candidate_ids is not None and len(candidate_ids) > max_candidates:
+            raise ValidationError(f"Request exceeds maximum of {max_candidates} candidates")
+
+        # --- One statement marks every match pending and records the batch ---
+        batch_id = str(uuid.uuid4())
+        queued = g_candidate_store.start_status_batch(
+            batch_id,
+            "doc_request",
+            "document_request_pending",
+            candidate_ids=candidate_ids,
+            current_status=status,
+            skip_statuses=sorted(IN_PROGRESS_STATUSES),
+            limit=max_candidates,
+        )
+        if not queued:
+            raise ValidationError("No candidates eligible for a document request")
+
+        # --- Chunks chained per lane; lanes run in parallel ---
+        chunk_size = current_app.config.get("DOC_REQUEST_CHUNK_SIZE", 25)
+        concurrency = current_app.config.get("DOC_REQUEST_CONCURRENCY", 4)
+        chunks = [queued[i:i + chunk_size] for i in range(0, len(queued), chunk_size)]
+        lanes = [chunks[i::concurrency] for i in range(min(concurrency, len(chunks)))]
+        try:
+            group_result = group(
+                chain(generate_doc_requests_chunk.si(c, tone, force_refresh, batch_id) for c in lane)
+                for lane in lanes
+            ).apply_async()
+        except Exception as e:
+            g_candidate_store.bulk_update_status(queued, "document_request_failed")
+            raise ProcessingError(f"Celery task submission failed: {e}")
+
+        queued_set = set(queued)
+        skipped = [c for c in candidate_ids if c not in queued_set] if candidate_ids is not None else []
+        return (
+            jsonify(
+                {
+                    "message": f"Document requests queued for {len(queued)} candidates",
+                    "batch_id": batch_id,
+                    "group_id": group_result.id,
+                    "queued": len(queued),
+                    "skipped": skipped,
+                    "chunks": len(chunks),
+                    "concurrency": len(lanes),
+                    "status": "document_request_pending",
+                }
+            ),
+            202,
+        )
+
+    except (ValidationError, ProcessingError):
+        raise
+    except Exception as e:
+        current_app.logger.error(f"Unhandled error: {e}")
+        raise ProcessingError(f"Failed to queue document requests: {e}")
+
+
 @bp.route("/candidates/<candidate_id>/request-documents", methods=["POST"])
 def request_documents(candidate_id):
+    _admit(queue=MESSAGING_QUEUE)
+
     try:
         candidate = g_candidate_store.get_candidate(candidate_id)
         if not candidate:
             raise NotFoundError(f"Candidate {candidate_id} not found")
 
+        options = request.get_json(silent=True) or {}
+        tone = options.get("tone")
+        if tone is not None and tone not in g_ai_agent.TONES:
+            raise ValidationError(f"tone must be one of: {', '.join(g_ai_agent.TONES)}")
+        force_refresh = bool(options.get("force_refresh", False))
+
         g_candidate_store.update_candidate(
             candidate_id,
             {
@@ -181,7 +674,8 @@ def request_documents(candidate_id):
 
         try:
             task = generate_doc_request_background.apply_async(
-                (candidate_id,), retry=False
+                (candidate_id,), {"tone": tone, "force_refresh": force_refresh},
+                priority=PRIORITY_INTERACTIVE, retry=False,
             )
             if not task:
                 raise ProcessingError("Failed to queue task — broker unavailable")
@@ -209,7 +703,7 @@ def request_documents(candidate_id):
             202,
         )
 
-    except NotFoundError:
+    except (NotFoundError, ValidationError):
         raise
     except ProcessingError:
         raise
@@ -234,6 +728,7 @@ def submit_documents(candidate_id):
             raise ValidationError("Number of files must match number of document types")
 
         uploaded_docs = []
+        document_updates = {}
         for file, doc_type in zip(files, document_types):
             validate_document_type(doc_type)
             validate_file(file, {"pdf", "jpg", "jpeg", "png"})
@@ -248,6 +743,7 @@ def submit_documents(candidate_id):
                 "path": doc_path,
                 "uploaded_at": datetime.utcnow().isoformat(),
             }
+            document_updates[f"$.{doc_type}"] = candidate["documents"][doc_type]
 
             uploaded_docs.append({"type": doc_type, "filename": unique_filename})
 
@@ -256,8 +752,22 @@ def submit_documents(candidate_id):
         else:
             candidate["status"] = "partially_completed"
 
-        candidate["updated_at"] = datetime.utcnow().isoformat()
-        g_candidate_store.update_candidate(candidate_id, candidate)
+        # Only the uploaded document slots and the status are written
+        g_candidate_store.set_json_fields(
+            candidate_id,
+            "documents",
+            document_updates,
+            changes={"status": candidate["status"]},
+        )
+
+        # Read the documents in the background; a broker outage must not fail the upload
+        for doc in uploaded_docs:
+            try:
+                ocr_document_background.delay(
+                    candidate_id, doc["type"], doc["filename"], candidate["documents"][doc["type"]]["path"]
+                )
+            except Exception as e:
+                current_app.logger.warning(f"Could not queue OCR for {doc['filename']}: {e}")
 
         return (
             jsonify(
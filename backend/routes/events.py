@@ -0,0 +1,84 @@
+from flask import Blueprint, Response, stream_with_context
+from routes.candidates import IN_PROGRESS_STATUSES, FAILED_STATUSES
+from utils.exceptions import NotFoundError, ProcessingError
+
+bp = Blueprint('events', __name__)
+
+# Dependency injection globals
+g_progress_stream = None
+g_candidate_store = None
+
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    # Stop nginx from buffering the stream
+    'X-Accel-Buffering': 'no',
+}
+
+
+def register_routes(app, *, progress_stream, candidate_store):
+    global g_progress_stream, g_candidate_store
+    g_progress_stream = progress_stream
+    g_candidate_store = candidate_store
+    app.register_blueprint(bp)
+
+
+def _event_stream(generator):
+    return Response(stream_with_context(generator), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+
+@bp.route('/candidates/<candidate_id>/events', methods=['GET'])
+def candidate_events(candidate_id):
+    """
+    Server-Sent Events for one candidate: a `snapshot` of the current status,
+    then `progress` events per stage, then `end` once the task finished.
+    """
+    if g_progress_stream is None:
+        raise ProcessingError("Progress events are disabled")
+
+    def load_snapshot():
+        record = g_candidate_store.get_candidates_by_ids([candidate_id], fields=['status', 'updated_at'])
+        snapshot = record.get(candidate_id) or {'id': candidate_id, 'status': None}
+        pending = {candidate_id} if snapshot['status'] in IN_PROGRESS_STATUSES else set()
+        return snapshot, pending
+
+    if not g_candidate_store.get_candidates_by_ids([candidate_id], fields=['status']):
+        raise NotFoundError(f"Candidate {candidate_id} not found")
+    channel = g_progress_stream.publisher.channel(candidate_id)
+    return _event_stream(g_progress_stream.stream(channel, load_snapshot))
+
+
+@bp.route('/candidates/batches/<batch_id>/events', methods=['GET'])
+def batch_events(batch_id):
+    """
+    Server-Sent Events for every candidate in a batch: a `snapshot` with the
+    aggregate progress, `progress` events as members move through their
+    stages, then `end` once none is still in progress.
+    """
+    if g_progress_stream is None:
+        raise ProcessingError("Progress events are disabled")
+    statuses = g_candidate_store.get_batch_statuses(batch_id)
+    if statuses is None:
+        raise NotFoundError(f"Batch {batch_id} not found")
+
+    def load_snapshot():
+        current = g_candidate_store.get_batch_statuses(batch_id) or {}
+        counts = {}
+        for status in current.values():
+            counts[status] = counts.get(status, 0) + 1
+        pending = {cid for cid, status in current.items() if status in IN_PROGRESS_STATUSES}
+        failed = sum(n for st, n in counts.items() if st in FAILED_STATUSES)
+        snapshot = {
+            'batch_id': batch_id,
+            'total': len(current),
+            'status_counts': counts,
+            'progress': {
+                'in_progress': len(pending),
+                'failed': failed,
+                'done': len(current) - len(pending) - failed,
+            },
+        }
+        return snapshot, pending
+
+    # Tasks started for this batch also publish on its channel: one subscription for all members
+    channel = g_progress_stream.publisher.batch_channel(batch_id)
+    return _event_stream(g_progress_stream.stream(channel, load_snapshot))
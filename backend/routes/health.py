@@ -3,7 +3,14 @@ from datetime import datetime
 
 bp = Blueprint('health', __name__)
 
-def register_routes(app):
+# Dependency injection globals
+g_parse_cache = g_template_cache = g_ollama_client = None
+
+def register_routes(app, *, parse_cache=None, template_cache=None, ollama_client=None):
+    global g_parse_cache, g_template_cache, g_ollama_client
+    g_parse_cache = parse_cache
+    g_template_cache = template_cache
+    g_ollama_client = ollama_client
     app.register_blueprint(bp)
 
 @bp.route('/health', methods=['GET'])
@@ -13,3 +20,22 @@ def health_check():
         'timestamp': datetime.utcnow().isoformat(),
         'service': 'resume-parser-api'
     }), 200
+
+@bp.route('/health/parse-cache', methods=['GET'])
+def parse_cache_stats():
+    if g_parse_cache is None:
+        return jsonify({'enabled': False}), 200
+    return jsonify({'enabled': True, **g_parse_cache.stats()}), 200
+
+@bp.route('/health/message-templates', methods=['GET'])
+def message_template_stats():
+    if g_template_cache is None:
+        return jsonify({'enabled': False}), 200
+    return jsonify({'enabled': True, **g_template_cache.stats()}), 200
+
+@bp.route('/health/llm', methods=['GET'])
+def llm_stats():
+    """Circuit breaker state and trip count, latency percentiles and cluster slot usage."""
+    if g_ollama_client is None:
+        return jsonify({'enabled': False}), 200
+    return jsonify({'enabled': True, **g_ollama_client.stats()}), 200
@@ -0,0 +1,57 @@
+from flask import Blueprint, request, jsonify
+from routes.candidates import validate_fields
+from utils.exceptions import ValidationError, ProcessingError
+
+bp = Blueprint('ranking', __name__)
+
+# Dependency injection globals
+g_ranking_engine = None
+g_candidate_store = None
+
+MAX_TOP_K = 200
+
+
+def register_routes(app, *, ranking_engine, candidate_store):
+    global g_ranking_engine, g_candidate_store
+    g_ranking_engine = ranking_engine
+    g_candidate_store = candidate_store
+    app.register_blueprint(bp)
+
+
+@bp.route('/candidates/rank', methods=['POST'])
+def rank_candidates():
+    """
+    Rank every parsed candidate against a job description with BM25.
+    JSON body: query (required), top_k (default 20, max 200),
+      fields (list; default: summary fields)
+    """
+    data = request.get_json(silent=True) or {}
+    query = (data.get('query') or '').strip()
+    top_k = data.get('top_k', 20)
+    fields = data.get('fields')
+    if not query:
+        raise ValidationError("query is required")
+    if fields is not None:
+        fields = validate_fields(fields) or None
+    if not isinstance(top_k, int) or top_k < 1:
+        raise ValidationError("top_k must be a positive integer")
+    top_k = min(top_k, MAX_TOP_K)
+
+    try:
+        ranked = g_ranking_engine.rank(query, top_k)
+        records = g_candidate_store.get_candidates_by_ids([cid for cid, _ in ranked], fields=fields)
+        candidates = [
+            {**records[cid], 'score': score}
+            for cid, score in ranked
+            if cid in records
+        ]
+        return jsonify({'candidates': candidates, 'top_k': top_k}), 200
+    except ValueError as e:
+        raise ValidationError(str(e))
+    except Exception:
+        raise ProcessingError("Failed to rank candidates")
+
+
+@bp.route('/health/ranking', methods=['GET'])
+def ranking_stats():
+    return jsonify(g_ranking_engine.stats()), 200
@@ -0,0 +1,75 @@
+"""
+Queue-depth admission control for endpoints that enqueue Celery work
+"""
+
+import math
+import logging
+from typing import List, Optional, Sequence
+
+import redis
+
+from utils.exceptions import OverloadedError
+
+logger = logging.getLogger(__name__)
+
+
+class QueueAdmission:
+    """
+    Refuses new work while the Celery queues in Redis are too deep.
+
+    Depth is the summed LLEN of `queues` on the broker, including the extra
+    list kept per priority step ("<queue><sep><step>"); `admit` can check a
+    single queue. A request that would push it past `max_depth` raises
+    OverloadedError with a Retry-After that grows with the backlog, so
+    clients back off instead of piling more tasks onto a queue the LLM
+    cannot drain. If the broker cannot be reached,
+    requests are admitted and the enqueue itself reports the failure.
+    """
+
+    def __init__(
+        self,
+        client: "redis.Redis",
+        queues: Sequence[str] = ("celery",),
+        max_depth: int = 2000,
+        retry_after: int = 30,
+        max_retry_after: int = 600,
+        priority_steps: Sequence[int] = (0,),
+        sep: str = ":",
+    ):
+        self.client = client
+        self.queues = list(queues)
+        self.priority_steps = list(priority_steps)
+        self.sep = sep
+        self.max_depth = max_depth
+        self.retry_after = retry_after
+        self.max_retry_after = max_retry_after
+
+    def _keys(self, queue: str) -> List[str]:
+        # Mirrors kombu's Redis transport: step 0 uses the bare queue name
+        return [f"{queue}{self.sep}{step}" if step else queue for step in self.priority_steps]
+
+    def depth(self, queue: Optional[str] = None) -> int:
+        with self.client.pipeline(transaction=False) as pipe:
+            for name in ([queue] if queue else self.queues):
+                for key in self._keys(name):
+                    pipe.llen(key)
+            return sum(pipe.execute())
+
+    def admit(self, tasks: int = 1, queue: Optional[str] = None) -> None:
+        """
+        Raises:
+            OverloadedError: If `tasks` more messages would exceed max_depth
+        """
+        try:
+            depth = self.depth(queue)
+        except redis.exceptions.RedisError as e:
+            logger.warning(f"Queue depth unavailable, admitting request: {e}")
+            return
+        if depth + tasks <= self.max_depth:
+            return
+        retry_after = min(self.max_retry_after, math.ceil(self.retry_after * (depth + tasks) / self.max_depth))
+        logger.warning(f"Refusing {tasks} tasks: {queue or 'queue'} depth {depth} at limit {self.max_depth}")
+        raise OverloadedError(
+            f"Processing queue is full ({depth} tasks waiting); retry in {retry_after}s",
+            retry_after=retry_after,
+        )
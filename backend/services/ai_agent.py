@@ -2,103 +2,224 @@
 AI Agent for generating personalized document requests
 """
 
+import re
 import logging
-import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from services.ollama_client import OllamaClient
+from services.template_cache import MessageTemplateCache
+from utils.exceptions import AIServiceError
 
 logger = logging.getLogger(f"{__name__}.AIAgent")
 
+PLACEHOLDER_RE = re.compile(r"\{(name|designation|company|sender_email|sender_name)\}")
+# Anything else that looks like a placeholder: {x}, [Name], <name>, or a lone brace
+STRAY_PLACEHOLDER_RE = re.compile(r"\{[^{}]*\}|\[[^\[\]]*name[^\[\]]*\]|<[^<>]*name[^<>]*>|[{}]", re.IGNORECASE)
+EMAIL_LITERAL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+# "Dear Rahul," / "Best regards,\nPriya Sharma": a real name written where a placeholder belongs
+GREETING_NAME_RE = re.compile(r"\b(?:Dear|Hi|Hello)\s+(?!(?:Candidate|Sir|Madam|Applicant|All|Team)\b)([A-Z][a-z]+)")
+SIGNOFF_NAME_RE = re.compile(
+    r"(?:regards|sincerely|thanks|thank you),?\s*\n\s*(?!\{sender_name\})([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*$",
+    re.IGNORECASE,
+)
+EXAMPLE_NAMES = ("john doe", "jane doe", "john smith", "jane smith")
+
+# Designation keywords per template bucket, checked in order
+DESIGNATION_BUCKETS = (
+    ("intern", ("intern", "trainee", "fresher", "graduate", "student")),
+    ("leadership", ("director", "head", "vp", "vice president", "chief", "cto", "ceo", "founder")),
+    ("management", ("manager", "lead", "principal", "architect")),
+    ("data", ("data", "analyst", "scientist", "machine learning", "ml", "analytics")),
+    ("engineering", ("engineer", "developer", "programmer", "sde", "devops", "qa", "tester", "software")),
+    ("design", ("designer", "ux", "ui")),
+    ("business", ("sales", "marketing", "accountant", "business", "consultant", "finance", "hr", "recruiter")),
+)
+_BUCKET_RES = tuple(
+    (bucket, re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b"))
+    for bucket, keywords in DESIGNATION_BUCKETS
+)
+BUCKET_DESCRIPTIONS = {
+    "intern": "internship and entry-level",
+    "leadership": "senior leadership",
+    "management": "management and technical lead",
+    "data": "data and analytics",
+    "engineering": "software engineering",
+    "design": "design",
+    "business": "business, sales and operations",
+    "general": "professional",
+}
+
+
+def template_problem(template: Optional[str]) -> Optional[str]:
+    """Why a generated template must not be cached and sent, or None if it is usable."""
+    if not template or "{name}" not in template:
+        return "no {name} placeholder"
+    stray = STRAY_PLACEHOLDER_RE.search(PLACEHOLDER_RE.sub("", template))
+    if stray:
+        return f"unknown placeholder {stray.group(0)!r}"
+    email = EMAIL_LITERAL_RE.search(template)
+    if email:
+        return f"literal email address {email.group(0)!r}"
+    lowered = template.lower()
+    for example in EXAMPLE_NAMES:
+        if example in lowered:
+            return f"example name {example!r}"
+    for pattern in (GREETING_NAME_RE, SIGNOFF_NAME_RE):
+        match = pattern.search(template)
+        if match:
+            return f"literal name {match.group(1)!r}"
+    return None
+
+
+def designation_bucket(designation: Optional[str]) -> str:
+    """Coarse role family used to share one message template across candidates."""
+    text = (designation or "").lower()
+    for bucket, pattern in _BUCKET_RES:
+        if pattern.search(text):
+            return bucket
+    return "general"
+
 
 class AIAgent:
     """AI Agent that generates personalized communication"""
 
+    # Bump when the template prompt changes so cached templates are not reused
+    TEMPLATE_VERSION = "t1"
+    TONES = {
+        "formal": "formal and professional",
+        "friendly": "warm and friendly, still professional",
+    }
+
     def __init__(
         self,
         model_name: str = "llama3:instruct",
         base_url: str = "http://localhost:11434",
+        ollama_client: Optional[OllamaClient] = None,
+        timeout: float = 60,
+        template_cache: Optional[MessageTemplateCache] = None,
+        tone: str = "formal",
+        sender_email: str = "hr@hiring.com",
+        sender_name: str = "Hiring Team",
     ):
         self.model_name = model_name
         self.base_url = base_url
-        self.api_url = f"{base_url}/api/generate"
-
-    def generate_document_request(self, candidate_data: Dict[str, Any]) -> str:
+        self.ollama = ollama_client or OllamaClient(base_url)
+        self.timeout = timeout
+        self.template_cache = template_cache
+        self.tone = tone if tone in self.TONES else "formal"
+        self.sender_email = sender_email
+        self.sender_name = sender_name
+
+    def generate_document_request(
+        self,
+        candidate_data: Dict[str, Any],
+        tone: Optional[str] = None,
+        force_refresh: bool = False,
+    ) -> str:
         """
         Generate a personalized document request message
 
+        The LLM writes a template with placeholders once per designation
+        bucket and tone; it is cached and filled in locally per candidate.
+
         Args:
             candidate_data: Dictionary containing candidate information
+            tone: One of TONES; defaults to the agent's tone
+            force_refresh: Generate a new template even if one is cached
 
         Returns:
             Personalized message string
         """
+        tone = tone if tone in self.TONES else self.tone
+        key = self.template_key(candidate_data.get("designation"), tone)
+
+        if self.template_cache and not force_refresh:
+            template = self.template_cache.get(key)
+            if template is not None:
+                problem = template_problem(template)
+                if problem is None:
+                    message = self._render(template, candidate_data)
+                    # Otherwise this candidate's own details broke the fill; the template stays cached
+                    return message if message is not None else self._generate_template_message(candidate_data)
+                # A bad entry would fail every candidate until its TTL ran out
+                logger.warning(f"Evicting cached document request template ({problem}): {template!r}")
+                self.template_cache.delete(key)
+
+        template = self._generate_request_template(candidate_data.get("designation"), tone)
+        problem = template_problem(template)
+        if problem is not None:
+            logger.warning(f"Discarding document request template ({problem}): {template!r}")
+            return self._generate_template_message(candidate_data)
+        if self.template_cache:
+            self.template_cache.put(key, template)
+        message = self._render(template, candidate_data)
+        return message if message is not None else self._generate_template_message(candidate_data)
+
+    def template_key(self, designation: Optional[str], tone: str) -> str:
+        return f"{self.TEMPLATE_VERSION}:{self.model_name}:{designation_bucket(designation)}:{tone}"
+
+    def fill_template(self, template: str, candidate_data: Dict[str, Any]) -> str:
+        values = {
+            "name": candidate_data.get("name") or "Candidate",
+            "designation": candidate_data.get("designation") or "Professional",
+            "company": candidate_data.get("current_company") or "your current organisation",
+            "sender_email": self.sender_email,
+            "sender_name": self.sender_name,
+        }
+        return PLACEHOLDER_RE.sub(lambda m: values[m.group(1)], template)
+
+    def _render(self, template: str, candidate_data: Dict[str, Any]) -> Optional[str]:
+        """Fill a validated template, or None if this candidate's details do not render cleanly."""
+        try:
+            return self.fill_template(template, candidate_data)
+        except Exception as e:
+            logger.warning(f"Could not fill document request template for {candidate_data.get('id')}: {e}")
+            return None
 
-        name = candidate_data.get("name", "Candidate")
-        email = candidate_data.get("email", "")
-        phone = candidate_data.get("phone", "")
-        designation = candidate_data.get("designation", "Professional")
-        company = candidate_data.get("current_company", "")
-
-        # Build context for the AI
-        sender_email = "hr@hiring.com" 
-        sender_name = "Hiring Team"  
-
-        context = f"""You are an HR assistant generating a personalised, short, professional and polite message.
+    def _generate_request_template(self, designation: Optional[str], tone: str) -> Optional[str]:
+        """Ask the LLM for a placeholder template; None if the call fails. Callers vet it with template_problem."""
+        bucket = designation_bucket(designation)
+        context = f"""You are an HR assistant writing a reusable document request message template.
 
-Task: Write ONLY the document request message body. 
+Task: Write ONLY the message body. 
 Do NOT include any headings, labels, or introductions such as "Here is the message" or "Status: sent". 
 Output only the clean message body, no markdown, no bullet points, and no metadata.
 
-Use this candidate info:
-- Name: {name}
-- Email: {email}
-- Phone: {phone}
-- Current Role: {designation}
-- Company: {company}
+The message goes to candidates in {BUCKET_DESCRIPTIONS[bucket]} roles. Tone: {self.TONES[tone]}.
+Use these placeholders exactly as written instead of real details; they are filled in later:
+- {{name}}: the candidate's name
+- {{designation}}: their current role
+- {{company}}: their current company
+- {{sender_email}}: where to send the documents
+- {{sender_name}}: the signature
 
 Requirements:
-1. Address the candidate by name (e.g., "Dear {name},").
+1. Address the candidate by name (e.g., "Dear {{name}},").
 2. Politely request PAN card and Aadhaar card for identity verification for HR records.
-3. Ask them to send these documents to {sender_email}.
+3. Ask them to send these documents to {{sender_email}}.
 4. Mention accepted formats: PDF, JPG, PNG.
 5. Keep it concise (5-6 short lines total).
-6. End with "Best regards," and "{sender_name}".
-7. DO NOT use the candidate's email address as a destination or in a mailto link.
+6. End with "Best regards," and "{{sender_name}}".
+7. DO NOT invent names, email addresses or companies; use only the placeholders.
 8. DO NOT include any additional commentary or labels.
 
 Return ONLY the clean message text (no code block, no quotes, no explanations).
 """
-        logger.info(f"sending context {context}")
+        logger.info(f"Generating document request template {bucket}/{tone}")
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": context,
-                    "stream": False,
-                    "options": {"temperature": 0.2, "top_p": 0.9, "max_tokens": 500},
-                },
-                timeout=60,
+            template = self.ollama.generate(
+                self.model_name,
+                context,
+                options={"temperature": 0.2, "top_p": 0.9, "max_tokens": 500},
+                timeout=self.timeout,
             )
-
-            if response.status_code == 200:
-                result = response.json()
-                message = result.get("response", "").strip()
-
-                if message:
-                    return message
-                else:
-                    # Fallback to template
-                    return self._generate_template_message(candidate_data)
-            else:
-                logger.error(f"Ollama API error: {response.status_code}")
-                return self._generate_template_message(candidate_data)
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error calling Ollama API: {str(e)}")
-            return self._generate_template_message(candidate_data)
+        except AIServiceError as e:
+            logger.error(str(e))
+            return None
         except Exception as e:
-            logger.error(f"Unexpected error generating request: {str(e)}")
-            return self._generate_template_message(candidate_data)
+            logger.error(f"Unexpected error generating request template: {str(e)}")
+            return None
+
+        return template.strip() if template else None
 
     def _generate_template_message(self, candidate_data: Dict[str, Any]) -> str:
         """Fallback template-based message generation"""
@@ -159,23 +280,13 @@ The message should:
 Generate ONLY the message content."""
 
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.7, "top_p": 0.9},
-                },
-                timeout=60,
+            return self.ollama.generate(
+                self.model_name,
+                prompt,
+                options={"temperature": 0.7, "top_p": 0.9},
+                timeout=self.timeout,
             )
 
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
-            else:
-                return self._generate_template_followup(name, missing_docs)
-
         except Exception as e:
             logger.error(f"Error generating follow-up: {str(e)}")
             return self._generate_template_followup(name, missing_docs)
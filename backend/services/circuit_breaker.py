@@ -0,0 +1,165 @@
+"""
+Circuit breaker for LLM calls, optionally shared across workers through Redis
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class _LocalState:
+    """Breaker state for a single process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {"failures": 0, "opened_at": 0.0, "trips": 0, "probe_until": 0.0}
+
+    def get(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._state)
+
+    def add_failure(self) -> int:
+        with self._lock:
+            self._state["failures"] += 1
+            return self._state["failures"]
+
+    def trip(self, now: float) -> None:
+        with self._lock:
+            self._state["opened_at"] = now
+            self._state["trips"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state.update(failures=0, opened_at=0.0, probe_until=0.0)
+
+    def claim_probe(self, now: float, ttl: float) -> bool:
+        with self._lock:
+            if self._state["probe_until"] > now:
+                return False
+            self._state["probe_until"] = now + ttl
+            return True
+
+
+class _RedisState:
+    """Breaker state in a Redis hash, so every worker sees the same circuit."""
+
+    def __init__(self, client: "redis.Redis", name: str):
+        self.client = client
+        self.key = f"circuit:{name}"
+        self.probe_key = f"circuit:{name}:probe"
+
+    def get(self) -> Dict[str, Any]:
+        raw = self.client.hgetall(self.key)
+        values = {k.decode(): v.decode() for k, v in raw.items()}
+        return {
+            "failures": int(values.get("failures", 0)),
+            "opened_at": float(values.get("opened_at", 0)),
+            "trips": int(values.get("trips", 0)),
+        }
+
+    def add_failure(self) -> int:
+        return self.client.hincrby(self.key, "failures", 1)
+
+    def trip(self, now: float) -> None:
+        with self.client.pipeline() as pipe:
+            pipe.hset(self.key, "opened_at", now)
+            pipe.hincrby(self.key, "trips", 1)
+            pipe.execute()
+
+    def reset(self) -> None:
+        with self.client.pipeline() as pipe:
+            pipe.hset(self.key, mapping={"failures": 0, "opened_at": 0})
+            pipe.delete(self.probe_key)
+            pipe.execute()
+
+    def claim_probe(self, now: float, ttl: float) -> bool:
+        # SET NX lets exactly one worker in the cluster send the trial call
+        return bool(self.client.set(self.probe_key, now, nx=True, px=max(1, int(ttl * 1000))))
+
+
+class CircuitBreaker:
+    """
+    Trips after `failure_threshold` consecutive bad calls, where a call is
+    bad if it failed or took longer than `slo_seconds`. While open, callers
+    are refused immediately for `cooldown` seconds; after that one trial call
+    is let through (half-open) and its outcome closes or re-opens the circuit.
+
+    With a Redis client the state is shared by every worker, so one worker's
+    timeouts spare the others the same wait. Redis errors fall back to
+    per-process state.
+    """
+
+    def __init__(
+        self,
+        name: str = "ollama",
+        failure_threshold: int = 5,
+        cooldown: float = 30.0,
+        slo_seconds: Optional[float] = None,
+        client: Optional["redis.Redis"] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.slo_seconds = slo_seconds
+        self._local = _LocalState()
+        self._shared = _RedisState(client, name) if client is not None else None
+
+    def _call(self, method: str, *args):
+        if self._shared is not None:
+            try:
+                return getattr(self._shared, method)(*args)
+            except redis.exceptions.RedisError as e:
+                logger.warning(f"Circuit state in Redis unavailable, using local state: {e}")
+        return getattr(self._local, method)(*args)
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now."""
+        now = time.time()
+        state = self._call("get")
+        if state["failures"] < self.failure_threshold:
+            return True
+        if now < state["opened_at"] + self.cooldown:
+            return False
+        # Cool-down over: let one trial call through; it holds the probe for one cool-down
+        return self._call("claim_probe", now, self.cooldown)
+
+    def record(self, ok: bool, elapsed: Optional[float] = None) -> None:
+        slow = ok and elapsed is not None and self.slo_seconds is not None and elapsed > self.slo_seconds
+        if ok and not slow:
+            if self._call("get")["failures"]:
+                logger.info(f"Circuit {self.name} closed")
+                self._call("reset")
+            return
+        failures = self._call("add_failure")
+        # Trip on reaching the threshold, and again whenever a half-open trial fails
+        if failures >= self.failure_threshold:
+            self._call("trip", time.time())
+            reason = f"slow call ({elapsed:.1f}s > {self.slo_seconds}s SLO)" if slow else "failure"
+            logger.warning(f"Circuit {self.name} open for {self.cooldown}s after {failures} bad calls; last: {reason}")
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        state = self._call("get")
+        if state["failures"] < self.failure_threshold:
+            status = CLOSED
+        elif now < state["opened_at"] + self.cooldown:
+            status = OPEN
+        else:
+            status = HALF_OPEN
+        return {
+            "state": status,
+            "consecutive_failures": state["failures"],
+            "trips": state["trips"],
+            "open_until": state["opened_at"] + self.cooldown if status == OPEN else None,
+            "failure_threshold": self.failure_threshold,
+            "cooldown": self.cooldown,
+            "slo_seconds": self.slo_seconds,
+            "shared": self._shared is not None,
+        }
@@ -0,0 +1,235 @@
+"""
+Service container: builds each service lazily, once per process
+
+Celery workers use this instead of importing the Flask app, so a task only
+pays for the services it actually touches. Service modules are imported
+inside the builders for the same reason.
+"""
+
+import os
+import threading
+from functools import wraps
+
+from config import Config
+
+_lock = threading.RLock()
+_instances = {}
+
+
+def _once(builder):
+    """Cache a builder's result per process; prefork children rebuild instead of sharing the parent's."""
+    @wraps(builder)
+    def get():
+        key = (builder.__name__, os.getpid())
+        if key not in _instances:
+            with _lock:
+                if key not in _instances:
+                    _instances[key] = builder()
+        return _instances[key]
+    return get
+
+
+def reset() -> None:
+    """Forget every built service (e.g. after changing Config in a script)."""
+    with _lock:
+        _instances.clear()
+
+
+@_once
+def parse_cache():
+    if not Config.PARSE_CACHE_ENABLED:
+        return None
+    from services.parse_cache import ParseCache
+    return ParseCache(Config.DATA_FOLDER, max_bytes=Config.PARSE_CACHE_MAX_BYTES)
+
+
+@_once
+def pdf_extractor():
+    from services.pdf_extractor import PdfTextExtractor
+    return PdfTextExtractor(
+        Config.PDF_BACKEND,
+        max_pages=Config.PDF_MAX_PAGES,
+        time_budget=Config.PDF_TIME_BUDGET,
+        parallel_min_pages=Config.PDF_PARALLEL_MIN_PAGES,
+        max_workers=Config.PDF_MAX_WORKERS,
+    )
+
+
+@_once
+def ocr_engine():
+    if not Config.OCR_ENABLED:
+        return None
+    from services.ocr import OcrEngine, OcrCache
+    return OcrEngine(
+        OcrCache(Config.DATA_FOLDER),
+        lang=Config.OCR_LANG,
+        max_workers=Config.OCR_MAX_WORKERS,
+        max_pages=Config.OCR_MAX_PAGES,
+        tesseract_cmd=Config.TESSERACT_CMD,
+        image_timeout=Config.OCR_IMAGE_TIMEOUT,
+    )
+
+
+@_once
+def redis_client():
+    import redis
+    # Short socket timeouts so a down Redis degrades the limiter instead of hanging requests
+    return redis.Redis.from_url(Config.REDIS_URL, socket_connect_timeout=1, socket_timeout=2)
+
+
+@_once
+def llm_limiter():
+    if not Config.LLM_CLUSTER_LIMIT_ENABLED:
+        return None
+    from services.rate_limiter import RedisSemaphore
+    return RedisSemaphore(
+        redis_client(),
+        name="ollama",
+        limit=Config.LLM_CLUSTER_MAX_IN_FLIGHT,
+        lease_seconds=Config.LLM_SLOT_LEASE,
+    )
+
+
+@_once
+def queue_admission():
+    if not Config.ADMISSION_ENABLED:
+        return None
+    from services.admission import QueueAdmission
+    from celery_worker import PRIORITY_STEPS, PRIORITY_SEP
+    return QueueAdmission(
+        redis_client(),
+        queues=Config.ADMISSION_QUEUES,
+        max_depth=Config.ADMISSION_MAX_QUEUE_DEPTH,
+        retry_after=Config.ADMISSION_RETRY_AFTER,
+        priority_steps=PRIORITY_STEPS,
+        sep=PRIORITY_SEP,
+    )
+
+
+@_once
+def progress_publisher():
+    if not Config.PROGRESS_EVENTS_ENABLED:
+        return None
+    from services.progress import ProgressPublisher
+    return ProgressPublisher(redis_client())
+
+
+@_once
+def llm_breaker():
+    if not Config.LLM_BREAKER_ENABLED:
+        return None
+    from services.circuit_breaker import CircuitBreaker
+    return CircuitBreaker(
+        "ollama",
+        failure_threshold=Config.LLM_BREAKER_FAILURES,
+        cooldown=Config.LLM_BREAKER_COOLDOWN,
+        slo_seconds=Config.LLM_LATENCY_SLO,
+        client=redis_client() if Config.LLM_BREAKER_SHARED else None,
+    )
+
+
+@_once
+def ollama_client():
+    from services.ollama_client import OllamaClient
+    return OllamaClient(
+        Config.OLLAMA_BASE_URL,
+        pool_size=Config.OLLAMA_POOL_SIZE,
+        max_in_flight=Config.OLLAMA_MAX_IN_FLIGHT,
+        connect_timeout=Config.OLLAMA_CONNECT_TIMEOUT,
+        default_timeout=Config.OLLAMA_TIMEOUT,
+        max_retries=Config.OLLAMA_MAX_RETRIES,
+        cluster_limiter=llm_limiter(),
+        slot_timeout=Config.LLM_SLOT_TIMEOUT,
+        breaker=llm_breaker(),
+        adaptive_timeout=_adaptive_timeout(),
+    )
+
+
+def _adaptive_timeout():
+    if not Config.LLM_ADAPTIVE_TIMEOUT:
+        return None
+    from services.latency import AdaptiveTimeout
+    return AdaptiveTimeout(headroom=Config.LLM_TIMEOUT_HEADROOM, min_timeout=Config.LLM_MIN_TIMEOUT)
+
+
+@_once
+def resume_parser():
+    from services.resume_parser import ResumeParser
+    from services.fast_extractor import FastPathPolicy
+    return ResumeParser(
+        Config.OLLAMA_MODEL,
+        Config.OLLAMA_BASE_URL,
+        parse_cache=parse_cache(),
+        ollama_client=ollama_client(),
+        timeout=Config.OLLAMA_PARSE_TIMEOUT,
+        stream=Config.OLLAMA_STREAM_PARSE,
+        chunk_chars=Config.RESUME_CHUNK_CHARS,
+        max_parallel_chunks=Config.RESUME_MAX_PARALLEL_CHUNKS,
+        fast_path_policy=FastPathPolicy(
+            Config.FAST_PATH_REQUIRED_FIELDS,
+            min_confidence=Config.FAST_PATH_MIN_CONFIDENCE,
+            enabled=Config.FAST_PATH_ENABLED,
+        ),
+        skills_taxonomy_path=Config.SKILLS_TAXONOMY_PATH,
+        pdf_extractor=pdf_extractor(),
+        ocr_engine=ocr_engine(),
+    )
+
+
+@_once
+def template_cache():
+    if not Config.MESSAGE_TEMPLATE_CACHE_ENABLED:
+        return None
+    from services.template_cache import MessageTemplateCache
+    return MessageTemplateCache(
+        Config.DATA_FOLDER,
+        ttl_seconds=Config.MESSAGE_TEMPLATE_TTL,
+        max_entries=Config.MESSAGE_TEMPLATE_MAX_ENTRIES,
+    )
+
+
+@_once
+def ai_agent():
+    from services.ai_agent import AIAgent
+    return AIAgent(
+        Config.OLLAMA_MODEL,
+        Config.OLLAMA_BASE_URL,
+        ollama_client=ollama_client(),
+        timeout=Config.OLLAMA_MESSAGE_TIMEOUT,
+        template_cache=template_cache(),
+        tone=Config.MESSAGE_TONE,
+    )
+
+
+@_once
+def document_manager():
+    from services.document_manager import DocumentManager
+    return DocumentManager(Config.RESUME_FOLDER)
+
+
+@_once
+def candidate_store():
+    from models.candidate import CandidateStore
+    return CandidateStore(Config.DATA_FOLDER)
+
+
+@_once
+def ranking_index():
+    from services.ranking import RankingIndex
+    return RankingIndex(
+        Config.DATA_FOLDER,
+        max_terms_per_doc=Config.RANKING_MAX_TERMS_PER_DOC,
+        skill_weight=Config.RANKING_SKILL_WEIGHT,
+    )
+
+
+@_once
+def duplicate_index():
+    if not Config.DEDUPE_ENABLED:
+        return None
+    from services.dedupe import DuplicateIndex
+    return DuplicateIndex(
+        Config.DATA_FOLDER,
+        threshold=Config.DEDUPE_THRESHOLD,
+        reuse_min_similarity=Config.DEDUPE_REUSE_MIN_SIMILARITY if Config.DEDUPE_REUSE_PARSE else None,
+    )
@@ -0,0 +1,193 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH buckets
+"""
+
+import os
+import re
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class DuplicateMatch(NamedTuple):
+    candidate_id: str
+    similarity: float
+
+
+class MinHasher:
+    """
+    MinHash over word shingles.
+
+    Shingles are hashed to 32 bits with blake2b (stable across processes,
+    unlike hash()), then pushed through `num_perm` universal hash functions
+    (a*x + b) mod (2^61 - 1) in one vectorized step. With a, b, x < 2^32
+    the products fit in uint64 without overflow.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> List[str]:
+        words = _WORD_RE.findall((text or "").lower())
+        k = self.shingle_size
+        if len(words) < k:
+            return [" ".join(words)] if words else []
+        return [" ".join(words[i:i + k]) for i in range(len(words) - k + 1)]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        shingles = set(self.shingles(text))
+        if not shingles:
+            return None
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little") for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the underlying shingle sets."""
+        return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class DuplicateIndex:
+    """
+    MinHash signatures split into LSH bands stored in SQLite.
+
+    A lookup only touches candidates sharing at least one band bucket,
+    which stays sub-linear in the pool size. With 16 bands of 8 rows, pairs
+    above roughly 0.7 Jaccard collide with high probability; collisions are
+    then confirmed against `threshold` using the full signatures.
+    """
+
+    def __init__(self, data_folder: str, threshold: float = 0.8, num_perm: int = 128, bands: int = 16,
+                 reuse_min_similarity: Optional[float] = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        os.makedirs(data_folder, exist_ok=True)
+        self.db_path = os.path.join(data_folder, 'dedupe.db')
+        self.threshold = threshold
+        self.reuse_min_similarity = reuse_min_similarity
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._initialize_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self) -> None:
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS minhash_signatures (
+                    candidate_id TEXT PRIMARY KEY,
+                    signature BLOB NOT NULL,
+                    created_at TEXT
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    candidate_id TEXT NOT NULL,
+                    PRIMARY KEY (band, bucket, candidate_id)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lsh_buckets_candidate ON lsh_buckets (candidate_id)")
+            conn.commit()
+
+    def can_reuse_parse(self, match: Optional[DuplicateMatch]) -> bool:
+        """Whether a match is close enough to copy its parse instead of calling the LLM."""
+        return (
+            match is not None
+            and self.reuse_min_similarity is not None
+            and match.similarity >= self.reuse_min_similarity
+        )
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True))
+        return keys
+
+    def find_duplicate(self, text: str, exclude: Optional[str] = None) -> Optional[DuplicateMatch]:
+        """The most similar indexed candidate at or above the threshold, if any."""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        return self._query(signature, exclude)
+
+    def _query(self, signature: np.ndarray, exclude: Optional[str]) -> Optional[DuplicateMatch]:
+        keys = self._band_keys(signature)
+        values = ", ".join("(?, ?)" for _ in keys)
+        params = [v for band, key in enumerate(keys) for v in (band, key)]
+        with self._get_connection() as conn:
+            rows = conn.execute(
+                # A join from the key list probes the primary key; (band, bucket) IN (...) scans the table
+                f"""
+                WITH keys (band, bucket) AS (VALUES {values})
+                SELECT s.candidate_id, s.signature
+                FROM minhash_signatures s
+                WHERE s.candidate_id IN (
+                    SELECT l.candidate_id FROM keys
+                    JOIN lsh_buckets l ON l.band = keys.band AND l.bucket = keys.bucket
+                )
+                """,
+                params,
+            ).fetchall()
+
+        best = None
+        for row in rows:
+            if row['candidate_id'] == exclude:
+                continue
+            other = np.frombuffer(row['signature'], dtype=np.uint32)
+            score = MinHasher.similarity(signature, other)
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = DuplicateMatch(row['candidate_id'], round(score, 4))
+        return best
+
+    def add(self, candidate_id: str, text: str) -> Optional[DuplicateMatch]:
+        """
+        Index a candidate's text and return its best existing duplicate,
+        checked before the candidate itself is added.
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None
+        match = self._query(signature, exclude=candidate_id)
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM lsh_buckets WHERE candidate_id = ?", (candidate_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO minhash_signatures (candidate_id, signature, created_at) VALUES (?, ?, ?)",
+                (candidate_id, signature.tobytes(), datetime.utcnow().isoformat()),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (band, bucket, candidate_id) VALUES (?, ?, ?)",
+                [(band, key, candidate_id) for band, key in enumerate(self._band_keys(signature))],
+            )
+            conn.commit()
+        return match
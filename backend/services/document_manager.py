@@ -1,6 +1,7 @@
 import os
 import shutil
 import logging
+from typing import BinaryIO
 from werkzeug.datastructures import FileStorage
 
 logger = logging.getLogger(__name__)
@@ -40,6 +41,28 @@ class DocumentManager:
             logger.error(f"Error saving resume: {str(e)}")
             raise
     
+    def save_resume_stream(self, stream: BinaryIO, filename: str) -> str:
+        """
+        Save a resume from a file-like object (e.g. a ZIP member) without
+        buffering it in memory
+        
+        Args:
+            stream: Readable binary file-like object
+            filename: Secure filename
+            
+        Returns:
+            Full path to saved file
+        """
+        try:
+            filepath = os.path.join(self.resumes_folder, filename)
+            with open(filepath, 'wb') as out:
+                shutil.copyfileobj(stream, out, 1024 * 1024)
+            logger.info(f"Resume saved: {filepath}")
+            return filepath
+        except Exception as e:
+            logger.error(f"Error saving resume: {str(e)}")
+            raise
+    
     def save_document(self, file: FileStorage, filename: str, doc_type: str) -> str:
         """
         Save identity document (PAN/Aadhaar)
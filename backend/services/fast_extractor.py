@@ -0,0 +1,213 @@
+"""
+Deterministic, CPU-only resume field extraction
+"""
+
+import re
+import logging
+from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from services.resume_sections import split_sections
+from services.skill_matcher import SkillMatcher, get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+# +91 98765 43210, (022) 2345-6789, +1-415-555-0100 ...
+PHONE_RE = re.compile(r"(?<![\w+])(\+?\d{1,3}[\s.-]?)?(\(?\d{2,5}\)?[\s.-]?)?\d{3,5}[\s.-]?\d{3,5}(?!\w)")
+LABEL_RE = re.compile(
+    r"^\s*(?P<label>name|full\s+name|location|address|city|current\s+location|designation|"
+    r"current\s+(?:role|title|designation)|title|current\s+(?:company|employer|organi[sz]ation)|company)"
+    r"\s*[:\-]\s*(?P<value>.+?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+NAME_LINE_RE = re.compile(r"^[A-Z][a-zA-Z.'-]+(?:\s+[A-Z][a-zA-Z.'-]+){1,3}$")
+# Title-Case header lines that are headings or job titles rather than a person's name
+NAME_STOP_WORDS = frozenset("""
+    curriculum vitae resume cv biodata bio data profile summary contact details information personal
+    objective career professional experience education skills about me
+    engineer developer manager analyst consultant architect designer lead senior junior principal
+    intern director executive officer specialist scientist administrator associate accountant
+    tester programmer head trainee
+""".split())
+# A name guessed from layout alone never reaches the fast-path threshold
+LAYOUT_NAME_CONFIDENCE = 0.6
+EXPERIENCE_YEARS_RE = re.compile(
+    r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)(?:\s+of)?\s+(?:\w+\s+){0,3}?experience",
+    re.IGNORECASE,
+)
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE_RANGE_RE = re.compile(
+    rf"(?:{_MONTH}\s*|\d{{1,2}}/)?(?P<start>(?:19|20)\d{{2}})\s*(?:-|–|—|to)\s*"
+    rf"(?:(?:{_MONTH}\s*|\d{{1,2}}/)?(?P<end>(?:19|20)\d{{2}})|(?P<present>present|current|now|till\s+date|date))",
+    re.IGNORECASE,
+)
+ROLE_AT_COMPANY_RE = re.compile(
+    r"^\s*(?P<role>[A-Z][\w/&.,' -]{2,60}?)\s+(?:at|@)\s+(?P<company>[A-Z][\w&.,' -]{1,60}?)\s*(?:[,|(–—-].*)?$",
+    re.MULTILINE,
+)
+# Ordered from highest to lowest degree
+DEGREE_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("PhD", re.compile(r"\b(?:ph\.?\s?d|doctorate)\b", re.IGNORECASE)),
+    ("Masters", re.compile(r"\b(?:m\.?\s?tech|m\.?\s?e\b|m\.?\s?s\b|m\.?\s?sc|mca|mba|master'?s?)\b", re.IGNORECASE)),
+    ("Bachelors", re.compile(r"\b(?:b\.?\s?tech|b\.?\s?e\b|b\.?\s?s\b|b\.?\s?sc|bca|b\.?\s?com|bachelor'?s?)\b", re.IGNORECASE)),
+    ("Diploma", re.compile(r"\bdiploma\b", re.IGNORECASE)),
+]
+
+class FastExtractor:
+    """
+    Regex and heuristic extractor with per-field confidence.
+
+    All patterns are compiled once at import. Confidence reflects how the
+    value was found: explicit labels and unambiguous patterns score high,
+    layout guesses score low. Skills come from the shared taxonomy matcher.
+    """
+
+    def __init__(self, skill_matcher: Optional[SkillMatcher] = None):
+        self.skill_matcher = skill_matcher or get_skill_matcher()
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        sections = split_sections(text)
+        by_name: Dict[str, str] = {}
+        for section in sections:
+            by_name[section.name] = by_name.get(section.name, "") + "\n" + section.text
+        header = by_name.get("header", text[:1000])
+        labels = self._labels(text)
+
+        parsed_data: Dict[str, Any] = {}
+        confidence: Dict[str, float] = {}
+
+        def put(field: str, found: Tuple[Any, float]) -> None:
+            parsed_data[field], confidence[field] = found
+
+        put("name", self._name(header, labels))
+        put("email", self._email(text))
+        phone = self._phone(header)
+        put("phone", phone if phone[0] else self._phone(text))
+        put("location", self._labelled(labels, ("location", "current location", "city", "address")))
+        put("designation", self._labelled(labels, ("designation", "current role", "current title",
+                                                   "current designation", "title")))
+        put("current_company", self._labelled(labels, ("current company", "current employer",
+                                                       "current organisation", "current organization", "company")))
+        if not parsed_data["designation"] or not parsed_data["current_company"]:
+            role, company, score = self._role_at_company(by_name.get("experience", ""))
+            if not parsed_data["designation"] and role:
+                put("designation", (role, score))
+            if not parsed_data["current_company"] and company:
+                put("current_company", (company, score))
+        put("experience_years", self._experience_years(text, by_name.get("experience")))
+        put("education", self._education(by_name.get("education") or text))
+        put("skills", self._skills(text, by_name.get("skills")))
+
+        return {"parsed_data": parsed_data, "confidence": confidence}
+
+    def _labels(self, text: str) -> Dict[str, str]:
+        labels: Dict[str, str] = {}
+        for match in LABEL_RE.finditer(text):
+            key = re.sub(r"\s+", " ", match.group("label").lower())
+            labels.setdefault(key, match.group("value"))
+        return labels
+
+    def _labelled(self, labels: Dict[str, str], keys: Iterable[str]) -> Tuple[Optional[str], float]:
+        for key in keys:
+            if labels.get(key):
+                return labels[key], 0.85
+        return None, 0.0
+
+    def _name(self, header: str, labels: Dict[str, str]) -> Tuple[Optional[str], float]:
+        for key in ("name", "full name"):
+            if labels.get(key):
+                return labels[key], 0.9
+        for line in header.splitlines()[:5]:
+            line = line.strip()
+            if not line or not NAME_LINE_RE.match(line):
+                continue
+            if any(word.strip(".'-").lower() in NAME_STOP_WORDS for word in line.split()):
+                continue
+            return line, LAYOUT_NAME_CONFIDENCE
+        return None, 0.0
+
+    def _email(self, text: str) -> Tuple[Optional[str], float]:
+        emails = list(dict.fromkeys(m.group(0) for m in EMAIL_RE.finditer(text)))
+        if not emails:
+            return None, 0.0
+        return emails[0], 0.97 if len(emails) == 1 else 0.85
+
+    def _phone(self, text: str) -> Tuple[Optional[str], float]:
+        for match in PHONE_RE.finditer(text):
+            candidate = match.group(0).strip()
+            digits = re.sub(r"\D", "", candidate)
+            # Skip year ranges like 2015-2020 and other short numbers
+            if 10 <= len(digits) <= 13:
+                return candidate, 0.9 if len(digits) in (10, 12) else 0.75
+        return None, 0.0
+
+    def _role_at_company(self, experience: str) -> Tuple[Optional[str], Optional[str], float]:
+        match = ROLE_AT_COMPANY_RE.search(experience)
+        if not match:
+            return None, None, 0.0
+        return match.group("role").strip(), match.group("company").strip(" ,"), 0.6
+
+    def _experience_years(self, text: str, experience: Optional[str]) -> Tuple[Optional[int], float]:
+        stated = [float(m.group(1)) for m in EXPERIENCE_YEARS_RE.finditer(text)]
+        if stated:
+            return int(max(stated)), 0.85
+
+        # Fall back to the union of date ranges in the experience section
+        if not experience:
+            return None, 0.0
+        current_year = datetime.utcnow().year
+        spans = []
+        for match in DATE_RANGE_RE.finditer(experience):
+            start = int(match.group("start"))
+            end = current_year if match.group("present") else int(match.group("end"))
+            if start <= end <= current_year:
+                spans.append((start, end))
+        if not spans:
+            return None, 0.0
+        spans.sort()
+        total, cur_start, cur_end = 0, spans[0][0], spans[0][1]
+        for start, end in spans[1:]:
+            if start > cur_end:
+                total += cur_end - cur_start
+                cur_start, cur_end = start, end
+            else:
+                cur_end = max(cur_end, end)
+        total += cur_end - cur_start
+        return total, 0.65
+
+    def _education(self, text: str) -> Tuple[Optional[str], float]:
+        for label, pattern in DEGREE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                line = text[text.rfind("\n", 0, match.start()) + 1:].split("\n", 1)[0].strip()
+                return (line[:120] or label), 0.7
+        return None, 0.0
+
+    def _skills(self, text: str, skills_section: Optional[str]) -> Tuple[List[str], float]:
+        section_skills = self.skill_matcher.find(skills_section, skills_section=True) if skills_section else []
+        found = list(dict.fromkeys(self.skill_matcher.find(text) + section_skills))
+        if not found:
+            return [], 0.0
+        # A dedicated skills section listing several known skills is strong evidence
+        if len(section_skills) >= 3:
+            return found, 0.85
+        return found, 0.6
+
+
+class FastPathPolicy:
+    """Decides whether a fast extraction is good enough to skip the LLM."""
+
+    def __init__(self, required_fields: Iterable[str], min_confidence: float = 0.8, enabled: bool = True):
+        self.required_fields = [f for f in required_fields if f]
+        self.min_confidence = min_confidence
+        self.enabled = enabled
+
+    def allows_skip(self, result: Dict[str, Any]) -> bool:
+        if not self.enabled or not self.required_fields:
+            return False
+        parsed_data = result.get("parsed_data", {})
+        confidence = result.get("confidence", {})
+        return all(
+            parsed_data.get(f) not in (None, "", []) and confidence.get(f, 0) >= self.min_confidence
+            for f in self.required_fields
+        )
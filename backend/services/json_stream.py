@@ -0,0 +1,77 @@
+"""
+Incremental parsing of a JSON object that arrives in chunks (e.g. LLM tokens)
+"""
+
+import json
+from typing import Any, Callable, List, Optional
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+class IncrementalJSONParser:
+    """
+    Tracks the nesting of the first JSON object in a character stream.
+
+    Text before the opening brace (model chatter) is skipped. Every time a
+    container closes, `on_close(depth)` is called with the nesting depth left
+    open, at which point `snapshot()` returns everything received so far as a
+    valid object. `complete` turns True once the outermost object closes;
+    anything after it is ignored.
+    """
+
+    def __init__(self):
+        self._buf: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self.started = False
+        self.complete = False
+
+    @property
+    def depth(self) -> int:
+        return len(self._stack)
+
+    def feed(self, chunk: str, on_close: Optional[Callable[[int], None]] = None) -> None:
+        for ch in chunk:
+            if self.complete:
+                return
+            if not self.started:
+                if ch != '{':
+                    continue
+                self.started = True
+
+            self._buf.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+            elif ch in ('}', ']') and self._stack:
+                self._stack.pop()
+                if not self._stack:
+                    self.complete = True
+                if on_close:
+                    on_close(len(self._stack))
+
+    def snapshot(self) -> Any:
+        """
+        Parse what has been received so far by closing any open containers.
+        Only valid right after a container closed (i.e. inside on_close).
+        """
+        closers = ''.join(_CLOSERS[c] for c in reversed(self._stack))
+        return json.loads(''.join(self._buf) + closers)
+
+    def value(self) -> Any:
+        """The complete object; raises ValueError if it has not closed yet."""
+        if not self.complete:
+            raise ValueError("JSON object is incomplete")
+        return json.loads(''.join(self._buf))
@@ -0,0 +1,70 @@
+"""
+Observed LLM latency and the adaptive timeouts derived from it
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class AdaptiveTimeout:
+    """
+    Read timeouts sized from recent latency instead of fixed constants.
+
+    Latency is recorded per call kind (blocking generate vs. a stream read
+    to the end) as seconds per 1,000 prompt characters, since prompt
+    evaluation dominates on a local model. The timeout for a new call is the
+    p95 rate scaled to its prompt size, times `headroom`, kept between
+    `min_timeout` and the caller's own ceiling. Until `min_samples` calls
+    have been seen the ceiling is used as-is.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        headroom: float = 2.0,
+        min_timeout: float = 10.0,
+    ):
+        self.window = window
+        self.min_samples = min_samples
+        self.headroom = headroom
+        self.min_timeout = min_timeout
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+
+    @staticmethod
+    def _units(prompt_chars: int) -> float:
+        # Short prompts still pay fixed model overhead; count them as at least 1k chars
+        return max(1.0, prompt_chars / 1000)
+
+    def record(self, kind: str, prompt_chars: int, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(kind, deque(maxlen=self.window))
+            samples.append(seconds / self._units(prompt_chars))
+
+    def _p95(self, kind: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)]
+
+    def timeout(self, kind: str, prompt_chars: int, ceiling: float) -> float:
+        p95 = self._p95(kind)
+        if p95 is None:
+            return ceiling
+        return min(ceiling, max(self.min_timeout, self.headroom * p95 * self._units(prompt_chars)))
+
+    def stats(self) -> Dict[str, Any]:
+        out = {}
+        with self._lock:
+            kinds = {kind: sorted(samples) for kind, samples in self._samples.items()}
+        for kind, samples in kinds.items():
+            out[kind] = {
+                "samples": len(samples),
+                "p50_sec_per_1k_chars": round(samples[len(samples) // 2], 3) if samples else None,
+                "p95_sec_per_1k_chars": round(self._p95(kind), 3) if self._p95(kind) is not None else None,
+            }
+        return out
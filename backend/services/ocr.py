@@ -0,0 +1,226 @@
+"""
+OCR for scanned resumes and identity documents
+"""
+
+import io
+import os
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:  # OCR is optional; callers check OcrEngine.available
+    pytesseract = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff", ".bmp"}
+
+
+class OcrResult(NamedTuple):
+    text: str
+    pages: int  # distinct pages that had images to OCR
+    cached_pages: int  # of those, pages whose every image came from the cache
+    elapsed: float
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.pages / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _ocr_image(image_bytes: bytes, lang: str, tesseract_cmd: Optional[str], timeout: float = 0) -> str:
+    """Run Tesseract on one encoded image; it is killed after `timeout` seconds (0: no limit)."""
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # Tesseract does best on greyscale
+        return pytesseract.image_to_string(image.convert("L"), lang=lang, timeout=timeout)
+
+
+class OcrCache:
+    """OCR text keyed by the SHA-256 of the page image, so re-uploads skip Tesseract."""
+
+    def __init__(self, data_folder: str):
+        os.makedirs(data_folder, exist_ok=True)
+        self.db_path = os.path.join(data_folder, 'ocr_cache.db')
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ocr_cache (
+                    page_hash TEXT PRIMARY KEY,
+                    lang TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at TEXT
+                )
+                """
+            )
+            conn.commit()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get_many(self, page_hashes: List[str], lang: str) -> Dict[str, str]:
+        if not page_hashes:
+            return {}
+        try:
+            with self._get_connection() as conn:
+                placeholders = ",".join("?" * len(page_hashes))
+                rows = conn.execute(
+                    f"SELECT page_hash, text FROM ocr_cache WHERE lang = ? AND page_hash IN ({placeholders})",
+                    [lang, *page_hashes],
+                ).fetchall()
+            return dict(rows)
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache lookup failed: {e}")
+            return {}
+
+    def put_many(self, texts: Dict[str, str], lang: str) -> None:
+        if not texts:
+            return
+        now = datetime.utcnow().isoformat()
+        try:
+            with self._get_connection() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ocr_cache (page_hash, lang, text, created_at) VALUES (?, ?, ?, ?)",
+                    [(h, lang, text, now) for h, text in texts.items()],
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache write failed: {e}")
+
+
+class OcrEngine:
+    """
+    Tesseract OCR over PDF page images and standalone image files.
+
+    Scanned PDFs carry each page as an embedded image, which is pulled out
+    with pypdf and fed to Tesseract as-is, so no external rasterizer is
+    needed. Tesseract runs as a subprocess, so a bounded thread pool OCRs
+    pages in parallel, including inside daemonic Celery workers where a
+    process pool cannot start. Results are cached by image hash. Tesseract
+    is killed after `image_timeout` seconds on one image, which then
+    contributes no text and is not cached.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[OcrCache] = None,
+        lang: str = "eng",
+        max_workers: int = 2,
+        max_pages: int = 10,
+        tesseract_cmd: Optional[str] = None,
+        image_timeout: float = 60.0,
+    ):
+        self.cache = cache
+        self.lang = lang
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.tesseract_cmd = tesseract_cmd
+        self.image_timeout = image_timeout
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_pid: Optional[int] = None
+
+    @property
+    def available(self) -> bool:
+        return pytesseract is not None
+
+    def ocr_file(self, file_path: str) -> OcrResult:
+        """OCR a PDF or image file; returns the text of all pages in order."""
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext == ".pdf":
+            pages = self._pdf_page_images(file_path)
+        elif ext in IMAGE_EXTENSIONS:
+            with open(file_path, "rb") as f:
+                pages = [[f.read()]]
+        else:
+            raise ValueError(f"Unsupported file format for OCR: {ext}")
+        return self.ocr_pages(pages, file_path)
+
+    def ocr_pages(self, pages: List[List[bytes]], label: str = "") -> OcrResult:
+        """OCR the images of each page; a page may hold several images (or none)."""
+        if not self.available:
+            raise RuntimeError("OCR is unavailable: pytesseract is not installed")
+        started = time.perf_counter()
+        pages = [images for images in pages if images]
+        page_hashes = [[hashlib.sha256(image).hexdigest() for image in images] for images in pages]
+        all_hashes = {h for hashes in page_hashes for h in hashes}
+        cached = self.cache.get_many(list(all_hashes), self.lang) if self.cache else {}
+
+        # Identical images (e.g. a repeated letterhead scan) are OCR'd once
+        todo = {
+            h: image
+            for images, hashes in zip(pages, page_hashes)
+            for h, image in zip(hashes, images)
+            if h not in cached
+        }
+        fresh = self._run(todo)
+        if self.cache:
+            self.cache.put_many(fresh, self.lang)
+
+        texts = {**cached, **fresh}
+        result = OcrResult(
+            text="\n".join("\n".join(texts.get(h, "") for h in hashes) for hashes in page_hashes),
+            pages=len(pages),
+            cached_pages=sum(1 for hashes in page_hashes if all(h in cached for h in hashes)),
+            elapsed=time.perf_counter() - started,
+        )
+        logger.info(
+            f"OCR'd {result.pages} pages ({result.cached_pages} cached) in {result.elapsed:.2f}s "
+            f"= {result.pages_per_sec:.2f} pages/sec: {label}"
+        )
+        return result
+
+    def _run(self, todo: Dict[str, bytes]) -> Dict[str, str]:
+        """OCR text per image hash; images that timed out are left out."""
+        if not todo:
+            return {}
+        args = {h: (image, self.lang, self.tesseract_cmd, self.image_timeout) for h, image in todo.items()}
+        futures = {}
+        if len(todo) > 1 and self.max_workers > 1:
+            pool = self._get_pool()
+            futures = {h: pool.submit(_ocr_image, *a) for h, a in args.items()}
+
+        texts = {}
+        for h, a in args.items():
+            try:
+                texts[h] = futures[h].result() if futures else _ocr_image(*a)
+            except RuntimeError as e:
+                # pytesseract raises RuntimeError("Tesseract process timeout") once it has killed Tesseract
+                if "timeout" not in str(e).lower():
+                    raise
+                logger.warning(f"OCR of image {h[:12]} gave up after {self.image_timeout:.0f}s")
+        return texts
+
+    def _pdf_page_images(self, file_path: str) -> List[List[bytes]]:
+        """Embedded images of each of the first max_pages pages, in page order."""
+        from pypdf import PdfReader
+
+        pages: List[List[bytes]] = []
+        reader = PdfReader(file_path)
+        for index, page in enumerate(reader.pages[: self.max_pages]):
+            try:
+                pages.append([image.data for image in page.images])
+            except Exception as e:
+                logger.warning(f"Could not read images on page {index + 1} of {file_path}: {e}")
+                pages.append([])
+        return pages
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Pool for the current process; threads do not survive a fork."""
+        pid = os.getpid()
+        if self._pool is None or self._pool_pid != pid:
+            with self._lock:
+                if self._pool is None or self._pool_pid != pid:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ocr")
+                    self._pool_pid = pid
+        return self._pool
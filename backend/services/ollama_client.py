@@ -0,0 +1,290 @@
+"""
+Shared HTTP client for the Ollama generate API
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+from utils.exceptions import AIServiceError, CircuitOpenError
+from services.rate_limiter import RedisSemaphore
+from services.circuit_breaker import CircuitBreaker
+from services.latency import AdaptiveTimeout
+
+logger = logging.getLogger(__name__)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+class OllamaClient:
+    """
+    Pooled, keep-alive client for Ollama shared by every LLM-backed service
+    in a process.
+
+    - One requests.Session with a bounded connection pool, recreated after fork
+    - A semaphore capping in-flight generations per process, and optionally
+      a RedisSemaphore capping them across every worker in the cluster
+    - Per-call timeouts and retries with full-jitter exponential backoff
+    - Optionally a circuit breaker that refuses calls while Ollama is failing,
+      and read timeouts adapted to prompt size and observed p95 latency
+    """
+
+    # Status codes worth retrying; anything else is returned to the caller as a failure
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        pool_size: int = 10,
+        max_in_flight: int = 4,
+        connect_timeout: float = 5.0,
+        default_timeout: float = 120.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        cluster_limiter: Optional[RedisSemaphore] = None,
+        slot_timeout: Optional[float] = 300.0,
+        breaker: Optional[CircuitBreaker] = None,
+        adaptive_timeout: Optional[AdaptiveTimeout] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.generate_url = f"{self.base_url}/api/generate"
+        self.pool_size = pool_size
+        self.max_in_flight = max_in_flight
+        self.connect_timeout = connect_timeout
+        self.default_timeout = default_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.cluster_limiter = cluster_limiter
+        self.slot_timeout = slot_timeout
+        self.breaker = breaker
+        self.adaptive_timeout = adaptive_timeout
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._session_pid: Optional[int] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """Session for the current process; pooled sockets must not cross a fork."""
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+                    self._session_pid = pid
+        return self._session
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        retries: Optional[int] = None,
+    ) -> str:
+        """
+        Run a non-streaming generation and return the response text
+
+        Args:
+            model: Ollama model name
+            prompt: Prompt text
+            options: Ollama sampling options
+            timeout: Read timeout in seconds, or a (connect, read) tuple
+            retries: Override for the number of retries
+
+        Returns:
+            Generated text (stripped)
+
+        Raises:
+            AIServiceError: If every attempt fails
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": options or {},
+        }
+        response, _, _ = self._post_with_retries(payload, timeout, retries)
+        return response.json().get("response", "").strip()
+
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[Timeout] = None,
+        retries: Optional[int] = None,
+    ) -> Iterator[str]:
+        """
+        Stream a generation token by token from Ollama's NDJSON response
+
+        Only opening the stream is retried. Closing the generator early drops
+        the connection, which makes Ollama abort the generation. The read
+        timeout applies to the gap between tokens. Latency is recorded for
+        the circuit breaker and adaptive timeouts once the stream has been
+        read to the end, so it covers the whole generation.
+
+        Raises:
+            AIServiceError: If the stream cannot be opened or breaks mid-way
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": options or {},
+        }
+        response, lease, started = self._post_with_retries(payload, timeout, retries, stream=True)
+        try:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    if self.breaker:
+                        self.breaker.record(False)
+                    raise AIServiceError(f"Ollama stream error: {chunk['error']}")
+                token = chunk.get("response")
+                if token:
+                    yield token
+                if chunk.get("done"):
+                    break
+            self._record_success("stream", len(prompt), time.perf_counter() - started)
+        except requests.exceptions.RequestException as e:
+            if self.breaker:
+                self.breaker.record(False)
+            raise AIServiceError(f"Ollama stream interrupted: {e}")
+        finally:
+            response.close()
+            self._release_slot(lease)
+
+    def _post_with_retries(
+        self,
+        payload: Dict[str, Any],
+        timeout: Optional[Timeout],
+        retries: Optional[int],
+        stream: bool = False,
+    ) -> Tuple[requests.Response, Optional[str], float]:
+        """
+        POST to /api/generate, retrying transient failures. Returns the
+        response, the slot lease and the perf_counter start of the successful
+        attempt. The in-flight slot is released before returning, except for
+        a successful stream where the caller must pass the returned lease to
+        _release_slot, and its latency to _record_success, once the body has
+        been consumed.
+        """
+        connect_timeout, read_ceiling = self._resolve_timeout(timeout)
+        retries = self.max_retries if retries is None else retries
+        kind = "stream" if stream else "generate"
+        prompt_chars = len(payload.get("prompt", ""))
+        last_error = None
+
+        for attempt in range(retries + 1):
+            if self.breaker and not self.breaker.allow():
+                raise CircuitOpenError("Ollama circuit is open; skipping the call until the cool-down ends")
+            read_timeout = read_ceiling
+            if self.adaptive_timeout:
+                read_timeout = self.adaptive_timeout.timeout(kind, prompt_chars, read_ceiling)
+
+            lease = self._acquire_slot()
+            keep_slot = False
+            started = time.perf_counter()
+            try:
+                response = self.session.post(
+                    self.generate_url, json=payload, timeout=(connect_timeout, read_timeout), stream=stream
+                )
+                elapsed = time.perf_counter() - started
+
+                if response.status_code == 200:
+                    # A stream has only sent its headers; generate_stream records it when done
+                    if not stream:
+                        self._record_success(kind, prompt_chars, elapsed)
+                    keep_slot = stream
+                    return response, lease if stream else None, started
+
+                response.close()
+                last_error = f"Ollama API error: {response.status_code}"
+                if self.breaker:
+                    self.breaker.record(False)
+                if response.status_code not in self.RETRY_STATUSES:
+                    break
+            except requests.exceptions.RequestException as e:
+                last_error = (
+                    f"Error calling Ollama API after {time.perf_counter() - started:.1f}s "
+                    f"(read timeout {read_timeout:.0f}s): {e}"
+                )
+                if self.breaker:
+                    self.breaker.record(False)
+            finally:
+                if not keep_slot:
+                    self._release_slot(lease)
+
+            if attempt < retries:
+                delay = self._backoff(attempt)
+                logger.warning(f"{last_error}; retrying in {delay:.2f}s (attempt {attempt + 1}/{retries})")
+                time.sleep(delay)
+
+        raise AIServiceError(last_error or "Ollama request failed")
+
+    def _record_success(self, kind: str, prompt_chars: int, elapsed: float) -> None:
+        if self.adaptive_timeout:
+            self.adaptive_timeout.record(kind, prompt_chars, elapsed)
+        if self.breaker:
+            self.breaker.record(True, elapsed)
+
+    def _acquire_slot(self) -> Optional[str]:
+        """
+        Take a per-process slot, then a cluster-wide one. Returns the cluster
+        lease token (None without a cluster limiter).
+
+        Raises:
+            AIServiceError: If no cluster slot frees up within slot_timeout
+        """
+        self._slots.acquire()
+        if self.cluster_limiter is None:
+            return None
+        try:
+            lease = self.cluster_limiter.acquire(self.slot_timeout)
+        except Exception:
+            self._slots.release()
+            raise
+        if lease is None:
+            self._slots.release()
+            raise AIServiceError(f"No Ollama slot available within {self.slot_timeout}s; the cluster is saturated")
+        return lease
+
+    def _release_slot(self, lease: Optional[str]) -> None:
+        try:
+            if self.cluster_limiter is not None:
+                self.cluster_limiter.release(lease)
+        finally:
+            self._slots.release()
+
+    def _resolve_timeout(self, timeout: Optional[Timeout]) -> Tuple[float, float]:
+        if timeout is None:
+            timeout = self.default_timeout
+        if isinstance(timeout, tuple):
+            return timeout
+        return (self.connect_timeout, float(timeout))
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.stats() if self.breaker else None,
+            "latency": self.adaptive_timeout.stats() if self.adaptive_timeout else None,
+            "cluster_slots_in_use": self.cluster_limiter.in_use() if self.cluster_limiter else None,
+        }
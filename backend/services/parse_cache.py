@@ -0,0 +1,163 @@
+import os
+import json
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCache:
+    """
+    Persistent, size-bounded LRU cache for resume parse results.
+
+    Entries are keyed by the SHA-256 of the uploaded file bytes plus the
+    model name and prompt version, so a changed prompt or model never
+    serves a stale result. The extracted text is stored alongside the
+    result and can be reused on its own when only the model changed.
+    """
+
+    def __init__(self, data_folder: str, max_bytes: int = 256 * 1024 * 1024):
+        self.data_folder = data_folder
+        self.max_bytes = max_bytes
+        os.makedirs(self.data_folder, exist_ok=True)
+        self.db_path = os.path.join(self.data_folder, 'parse_cache.db')
+        self._initialize_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self) -> None:
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    file_hash TEXT NOT NULL,
+                    text TEXT,
+                    result TEXT,
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT,
+                    last_accessed TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_file_hash ON parse_cache (file_hash)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_last_accessed ON parse_cache (last_accessed)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS parse_cache_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("INSERT OR IGNORE INTO parse_cache_stats (name, value) VALUES ('hits', 0), ('misses', 0)")
+            conn.commit()
+
+    @staticmethod
+    def hash_file(file_path: str) -> str:
+        """SHA-256 of the file contents, read in 1MB blocks."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(file_hash: str, model_name: str, prompt_version: str) -> str:
+        return f"{file_hash}:{model_name}:{prompt_version}"
+
+    def get_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached parse result and record a hit or miss."""
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT result FROM parse_cache WHERE cache_key = ? AND result IS NOT NULL",
+                    (cache_key,),
+                ).fetchone()
+                if row:
+                    conn.execute(
+                        "UPDATE parse_cache SET last_accessed = ? WHERE cache_key = ?",
+                        (datetime.utcnow().isoformat(), cache_key),
+                    )
+                self._bump_stat(conn, 'hits' if row else 'misses')
+                conn.commit()
+            return json.loads(row['result']) if row else None
+        except Exception as e:
+            logger.warning(f"Parse cache lookup failed for {cache_key}: {e}")
+            return None
+
+    def get_text(self, file_hash: str) -> Optional[str]:
+        """Return previously extracted text for these file bytes, under any model."""
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT text FROM parse_cache WHERE file_hash = ? AND text IS NOT NULL LIMIT 1",
+                    (file_hash,),
+                ).fetchone()
+            return row['text'] if row else None
+        except Exception as e:
+            logger.warning(f"Parse cache text lookup failed for {file_hash}: {e}")
+            return None
+
+    def put(self, cache_key: str, file_hash: str, text: Optional[str], result: Optional[Dict[str, Any]]) -> None:
+        """Store extracted text and/or the final result, then evict down to max_bytes."""
+        try:
+            result_json = json.dumps(result) if result is not None else None
+            size_bytes = len((text or '').encode('utf-8')) + len((result_json or '').encode('utf-8'))
+            now = datetime.utcnow().isoformat()
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO parse_cache (cache_key, file_hash, text, result, size_bytes, created_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(cache_key) DO UPDATE SET
+                        text = COALESCE(excluded.text, parse_cache.text),
+                        result = COALESCE(excluded.result, parse_cache.result),
+                        size_bytes = excluded.size_bytes,
+                        last_accessed = excluded.last_accessed
+                    """,
+                    (cache_key, file_hash, text, result_json, size_bytes, now, now),
+                )
+                self._evict(conn)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Parse cache store failed for {cache_key}: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        cur = conn.execute("SELECT cache_key, size_bytes FROM parse_cache ORDER BY last_accessed ASC")
+        evicted = []
+        for row in cur:
+            if total <= self.max_bytes:
+                break
+            evicted.append((row['cache_key'],))
+            total -= row['size_bytes']
+        conn.executemany("DELETE FROM parse_cache WHERE cache_key = ?", evicted)
+        logger.info(f"Parse cache evicted {len(evicted)} entries")
+
+    def _bump_stat(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute("UPDATE parse_cache_stats SET value = value + 1 WHERE name = ?", (name,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._get_connection() as conn:
+            counters = {r['name']: r['value'] for r in conn.execute("SELECT name, value FROM parse_cache_stats")}
+            row = conn.execute("SELECT COUNT(1), COALESCE(SUM(size_bytes), 0) FROM parse_cache").fetchone()
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'entries': row[0],
+            'size_bytes': row[1],
+            'max_bytes': self.max_bytes,
+        }
@@ -0,0 +1,189 @@
+"""
+Pluggable PDF text extraction with page-parallelism and budgets
+"""
+
+import time
+import logging
+from typing import Iterator, List, NamedTuple, Tuple
+
+from billiard import Pipe, Process
+from billiard.connection import wait
+
+logger = logging.getLogger(__name__)
+
+# Time a worker gets past the budget to finish the page in progress before it is killed
+PAGE_GRACE_SECONDS = 5.0
+
+
+def _load_backend(name: str):
+    """Return the PdfReader class of a backend module, or None if it is not installed."""
+    try:
+        if name == "pypdf":
+            import pypdf
+            return pypdf.PdfReader
+        if name == "PyPDF2":
+            import PyPDF2
+            return PyPDF2.PdfReader
+    except ImportError:
+        return None
+    raise ValueError(f"Unknown PDF backend: {name}")
+
+
+BACKENDS = ("pypdf", "PyPDF2")
+
+
+class PageTiming(NamedTuple):
+    page: int
+    seconds: float
+    chars: int
+
+
+class PdfExtraction(NamedTuple):
+    text: str
+    backend: str
+    page_count: int
+    pages_extracted: int
+    truncated: bool
+    elapsed: float
+    timings: List[PageTiming]
+
+
+def _extract_pages(
+    backend: str, file_path: str, pages: List[int], deadline: float
+) -> Iterator[Tuple[int, str, float]]:
+    """
+    Extract the given pages from a file. Runs in worker processes, so it opens
+    the file itself and only yields plain tuples. Stops at the deadline.
+    """
+    reader = _load_backend(backend)(file_path)
+    for index in pages:
+        if time.time() >= deadline:
+            break
+        start = time.perf_counter()
+        try:
+            page_text = reader.pages[index].extract_text() or ""
+        except Exception as e:
+            logger.warning(f"Failed to extract page {index + 1} of {file_path}: {e}")
+            page_text = ""
+        yield index, page_text, time.perf_counter() - start
+
+
+def _send_pages(conn, backend: str, file_path: str, pages: List[int], deadline: float) -> None:
+    """Worker process body: send each page back as soon as it is read, so a kill only loses unfinished pages."""
+    try:
+        for page in _extract_pages(backend, file_path, pages, deadline):
+            conn.send(page)
+    finally:
+        conn.close()
+
+
+class PdfTextExtractor:
+    """
+    Extracts text from PDFs through a PyPDF2 or pypdf backend.
+
+    Small files are read page by page in-process. Files with at least
+    `parallel_min_pages` pages are spread across up to `max_workers`
+    processes. At most `max_pages` pages are read, and extraction stops once
+    `time_budget` seconds have passed; both cases mark the result truncated.
+    Workers are billiard processes (Celery's fork of multiprocessing), which
+    can be started from daemonic Celery prefork children; a worker still
+    inside a page once the budget and a grace period have passed is killed,
+    so one pathological page cannot hold the task.
+    """
+
+    def __init__(
+        self,
+        backend: str = "auto",
+        max_pages: int = 50,
+        time_budget: float = 30.0,
+        parallel_min_pages: int = 8,
+        max_workers: int = 4,
+    ):
+        self.backend = self._resolve_backend(backend)
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.parallel_min_pages = parallel_min_pages
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _resolve_backend(backend: str) -> str:
+        candidates = BACKENDS if backend == "auto" else (backend,)
+        for name in candidates:
+            if _load_backend(name) is not None:
+                return name
+        raise ValueError(f"No PDF backend available (tried {', '.join(candidates)})")
+
+    def extract(self, file_path: str) -> PdfExtraction:
+        started = time.perf_counter()
+        deadline = time.time() + self.time_budget
+        page_count = len(_load_backend(self.backend)(file_path).pages)
+        wanted = list(range(min(page_count, self.max_pages)))
+
+        if len(wanted) >= self.parallel_min_pages and self.max_workers > 1:
+            extracted = self._extract_parallel(file_path, wanted, deadline)
+        else:
+            extracted = list(_extract_pages(self.backend, file_path, wanted, deadline))
+
+        extracted.sort(key=lambda item: item[0])
+        timings = [PageTiming(index + 1, seconds, len(page_text)) for index, page_text, seconds in extracted]
+        result = PdfExtraction(
+            text="\n".join(page_text for _, page_text, _ in extracted),
+            backend=self.backend,
+            page_count=page_count,
+            pages_extracted=len(extracted),
+            truncated=len(extracted) < page_count,
+            elapsed=time.perf_counter() - started,
+            timings=timings,
+        )
+        self._log(file_path, result)
+        return result
+
+    def _extract_parallel(self, file_path: str, pages: List[int], deadline: float) -> List[Tuple[int, str, float]]:
+        workers = min(self.max_workers, len(pages))
+        # Interleave pages so a run of heavy pages is spread over every worker
+        batches = [pages[i::workers] for i in range(workers)]
+        running = {}
+        for batch in batches:
+            reader, writer = Pipe(duplex=False)
+            process = Process(
+                target=_send_pages, args=(writer, self.backend, file_path, batch, deadline), daemon=True
+            )
+            process.start()
+            writer.close()
+            running[reader] = process
+
+        # Workers stop between pages at the deadline; one still inside a page after the grace period is killed
+        kill_at = deadline + PAGE_GRACE_SECONDS
+        extracted: List[Tuple[int, str, float]] = []
+        while running:
+            ready = wait(list(running), timeout=max(0.0, kill_at - time.time()))
+            if not ready:
+                break
+            for reader in ready:
+                try:
+                    extracted.append(reader.recv())
+                except EOFError:
+                    process = running.pop(reader)
+                    process.join()
+                    reader.close()
+                    if process.exitcode:
+                        logger.warning(f"PDF extraction worker exited with {process.exitcode}: {file_path}")
+
+        for reader, process in running.items():
+            logger.warning(f"PDF extraction worker still busy past the time budget, killing it: {file_path}")
+            process.terminate()
+            process.join()
+            reader.close()
+        return extracted
+
+    def _log(self, file_path: str, result: PdfExtraction) -> None:
+        slowest = sorted(result.timings, key=lambda t: t.seconds, reverse=True)[:3]
+        logger.info(
+            f"Extracted {result.pages_extracted}/{result.page_count} pages with {result.backend} "
+            f"in {result.elapsed:.2f}s{' (truncated)' if result.truncated else ''}: {file_path}; "
+            f"slowest pages: {', '.join(f'p{t.page} {t.seconds * 1000:.0f}ms' for t in slowest)}"
+        )
+        logger.debug(
+            "Per-page timing for %s: %s", file_path,
+            ", ".join(f"p{t.page} {t.seconds * 1000:.1f}ms/{t.chars}ch" for t in result.timings),
+        )
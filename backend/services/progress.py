@@ -0,0 +1,123 @@
+"""
+Task progress events over Redis pub/sub, streamed to browsers as Server-Sent Events
+"""
+
+import json
+import time
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Stages a task reports once it is picked up (a queued candidate shows up in
+# the snapshot); "done" and "failed" end a candidate's stream
+STAGES = ("text_extracted", "llm_started", "partial_fields", "done", "failed")
+TERMINAL_STAGES = {"done", "failed"}
+
+
+class ProgressPublisher:
+    """
+    Publishes stage transitions per candidate on `progress:candidate:<id>`,
+    and also on `progress:batch:<id>` for a candidate processed as part of a
+    batch, so a batch viewer needs one subscription instead of one per member.
+
+    Publishing is fire-and-forget: with no subscriber the message is simply
+    dropped, and a Redis error never fails the task that reported progress.
+    """
+
+    def __init__(self, client: "redis.Redis", prefix: str = "progress"):
+        self.client = client
+        self.prefix = prefix
+
+    def channel(self, candidate_id: str) -> str:
+        return f"{self.prefix}:candidate:{candidate_id}"
+
+    def batch_channel(self, batch_id: str) -> str:
+        return f"{self.prefix}:batch:{batch_id}"
+
+    def publish(self, candidate_id: str, stage: str, batch_id: Optional[str] = None, **data: Any) -> None:
+        event = {
+            "candidate_id": candidate_id,
+            "stage": stage,
+            "timestamp": datetime.utcnow().isoformat(),
+            **data,
+        }
+        try:
+            message = json.dumps(event)
+            self.client.publish(self.channel(candidate_id), message)
+            if batch_id:
+                self.client.publish(self.batch_channel(batch_id), message)
+        except redis.exceptions.RedisError as e:
+            logger.debug(f"Progress event {stage} for {candidate_id} not published: {e}")
+
+
+def format_sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    lines = [f"event: {event}"] if event else []
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class ProgressStream:
+    """
+    Subscribes to the channel of one candidate or one batch and yields SSE text.
+
+    Ends once every candidate has reached a terminal stage, after
+    `max_seconds` (EventSource reconnects on its own), or when the client
+    goes away. A comment line is sent every `heartbeat` seconds so proxies
+    keep the connection open and a closed socket is noticed.
+    """
+
+    def __init__(
+        self,
+        publisher: ProgressPublisher,
+        heartbeat: float = 15.0,
+        max_seconds: float = 600.0,
+        poll_interval: float = 1.0,
+    ):
+        self.publisher = publisher
+        self.heartbeat = heartbeat
+        self.max_seconds = max_seconds
+        self.poll_interval = poll_interval
+
+    def stream(self, channel: str,
+               load_snapshot: Callable[[], Tuple[Dict[str, Any], Set[str]]]) -> Iterator[str]:
+        """
+        Yield SSE messages from `channel` (a candidate's or a batch's).
+        `load_snapshot` returns the current state to send first and the ids
+        still unfinished; the stream closes once none are left.
+        """
+        pubsub = self.publisher.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            # Subscribe before reading the snapshot so no transition falls between the two
+            pubsub.subscribe(channel)
+            snapshot, pending = load_snapshot()
+            pending = set(pending)
+            yield format_sse(snapshot, event="snapshot")
+            if not pending:
+                yield format_sse({"pending": 0}, event="end")
+                return
+
+            started = last_sent = time.monotonic()
+            while time.monotonic() - started < self.max_seconds:
+                message = pubsub.get_message(timeout=self.poll_interval)
+                now = time.monotonic()
+                if message and message.get("type") == "message":
+                    event = json.loads(message["data"])
+                    yield format_sse(event, event="progress")
+                    last_sent = now
+                    if event.get("stage") in TERMINAL_STAGES:
+                        pending.discard(event.get("candidate_id"))
+                        if not pending:
+                            yield format_sse({"pending": 0}, event="end")
+                            return
+                elif now - last_sent >= self.heartbeat:
+                    yield ": keepalive\n\n"
+                    last_sent = now
+        except redis.exceptions.RedisError as e:
+            logger.warning(f"Progress stream lost its Redis subscription: {e}")
+            yield format_sse({"error": "Progress updates unavailable; fall back to polling"}, event="error")
+        finally:
+            pubsub.close()
@@ -0,0 +1,274 @@
+"""
+BM25 ranking of the candidate pool against a job description
+"""
+
+import os
+import re
+import json
+import math
+import logging
+import sqlite3
+import threading
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Keeps tech tokens like c++, c#, node.js and .net intact
+TOKEN_RE = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have he her his i in is it its of on or our she "
+    "that the their them they this to was we were will with you your who whom which what when where "
+    "also etc using used use work worked working years year experience responsible including".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    # Single letters are noise except for the C and R languages
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if (len(t) > 1 and t not in STOPWORDS) or t in ("c", "r")]
+
+
+class RankingIndex:
+    """
+    Durable per-candidate term frequencies, written by Celery workers and
+    read incrementally by the web process.
+
+    Every write takes the next value of a global sequence, so readers only
+    fetch rows with seq greater than the last one they applied.
+    """
+
+    def __init__(self, data_folder: str, max_terms_per_doc: int = 256, skill_weight: float = 3.0):
+        os.makedirs(data_folder, exist_ok=True)
+        self.db_path = os.path.join(data_folder, 'ranking.db')
+        self.max_terms_per_doc = max_terms_per_doc
+        self.skill_weight = skill_weight
+        self._initialize_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self) -> None:
+        with self._get_connection() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ranking_docs (
+                    candidate_id TEXT PRIMARY KEY,
+                    seq INTEGER NOT NULL,
+                    doc_len REAL NOT NULL DEFAULT 0,
+                    terms TEXT,
+                    deleted INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_docs_seq ON ranking_docs (seq)")
+            conn.execute("CREATE TABLE IF NOT EXISTS ranking_seq (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO ranking_seq (id, value) VALUES (1, 0)")
+            conn.commit()
+
+    def document_terms(self, skills: Iterable[str], designation: Optional[str], text: Optional[str]) -> Dict[str, float]:
+        """
+        Weighted term frequencies for one candidate. Parsed skills and the
+        designation count `skill_weight` times; the resume text is capped to
+        its most frequent terms to bound index size.
+        """
+        counts = Counter(tokenize(text or ""))
+        if len(counts) > self.max_terms_per_doc:
+            counts = Counter(dict(counts.most_common(self.max_terms_per_doc)))
+        terms = {t: float(c) for t, c in counts.items()}
+        boosted = tokenize(" ".join(s for s in (skills or []) if isinstance(s, str)) + " " + (designation or ""))
+        for term in boosted:
+            terms[term] = terms.get(term, 0.0) + self.skill_weight
+        return terms
+
+    def upsert(self, candidate_id: str, skills: Iterable[str], designation: Optional[str], text: Optional[str]) -> None:
+        terms = self.document_terms(skills, designation, text)
+        self._write(candidate_id, terms, deleted=False)
+
+    def remove(self, candidate_id: str) -> None:
+        self._write(candidate_id, {}, deleted=True)
+
+    def _write(self, candidate_id: str, terms: Dict[str, float], deleted: bool) -> None:
+        with self._get_connection() as conn:
+            seq = conn.execute("UPDATE ranking_seq SET value = value + 1 WHERE id = 1 RETURNING value").fetchone()[0]
+            conn.execute(
+                """
+                INSERT INTO ranking_docs (candidate_id, seq, doc_len, terms, deleted, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(candidate_id) DO UPDATE SET
+                    seq = excluded.seq, doc_len = excluded.doc_len, terms = excluded.terms,
+                    deleted = excluded.deleted, updated_at = excluded.updated_at
+                """,
+                (candidate_id, seq, sum(terms.values()), json.dumps(terms), int(deleted),
+                 datetime.utcnow().isoformat()),
+            )
+            conn.commit()
+
+    def changes_since(self, seq: int, batch_size: int = 5000) -> Iterable[sqlite3.Row]:
+        """Rows written after `seq`, in sequence order."""
+        conn = self._get_connection()
+        try:
+            while True:
+                rows = conn.execute(
+                    "SELECT candidate_id, seq, terms, deleted FROM ranking_docs WHERE seq > ? ORDER BY seq LIMIT ?",
+                    (seq, batch_size),
+                ).fetchall()
+                if not rows:
+                    return
+                yield from rows
+                seq = rows[-1]['seq']
+        finally:
+            conn.close()
+
+    def count(self) -> int:
+        with self._get_connection() as conn:
+            return conn.execute("SELECT COUNT(1) FROM ranking_docs WHERE deleted = 0").fetchone()[0]
+
+
+class RankingEngine:
+    """
+    In-memory BM25 over the RankingIndex.
+
+    Postings are kept per term as growable stdlib arrays and viewed as
+    numpy arrays at query time without copying, so a query is a sparse
+    matrix-vector product done one query term at a time, followed by
+    argpartition for the top K. Query terms present in more than
+    `max_df_ratio` of documents are skipped. An updated candidate gets a new
+    document slot and the old one is tombstoned; a restart compacts the slots.
+    """
+
+    # Small pools are cheap to score in full
+    PRUNE_MIN_DOCS = 10000
+
+    def __init__(self, index: RankingIndex, k1: float = 1.2, b: float = 0.75, max_df_ratio: float = 0.5):
+        self.index = index
+        self.k1 = k1
+        self.b = b
+        self.max_df_ratio = max_df_ratio
+
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._doc_ids: List[str] = []
+        self._slots: Dict[str, int] = {}
+        self._doc_len = array('f')
+        self._alive = bytearray()
+        self._live = 0
+        self._total_len = 0.0
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # BM25 length normalisation per slot, rebuilt only after a sync changed the corpus
+        self._norm: Optional[np.ndarray] = None
+
+    def sync(self) -> int:
+        """Apply index changes written since the last sync; returns how many."""
+        with self._lock:
+            applied = 0
+            for row in self.index.changes_since(self._seq):
+                terms = {} if row['deleted'] else json.loads(row['terms'] or '{}')
+                self._apply(row['candidate_id'], terms, bool(row['deleted']))
+                self._seq = row['seq']
+                applied += 1
+            if applied:
+                self._norm = None
+                logger.info(f"Ranking index synced {applied} changes ({self._live} candidates)")
+            return applied
+
+    def _apply(self, candidate_id: str, terms: Dict[str, float], deleted: bool) -> None:
+        old = self._slots.pop(candidate_id, None)
+        if old is not None:
+            self._alive[old] = 0
+            self._live -= 1
+            self._total_len -= self._doc_len[old]
+        if deleted or not terms:
+            return
+
+        slot = len(self._doc_ids)
+        self._doc_ids.append(candidate_id)
+        self._slots[candidate_id] = slot
+        doc_len = sum(terms.values())
+        self._doc_len.append(doc_len)
+        self._alive.append(1)
+        self._live += 1
+        self._total_len += doc_len
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array('I'), array('f'))
+            postings[0].append(slot)
+            postings[1].append(tf)
+
+    def rank(self, query: str, top_k: int = 20) -> List[Tuple[str, float]]:
+        """Top-K (candidate_id, score) pairs for free text such as a job description."""
+        self.sync()
+        query_terms = Counter(tokenize(query))
+        with self._lock:
+            if not query_terms or not self._live:
+                return []
+            n_docs = self._live
+            tombstones = len(self._doc_ids) - n_docs
+            alive = np.frombuffer(self._alive, dtype=np.uint8).astype(bool) if tombstones else None
+            if self._norm is None:
+                doc_len = np.frombuffer(self._doc_len, dtype=np.float32)
+                self._norm = (self.k1 * (1 - self.b + self.b * doc_len / (self._total_len / n_docs))).astype(np.float32)
+            norm = self._norm
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+
+            # Terms in most documents carry almost no idf but dominate the cost; drop them
+            # unless nothing else matched
+            present = [t for t in query_terms if t in self._postings]
+            selective = present
+            if n_docs >= self.PRUNE_MIN_DOCS:
+                selective = [t for t in present if len(self._postings[t][0]) <= self.max_df_ratio * n_docs]
+            for term in selective or present:
+                qtf = query_terms[term]
+                postings = self._postings[term]
+                slots = np.frombuffer(postings[0], dtype=np.uint32)
+                tf = np.frombuffer(postings[1], dtype=np.float32)
+                df = int(np.count_nonzero(alive[slots])) if tombstones else len(slots)
+                if not df:
+                    continue
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                # Repeated words in the query count, with diminishing returns
+                weight = idf * (1 + math.log(qtf))
+                # Slots are unique within a posting list, so fancy-index += is exact
+                scores[slots] += weight * tf * (self.k1 + 1) / (tf + norm[slots])
+
+            if tombstones:
+                scores[~alive] = 0
+            matched = int(np.count_nonzero(scores))
+            k = min(top_k, matched)
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self._doc_ids[i], round(float(scores[i]), 4)) for i in top]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'candidates': self._live,
+                'slots': len(self._doc_ids),
+                'terms': len(self._postings),
+                'seq': self._seq,
+            }
+
+
+def backfill_from_store(index: RankingIndex, candidate_store, batch_size: int = 500) -> int:
+    """Index every candidate already in the store; used once when the ranking index is empty."""
+    fields = ['skills', 'designation', 'resume_text']
+    after, indexed = None, 0
+    while True:
+        page = candidate_store.list_candidates(1, batch_size, after=after, with_total=False, fields=fields)
+        for item in page['items']:
+            if item.get('skills') or item.get('resume_text'):
+                index.upsert(item['id'], item.get('skills') or [], item.get('designation'), item.get('resume_text'))
+                indexed += 1
+        if not page['next_cursor']:
+            return indexed
+        after = candidate_store.parse_cursor(page['next_cursor'])
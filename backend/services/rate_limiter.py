@@ -0,0 +1,101 @@
+"""
+Cluster-wide concurrency limiter for LLM calls, backed by Redis
+"""
+
+import time
+import uuid
+import random
+import logging
+from typing import Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class RedisSemaphore:
+    """
+    Counting semaphore shared by every process that talks to the same Redis.
+
+    Holders live in a sorted set scored by acquisition time. Acquiring runs
+    an optimistic WATCH/MULTI transaction: count leases younger than
+    `lease_seconds` (older ones belong to a worker that died mid-call and
+    are dropped) and add a token only if under `limit`. Only plain commands
+    are used, so any redis-py compatible client works, including fakeredis
+    in tests.
+
+    If Redis cannot be reached or times out, the limiter fails open and the caller falls
+    back to its per-process cap.
+    """
+
+    def __init__(
+        self,
+        client: "redis.Redis",
+        name: str = "llm",
+        limit: int = 4,
+        lease_seconds: float = 600.0,
+        poll_interval: float = 0.1,
+    ):
+        self.client = client
+        self.key = f"semaphore:{name}"
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+
+    def acquire(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait for a slot and return its token. Returns "" when Redis is
+        unavailable (fail open) and None if `timeout` seconds pass first.
+        """
+        token = uuid.uuid4().hex
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waited = False
+        while True:
+            try:
+                if self._try_acquire(token):
+                    if waited:
+                        logger.debug(f"Acquired {self.key} slot after waiting")
+                    return token
+            except redis.exceptions.RedisError as e:
+                logger.warning(f"Rate limiter unavailable, continuing without a cluster slot: {e}")
+                return ""
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            waited = True
+            # Jitter keeps waiting workers from retrying in lockstep
+            time.sleep(self.poll_interval * random.uniform(0.5, 1.5))
+
+    def _try_acquire(self, token: str) -> bool:
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.key)
+                    now = time.time()
+                    # Writing a watched key before MULTI would abort our own EXEC, so only read here
+                    if pipe.zcount(self.key, now - self.lease_seconds, "+inf") >= self.limit:
+                        pipe.unwatch()
+                        return False
+                    pipe.multi()
+                    pipe.zremrangebyscore(self.key, "-inf", now - self.lease_seconds)
+                    pipe.zadd(self.key, {token: now})
+                    pipe.expire(self.key, int(self.lease_seconds) + 60)
+                    pipe.execute()
+                    return True
+                except redis.exceptions.WatchError:
+                    # Another process changed the holders between WATCH and EXEC; re-check
+                    continue
+
+    def release(self, token: Optional[str]) -> None:
+        if not token:
+            return
+        try:
+            self.client.zrem(self.key, token)
+        except redis.exceptions.RedisError as e:
+            # The lease expires on its own
+            logger.warning(f"Could not release {self.key} slot: {e}")
+
+    def in_use(self) -> int:
+        try:
+            return self.client.zcount(self.key, time.time() - self.lease_seconds, "+inf")
+        except redis.exceptions.RedisError:
+            return -1
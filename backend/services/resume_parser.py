@@ -2,57 +2,141 @@ import os
 import re
 import json
 import logging
-import PyPDF2
 import docx
-import requests
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from services.parse_cache import ParseCache
+from services.pdf_extractor import PdfTextExtractor
+from services.ocr import OcrEngine
+from services.ollama_client import OllamaClient
+from services.json_stream import IncrementalJSONParser
+from services.resume_sections import chunk_resume
+from services.fast_extractor import FastExtractor, FastPathPolicy
+from services.skill_matcher import get_skill_matcher
+from utils.exceptions import AIServiceError
 
 logger = logging.getLogger(__name__)
 
+PartialCallback = Callable[[Dict[str, Any]], None]
+
+# Fields asked of the LLM, with the example value and confidence the prompt shows for each
+FIELD_EXAMPLES = {
+    "name": ("John Doe", 0.95),
+    "email": ("john@example.com", 0.98),
+    "phone": ("+123456789", 0.85),
+    "current_company": ("Tech Corp", 0.88),
+    "designation": ("Software Engineer", 0.9),
+    "skills": (["Python", "AWS"], 0.92),
+    "experience_years": (5, 0.9),
+    "education": ("B.Tech Computer Science", 0.93),
+    "location": ("Bangalore", 0.87),
+}
+FIELD_HINTS = {"skills": " (array)", "experience_years": " (number)"}
+# Contact details sit in the resume header, which is always at the start of the first chunk
+HEADER_FIELDS = ("name", "email", "phone")
+BODY_FIELDS = tuple(f for f in FIELD_EXAMPLES if f not in HEADER_FIELDS)
+# Example values a model echoes back when the text has no answer; never real data
+PLACEHOLDER_VALUES = {
+    "name": {"john doe"},
+    "email": {"john@example.com"},
+    "phone": {"+123456789"},
+    "current_company": {"tech corp"},
+}
+
 
 class ResumeParser:
     """Parse resumes and extract structured information using LLM"""
 
+    # Bump whenever the extraction prompt or post-processing changes so
+    # cached parse results from the old prompt are no longer served.
+    PROMPT_VERSION = "v6"
+
     def __init__(
         self,
         model_name: str = "llama3:instruct",
         base_url: str = "http://localhost:11434",
+        parse_cache: Optional[ParseCache] = None,
+        ollama_client: Optional[OllamaClient] = None,
+        timeout: float = 90,
+        stream: bool = True,
+        chunk_chars: int = 4000,
+        max_parallel_chunks: int = 4,
+        fast_path_policy: Optional[FastPathPolicy] = None,
+        skills_taxonomy_path: Optional[str] = None,
+        pdf_extractor: Optional[PdfTextExtractor] = None,
+        ocr_engine: Optional[OcrEngine] = None,
     ):
         self.model_name = model_name
         self.base_url = base_url
-        self.api_url = f"{base_url}/api/generate"
-
-    def parse_resume(self, file_path: str) -> Dict[str, Any]:
+        self.ollama = ollama_client or OllamaClient(base_url)
+        self.timeout = timeout
+        self.stream = stream
+        self.chunk_chars = chunk_chars
+        self.max_parallel_chunks = max_parallel_chunks
+        self.fast_extractor = FastExtractor(get_skill_matcher(skills_taxonomy_path))
+        self.fast_path_policy = fast_path_policy
+        self.pdf_extractor = pdf_extractor or PdfTextExtractor()
+        self.ocr_engine = ocr_engine
+        self.parse_cache = parse_cache
+
+    def parse_resume(self, file_path: str, on_partial: Optional[PartialCallback] = None,
+                     text: Optional[str] = None) -> Dict[str, Any]:
         """
         Parse resume file and extract structured candidate information.
         Returns parsed_data and confidence scores.
+
+        `on_partial` receives {"parsed_data", "confidence"} for fields the LLM
+        has finished while the rest are still streaming. Pass `text` when it
+        was already extracted with extract_text.
         """
         try:
-            # Step 1: Extract text
-            text = self._extract_text(file_path)
+            # Step 0: Serve repeat uploads straight from the parse cache
+            file_hash = cache_key = None
+            if self.parse_cache:
+                file_hash = self.parse_cache.hash_file(file_path)
+                cache_key = ParseCache.make_key(file_hash, self.model_name, self.PROMPT_VERSION)
+                cached = self.parse_cache.get_result(cache_key)
+                if cached is not None:
+                    logger.info(f"Parse cache hit for {file_path}")
+                    return cached
+
+            # Step 1: Extract text (reused from the cache if these bytes were seen before)
+            if text is None:
+                text = self.extract_text(file_path, file_hash)
             if not text or len(text.strip()) < 50:
                 raise ValueError("Could not extract sufficient text from resume")
 
-            # Step 2: LLM-based extraction
-            llm_result = self._extract_with_llm(text)
-            basic_result = self._basic_extraction(text)
+            # Step 2: Deterministic extraction; skip the LLM when it is confident enough
+            fast_result = self.fast_extractor.extract(text)
+            fast_path = self.fast_path_policy is not None and self.fast_path_policy.allows_skip(fast_result)
+            if fast_path:
+                logger.info(f"Fast path parse, skipping LLM: {file_path}")
+                llm_result = {}
+            else:
+                llm_result = self._extract_with_llm(text, on_partial)
 
             parsed_data = llm_result.get("parsed_data", {})
             confidence = llm_result.get("confidence", {})
 
-            # Step 3: Merge fallback values
-            for k, v in basic_result.items():
+            # Step 3: Merge deterministic values where the LLM found nothing
+            for k, v in fast_result["parsed_data"].items():
                 if not parsed_data.get(k):
                     parsed_data[k] = v
-                    confidence[k] = confidence.get(k, 0.4)  # heuristic fallback confidence
+                    confidence[k] = fast_result["confidence"].get(k, 0.4)
 
             # Step 4: Clean up confidence (default 0.5 for missing)
             for k in parsed_data.keys():
                 if k not in confidence:
                     confidence[k] = 0.5
 
+            result = {"parsed_data": parsed_data, "confidence": confidence}
+
+            # Cache LLM-backed and fast-path results; a fallback after an LLM failure should be retried next time
+            if cache_key:
+                self.parse_cache.put(cache_key, file_hash, text, result if (llm_result or fast_path) else None)
+
             logger.info(f"Resume parsed successfully: {file_path}")
-            return {"parsed_data": parsed_data, "confidence": confidence}
+            return result
 
         except ValueError as ve:
             logger.warning(f"Validation error while parsing resume {file_path}: {ve}")
@@ -62,6 +146,32 @@ class ResumeParser:
             logger.error(f"Unexpected error while parsing resume {file_path}: {e}", exc_info=True)
             return {"parsed_data": {}, "confidence": {}, "error": "Internal parsing error"}
 
+    def reuse_parse(self, existing: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """
+        Build a result from a near-duplicate's parse without calling the LLM.
+        Contact details often differ between agency copies, so confident
+        deterministic values from this text replace the copied ones.
+        """
+        parsed_data = dict(existing.get("parsed_data", {}))
+        confidence = dict(existing.get("confidence", {}))
+        fast_result = self.fast_extractor.extract(text)
+        for k in ("name", "email", "phone"):
+            value = fast_result["parsed_data"].get(k)
+            score = fast_result["confidence"].get(k, 0)
+            if value and score >= 0.8:
+                parsed_data[k] = value
+                confidence[k] = score
+        return {"parsed_data": parsed_data, "confidence": confidence}
+
+    def extract_text(self, file_path: str, file_hash: Optional[str] = None) -> str:
+        """Resume text, reused from the parse cache when these bytes were seen before"""
+        if self.parse_cache and file_hash is None:
+            file_hash = self.parse_cache.hash_file(file_path)
+        text = self.parse_cache.get_text(file_hash) if file_hash else None
+        if text is None:
+            text = self._extract_text(file_path)
+        return text
+
     def _extract_text(self, file_path: str) -> str:
         """Extract text from PDF or DOCX file"""
         ext = os.path.splitext(file_path)[1].lower()
@@ -74,17 +184,16 @@ class ResumeParser:
             raise ValueError(f"Unsupported file format: {ext}")
 
     def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text = ""
+        """Extract text from PDF, falling back to OCR for scanned (image-only) files"""
         try:
-            with open(file_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            text = self.pdf_extractor.extract(file_path).text
+            if len(text.strip()) < 50 and self.ocr_engine and self.ocr_engine.available:
+                logger.info(f"No usable text layer, running OCR: {file_path}")
+                text = self.ocr_engine.ocr_file(file_path).text
+            return text
         except Exception as e:
             logger.error(f"Error extracting PDF: {str(e)}")
             raise
-        return text
 
     def _extract_from_docx(self, file_path: str) -> str:
         """Extract text from DOCX"""
@@ -163,146 +272,193 @@ class ResumeParser:
 #             logger.error(f"Unexpected error in LLM extraction: {str(e)}")
 #             return {}
 
-    def _extract_with_llm(self, text: str) -> Dict[str, Any]:
-        """Use Ollama LLM to extract structured data with confidence scores"""
+    def _extract_with_llm(self, text: str, on_partial: Optional[PartialCallback] = None) -> Dict[str, Any]:
+        """
+        Use Ollama LLM to extract structured data with confidence scores.
+
+        Resumes longer than one chunk are split on section boundaries and the
+        chunks are extracted concurrently, then merged field by field, so
+        nothing past the first chunk is dropped. Only the first chunk, which
+        holds the header, is asked for name, email and phone.
+        """
+        chunks = chunk_resume(text, self.chunk_chars)
+        if len(chunks) == 1:
+            return self._extract_chunk_with_llm(chunks[0], on_partial)
+
+        logger.info(f"extracting using llms over {len(chunks)} chunks")
+        results = []
+        with ThreadPoolExecutor(max_workers=min(len(chunks), self.max_parallel_chunks)) as pool:
+            futures = [
+                pool.submit(self._extract_chunk_with_llm, chunk, None, tuple(FIELD_EXAMPLES) if i == 0 else BODY_FIELDS)
+                for i, chunk in enumerate(chunks)
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                if not result:
+                    continue
+                results.append(result)
+                if on_partial:
+                    try:
+                        on_partial(self._merge_chunk_results(results))
+                    except Exception as e:
+                        logger.warning(f"Partial field callback failed: {e}")
+
+        return self._merge_chunk_results(results) if results else {}
+
+    def _merge_chunk_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge per-chunk extractions: for each field keep the most confident
+        non-empty value; skills are unioned across chunks.
+        """
+        parsed_data: Dict[str, Any] = {}
+        confidence: Dict[str, Any] = {}
+
+        for result in results:
+            for key, value in result.get("parsed_data", {}).items():
+                score = result.get("confidence", {}).get(key, 0.5)
+                if key == "skills" and isinstance(value, list):
+                    merged = parsed_data.setdefault(key, [])
+                    seen = {str(s).lower() for s in merged}
+                    merged.extend(s for s in value if s and str(s).lower() not in seen)
+                    confidence[key] = max(confidence.get(key, 0), score)
+                elif value not in (None, "", []) and score > confidence.get(key, -1):
+                    parsed_data[key] = value
+                    confidence[key] = score
+                elif key not in parsed_data:
+                    parsed_data[key] = value
+                    confidence[key] = score
+
+        return {"parsed_data": parsed_data, "confidence": confidence}
+
+    def _extract_chunk_with_llm(self, text: str, on_partial: Optional[PartialCallback] = None,
+                                requested: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+        """
+        Run one extraction call over a single chunk of resume text, asking
+        only for the `requested` fields (all of them by default).
+
+        In streaming mode each field is handed to `on_partial` as soon as it
+        is complete, and the generation is cut off once the "fields" object
+        closes instead of waiting for the model to stop talking.
+        """
 
         logger.info("extracting using llms")
 
+        requested = requested or tuple(FIELD_EXAMPLES)
+        field_list = "\n".join(f"        - {f}{FIELD_HINTS.get(f, '')}" for f in requested)
+        examples = ",\n".join(
+            f'            "{f}": {{"value": {json.dumps(FIELD_EXAMPLES[f][0])}, "confidence": {FIELD_EXAMPLES[f][1]}}}'
+            for f in requested
+        )
         prompt = f"""
         You are a resume parser. Extract the following information as a JSON object.
         For each field, include a confidence score (0 to 1) indicating how sure you are.
 
         Resume Text:
-        {text[:4000]}
+        {text[:self.chunk_chars]}
 
         Fields:
-        - name
-        - email
-        - phone
-        - current_company
-        - designation
-        - skills (array)
-        - experience_years (number)
-        - education
-        - location
+{field_list}
 
         Output format (strict JSON only, no extra text):
         {{
         "fields": {{
-            "name": {{"value": "John Doe", "confidence": 0.95}},
-            "email": {{"value": "john@example.com", "confidence": 0.98}},
-            "phone": {{"value": "+123456789", "confidence": 0.85}},
-            "current_company": {{"value": "Tech Corp", "confidence": 0.88}},
-            "designation": {{"value": "Software Engineer", "confidence": 0.9}},
-            "skills": {{"value": ["Python", "AWS"], "confidence": 0.92}},
-            "experience_years": {{"value": 5, "confidence": 0.9}},
-            "education": {{"value": "B.Tech Computer Science", "confidence": 0.93}},
-            "location": {{"value": "Bangalore", "confidence": 0.87}}
+{examples}
         }}
         }}
         """
 
         try:
-            response = requests.post(
-                self.api_url,
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.1, "top_p": 0.9},
-                },
-                timeout=90,
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                generated_text = result.get("response", "").strip()
-                json_match = re.search(r"\{.*\}", generated_text, re.DOTALL)
-
-                if not json_match:
+            if self.stream:
+                fields = self._stream_fields(prompt, on_partial)
+            else:
+                generated_text = self.ollama.generate(
+                    self.model_name,
+                    prompt,
+                    options={"temperature": 0.1, "top_p": 0.9},
+                    timeout=self.timeout,
+                )
+                parser = IncrementalJSONParser()
+                parser.feed(generated_text)
+                if not parser.complete:
                     logger.warning("No JSON found in LLM response")
                     return {}
+                fields = parser.value().get("fields", {})
 
-                parsed = json.loads(json_match.group())
-                fields = parsed.get("fields", {})
-
-                cleaned_data = {}
-                confidence_data = {}
-
-                for key, val in fields.items():
-                    cleaned_data[key] = val.get("value")
-                    confidence_data[key] = val.get("confidence", 0.5)
-
-                return {"parsed_data": cleaned_data, "confidence": confidence_data}
-
-            else:
-                logger.error(f"Ollama API error: {response.status_code}")
+            if not fields:
+                logger.warning("No fields found in LLM response")
                 return {}
+            # Models answer unrequested fields too; a chunk without the header would only guess them
+            return self._fields_to_result({k: v for k, v in fields.items() if k in requested})
 
+        except AIServiceError as e:
+            logger.error(str(e))
+            return {}
         except Exception as e:
-            logger.error(f"Error in _extract_with_llm: {e}", exc_info=True)
+            logger.error(f"Error in _extract_chunk_with_llm: {e}", exc_info=True)
             return {}
 
 
-    def _basic_extraction(self, text: str) -> Dict[str, Any]:
-        """Fallback: Basic regex-based extraction"""
-
-        result = {
-            "name": None,
-            "email": None,
-            "phone": None,
-            "current_company": None,
-            "designation": None,
-            "skills": [],
-            "experience_years": None,
-            "education": None,
-            "location": None,
-        }
-
-        # Extract email
-        email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-        emails = re.findall(email_pattern, text)
-        if emails:
-            result["email"] = emails[0]
-
-        # Extract phone (Indian format)
-        phone_pattern = r"[\+]?[(]?[0-9]{1,3}[)]?[-\s\.]?[(]?[0-9]{1,4}[)]?[-\s\.]?[0-9]{1,4}[-\s\.]?[0-9]{1,9}"
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            result["phone"] = phones[0].strip()
-
-        # Extract common skills
-        common_skills = [
-            "Python",
-            "Java",
-            "JavaScript",
-            "React",
-            "Node.js",
-            "AWS",
-            "Docker",
-            "Kubernetes",
-            "SQL",
-            "MongoDB",
-            "Git",
-            "Machine Learning",
-            "AI",
-            "Flask",
-            "Django",
-            "Spring",
-            "Angular",
-            "Vue",
-            "TypeScript",
-        ]
-
-        found_skills = []
-        text_lower = text.lower()
-        for skill in common_skills:
-            if skill.lower() in text_lower:
-                found_skills.append(skill)
-
-        result["skills"] = found_skills
-
-        return result
+    def _stream_fields(self, prompt: str, on_partial: Optional[PartialCallback]) -> Dict[str, Any]:
+        """Consume the token stream until the "fields" object is complete."""
+        parser = IncrementalJSONParser()
+        fields: Dict[str, Any] = {}
+        state = {"done": False}
+
+        def on_close(depth: int) -> None:
+            # depth 2: one field entry inside "fields" closed; depth <= 1: "fields" itself closed
+            if depth > 2:
+                return
+            try:
+                snapshot = parser.snapshot()
+            except ValueError:
+                return
+            current = snapshot.get("fields") if isinstance(snapshot, dict) else None
+            if not isinstance(current, dict):
+                return
+            new_fields = {
+                k: v for k, v in current.items()
+                if isinstance(v, dict) and k not in fields
+            }
+            fields.update(new_fields)
+            if new_fields and on_partial:
+                try:
+                    on_partial(self._fields_to_result(new_fields))
+                except Exception as e:
+                    logger.warning(f"Partial field callback failed: {e}")
+            if depth <= 1:
+                state["done"] = True
+
+        tokens = self.ollama.generate_stream(
+            self.model_name,
+            prompt,
+            options={"temperature": 0.1, "top_p": 0.9},
+            timeout=self.timeout,
+        )
+        try:
+            for token in tokens:
+                parser.feed(token, on_close)
+                if state["done"] or parser.complete:
+                    break
+        finally:
+            # Closing the stream drops the connection so Ollama stops generating
+            tokens.close()
+
+        if not state["done"]:
+            logger.warning("LLM stream ended before the fields object was complete")
+        return fields
+
+    def _fields_to_result(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        cleaned_data = {}
+        confidence_data = {}
+
+        for key, val in fields.items():
+            value = val.get("value")
+            if isinstance(value, str) and value.strip().lower() in PLACEHOLDER_VALUES.get(key, ()):
+                continue  # the prompt's example echoed back
+            cleaned_data[key] = value
+            confidence_data[key] = val.get("confidence", 0.5)
+
+        return {"parsed_data": cleaned_data, "confidence": confidence_data}
 
     def _clean_extracted_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and validate extracted data"""
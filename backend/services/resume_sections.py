@@ -0,0 +1,115 @@
+"""
+Split resume text into sections and pack them into LLM-sized chunks
+"""
+
+import re
+from typing import List, NamedTuple
+
+
+class Section(NamedTuple):
+    name: str
+    text: str
+
+
+# Canonical section name -> header alternatives (matched against a whole line)
+SECTION_HEADERS = {
+    "summary": r"(?:professional\s+|career\s+)?summary|profile|objective|about\s+me",
+    "experience": r"(?:work|professional|employment|relevant)?\s*experience|employment(?:\s+history)?|work\s+history|career\s+history",
+    "skills": r"(?:technical\s+|key\s+|core\s+)?skills(?:\s+summary)?|(?:core\s+)?competencies|technologies|tech(?:nical)?\s+stack|tools",
+    "education": r"education(?:al\s+(?:background|qualifications?))?|academics?|academic\s+background|qualifications",
+    "projects": r"(?:personal\s+|key\s+|academic\s+)?projects",
+    "certifications": r"certifications?|licen[cs]es?(?:\s+(?:and|&)\s+certifications?)?|courses",
+    "achievements": r"achievements|awards|honou?rs(?:\s+(?:and|&)\s+awards)?",
+    "languages": r"languages",
+}
+
+SECTION_HEADER_RE = re.compile(
+    r"^[\s\W]*(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_HEADERS.items())
+    + r")\s*:?\s*$",
+    re.IGNORECASE,
+)
+
+# Lines longer than this are content, never a header
+MAX_HEADER_LENGTH = 40
+
+
+def split_sections(text: str) -> List[Section]:
+    """
+    Split resume text on recognised section header lines. Text before the
+    first header (name, contact details) becomes the "header" section.
+    Repeated headers are kept as separate sections in document order.
+    """
+    sections: List[Section] = []
+    current_name = "header"
+    current_lines: List[str] = []
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        match = SECTION_HEADER_RE.match(stripped) if 0 < len(stripped) <= MAX_HEADER_LENGTH else None
+        if match:
+            if any(l.strip() for l in current_lines):
+                sections.append(Section(current_name, "\n".join(current_lines).strip()))
+            current_name = match.lastgroup
+            current_lines = [line]
+        else:
+            current_lines.append(line)
+
+    if any(l.strip() for l in current_lines):
+        sections.append(Section(current_name, "\n".join(current_lines).strip()))
+    return sections
+
+
+def chunk_sections(sections: List[Section], max_chars: int) -> List[str]:
+    """
+    Greedily pack consecutive sections into chunks of at most max_chars.
+    A section larger than max_chars is split on line boundaries.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+
+    def flush():
+        nonlocal current, size
+        if current:
+            chunks.append("\n\n".join(current))
+        current, size = [], 0
+
+    for section in sections:
+        for piece in _split_long(section.text, max_chars):
+            if size and size + len(piece) + 2 > max_chars:
+                flush()
+            current.append(piece)
+            size += len(piece) + 2
+    flush()
+    return chunks
+
+
+def chunk_resume(text: str, max_chars: int) -> List[str]:
+    """Section-aware chunks of a resume; short resumes come back as one chunk."""
+    if len(text) <= max_chars:
+        return [text]
+    return chunk_sections(split_sections(text), max_chars)
+
+
+def _split_long(text: str, max_chars: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    pieces, current, size = [], [], 0
+    for line in text.splitlines():
+        # A single over-long line is hard-wrapped
+        if len(line) > max_chars:
+            if current:
+                pieces.append("\n".join(current))
+                current, size = [], 0
+            while len(line) > max_chars:
+                pieces.append(line[:max_chars])
+                line = line[max_chars:]
+        if size + len(line) + 1 > max_chars and current:
+            pieces.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
@@ -0,0 +1,254 @@
+"""
+Skill taxonomy and multi-pattern matching over resume text
+"""
+
+import os
+import re
+import json
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Separators that put a term in a list ("Python, Go, Rust" / "C | R")
+_LIST_BEFORE = set(",;|/(•·▪●-–")
+_LIST_AFTER = set(",;|/)•·▪●")
+# A colon only introduces a list after a skills-type label ("Languages: Go", not "Contact: Ruby Singh")
+_SKILL_LABEL_RE = re.compile(
+    r"\b(?:skills?|languages?|technolog(?:y|ies)|tools?|stack|frameworks?|librar(?:y|ies)|platforms?|"
+    r"databases?|expertise|competenc(?:y|ies)|proficien(?:t|cy)(?: in)?) ?:$",
+    re.IGNORECASE,
+)
+# Prose that introduces a skill ("experienced in Go"), and words that chain another onto it ("Go and Rust")
+_INTRO_WORDS = {"in", "with", "using"}
+_CHAIN_WORDS = {" and ", " or ", " & "}
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick automaton over plain strings.
+
+    Nodes are dicts of char -> child index, so building is O(total pattern
+    length) and a search is a single pass over the text regardless of how
+    many patterns were added. `find_all` yields (start, end, value) for every
+    occurrence, including overlapping ones.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per node: (pattern length, value) for patterns ending here, including via fail links
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        self._built = False
+
+    def add(self, pattern: str, value: str) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        if not any(length == len(pattern) for length, _ in self._out[node]):
+            self._out[node].append((len(pattern), value))
+        self._built = False
+
+    def build(self) -> "AhoCorasick":
+        queue = deque(self._goto[0].values())
+        for child in queue:
+            self._fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+        self._built = True
+        return self
+
+    def find_all(self, text: str):
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i - length + 1, i + 1, value
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+
+class SkillMatcher:
+    """
+    Finds taxonomy skills in text and returns their canonical names.
+
+    Two automatons are built: a case-insensitive one for most names and
+    aliases, and a case-sensitive one for terms that are also common words
+    ("Go", "Spring", "React") or short acronyms ("ML", "TS"). A match only
+    counts on word boundaries, and overlapping matches resolve to the
+    leftmost-longest one so "C++" wins over "C" and "Spring Boot" over
+    "Spring".
+
+    Terms of one or two letters ("C", "R", "Go") and skills marked
+    `requires_context` because they double as names ("Ruby", "Rust") only
+    count in context: inside a list, after a skills label ("Languages:"),
+    after "in"/"with"/"using" unless a capitalized word (a surname) follows,
+    joined by "and"/"or" to a skill just matched, or in a skills section.
+    So "Experienced in Go and Rust" finds both, while "Rahul C. Sharma" or
+    "Contact: Ruby Singh" add no skill.
+    """
+
+    def __init__(self, skills: List[Dict]):
+        self.skills = skills
+        self.categories: Dict[str, str] = {}
+        self._context_names = {s["name"].lower() for s in skills if s.get("requires_context")}
+        self._folded = AhoCorasick()
+        self._exact = AhoCorasick()
+
+        for skill in skills:
+            name = skill["name"]
+            self.categories[name] = skill.get("category", "")
+            if skill.get("case_sensitive"):
+                self._exact.add(self._normalize(name), name)
+            else:
+                self._folded.add(self._normalize(name).lower(), name)
+            for alias in skill.get("aliases", []):
+                self._folded.add(self._normalize(alias).lower(), name)
+            for alias in skill.get("exact_aliases", []):
+                self._exact.add(self._normalize(alias), name)
+
+        self._folded.build()
+        self._exact.build()
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["skills"])
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _WHITESPACE_RE.sub(" ", text.strip())
+
+    def find(self, text: str, skills_section: bool = False) -> List[str]:
+        """
+        Canonical skill names in order of first appearance, without duplicates.
+        Pass skills_section=True for the text of a skills section, where
+        ambiguous terms need no surrounding list.
+        """
+        return list(dict.fromkeys(value for _, _, value in self.find_spans(text, skills_section)))
+
+    def find_spans(self, text: str, skills_section: bool = False) -> List[Tuple[int, int, str]]:
+        """Non-overlapping (start, end, skill) matches in the normalized text."""
+        text = self._normalize(text)
+        # str.lower() can change the length of some non-ASCII strings; keep offsets aligned
+        folded = text.lower()
+        if len(folded) != len(text):
+            folded = "".join(ch.lower()[0] if ch.lower() else ch for ch in text)
+
+        candidates = [m for m in self._folded.find_all(folded) if self._on_boundary(text, m[0], m[1])]
+        candidates += [m for m in self._exact.find_all(text) if self._on_boundary(text, m[0], m[1])]
+        candidates.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+
+        spans: List[Tuple[int, int, str]] = []
+        last_end = -1
+        for start, end, value in candidates:
+            if start < last_end:
+                continue
+            if (
+                skills_section
+                or not self._needs_context(text, start, end, value)
+                or self._in_list(text, start, end)
+                or (
+                    (self._after_intro(text, start) or (spans and text[spans[-1][1]:start] in _CHAIN_WORDS))
+                    and not self._before_surname(text, end)
+                )
+            ):
+                spans.append((start, end, value))
+                last_end = end
+        return spans
+
+    def _needs_context(self, text: str, start: int, end: int, value: str) -> bool:
+        term = text[start:end]
+        return (len(term) <= 2 and term.isalpha()) or term.lower() in self._context_names
+
+    @staticmethod
+    def _in_list(text: str, start: int, end: int) -> bool:
+        # Text is normalized, so at most one space separates a term from its neighbour
+        before = start - 2 if start > 0 and text[start - 1] == " " else start - 1
+        after = end + 1 if end < len(text) and text[end] == " " else end
+        if before >= 0 and text[before] == ":":
+            return bool(_SKILL_LABEL_RE.search(text, max(0, before - 40), before + 1))
+        return (before >= 0 and text[before] in _LIST_BEFORE) or (after < len(text) and text[after] in _LIST_AFTER)
+
+    @staticmethod
+    def _after_intro(text: str, start: int) -> bool:
+        if start < 2 or text[start - 1] != " ":
+            return False
+        word_start = text.rfind(" ", 0, start - 1) + 1
+        return text[word_start:start - 1].lower() in _INTRO_WORDS
+
+    @staticmethod
+    def _before_surname(text: str, end: int) -> bool:
+        """A capitalized word right after the term, as in "Ruby Singh"."""
+        return end + 1 < len(text) and text[end] == " " and text[end + 1].isupper()
+
+    @staticmethod
+    def _on_boundary(text: str, start: int, end: int) -> bool:
+        # Word chars on either side mean we hit part of a longer token ("Java" in "JavaScript")
+        if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+            return False
+        if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+            return False
+        # Keep "C" from matching the "C" of "C++" / "C#" when those are not in the taxonomy
+        if end < len(text) and text[end] in "+#" and _is_word_char(text[end - 1]):
+            return False
+        # "R&D", "AT&T", "Go-to-market", "C.Sharma": part of a compound or an abbreviation
+        if (start > 0 and text[start - 1] == "&") or (end < len(text) and text[end] == "&"):
+            return False
+        if end + 1 < len(text) and text[end] in "-." and text[end + 1].isalpha():
+            return False
+        return True
+
+
+_matchers: Dict[str, SkillMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_skill_matcher(path: Optional[str] = None) -> SkillMatcher:
+    """
+    Process-wide matcher for a taxonomy file, built on first use. Workers
+    share the instance across tasks instead of rebuilding the automaton.
+    """
+    path = os.path.abspath(path or DEFAULT_TAXONOMY_PATH)
+    matcher = _matchers.get(path)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(path)
+            if matcher is None:
+                matcher = SkillMatcher.from_file(path)
+                _matchers[path] = matcher
+                logger.info(f"Loaded {len(matcher.skills)} skills from {path}")
+    return matcher
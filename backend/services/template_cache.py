@@ -0,0 +1,144 @@
+import os
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MessageTemplateCache:
+    """
+    Persistent cache of LLM-written message templates shared by all workers.
+
+    Templates carry placeholders instead of candidate details, so one
+    generation serves every candidate with the same template key. Entries
+    expire after `ttl_seconds` and the least recently used are evicted
+    beyond `max_entries`.
+    """
+
+    def __init__(self, data_folder: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        os.makedirs(data_folder, exist_ok=True)
+        self.db_path = os.path.join(data_folder, 'message_templates.db')
+        self._initialize_database()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _initialize_database(self) -> None:
+        with self._get_connection() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS message_templates (
+                    template_key TEXT PRIMARY KEY,
+                    template TEXT NOT NULL,
+                    created_at TEXT,
+                    expires_at TEXT NOT NULL,
+                    last_accessed TEXT,
+                    uses INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_message_templates_last_accessed ON message_templates (last_accessed)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS message_template_stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO message_template_stats (name, value) VALUES ('hits', 0), ('misses', 0)"
+            )
+            conn.commit()
+
+    def get(self, template_key: str) -> Optional[str]:
+        """Return a live template and record a hit or miss; expired entries count as misses."""
+        try:
+            now = datetime.utcnow().isoformat()
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    """
+                    UPDATE message_templates SET last_accessed = ?, uses = uses + 1
+                    WHERE template_key = ? AND expires_at > ?
+                    RETURNING template
+                    """,
+                    (now, template_key, now),
+                ).fetchone()
+                self._bump_stat(conn, 'hits' if row else 'misses')
+                conn.commit()
+            return row['template'] if row else None
+        except Exception as e:
+            logger.warning(f"Template cache lookup failed for {template_key}: {e}")
+            return None
+
+    def put(self, template_key: str, template: str) -> None:
+        """Store a template with a fresh TTL, then drop expired and least recently used entries."""
+        try:
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=self.ttl_seconds)
+            with self._get_connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO message_templates (template_key, template, created_at, expires_at, last_accessed)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(template_key) DO UPDATE SET
+                        template = excluded.template,
+                        created_at = excluded.created_at,
+                        expires_at = excluded.expires_at,
+                        last_accessed = excluded.last_accessed
+                    """,
+                    (template_key, template, now.isoformat(), expires_at.isoformat(), now.isoformat()),
+                )
+                self._evict(conn, now.isoformat())
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Template cache store failed for {template_key}: {e}")
+
+    def delete(self, template_key: str) -> None:
+        """Drop one entry, e.g. a template that no longer renders."""
+        try:
+            with self._get_connection() as conn:
+                conn.execute("DELETE FROM message_templates WHERE template_key = ?", (template_key,))
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Template cache delete failed for {template_key}: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: str) -> None:
+        conn.execute("DELETE FROM message_templates WHERE expires_at <= ?", (now,))
+        conn.execute(
+            """
+            DELETE FROM message_templates WHERE template_key IN (
+                SELECT template_key FROM message_templates
+                ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    def _bump_stat(self, conn: sqlite3.Connection, name: str) -> None:
+        conn.execute("UPDATE message_template_stats SET value = value + 1 WHERE name = ?", (name,))
+
+    def stats(self) -> Dict[str, Any]:
+        now = datetime.utcnow().isoformat()
+        with self._get_connection() as conn:
+            counters = {r['name']: r['value'] for r in conn.execute("SELECT name, value FROM message_template_stats")}
+            entries = conn.execute("SELECT COUNT(1) FROM message_templates WHERE expires_at > ?", (now,)).fetchone()[0]
+        hits = counters.get('hits', 0)
+        misses = counters.get('misses', 0)
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+        }
@@ -1,8 +1,8 @@
 import logging
 from datetime import datetime
 from celery_worker import celery_app
+from services import container
 import os, sys
-import json
 
 sys.path.append(os.getcwd())
 
@@ -10,12 +10,45 @@ logger = logging.getLogger(__name__)
 
 
 @celery_app.task(name="tasks.generate_doc_request_background")
-def generate_doc_request_background(candidate_id: str):
+def generate_doc_request_background(candidate_id: str, tone: str = None, force_refresh: bool = False):
     """
     Celery task to asynchronously generate a personalized document request
-    message for a candidate using the AI Agent.
+    message for a candidate using the AI Agent. force_refresh bypasses the
+    cached message template.
     """
-    from app import candidate_store, ai_agent  
+    candidate_store = container.candidate_store()
+    ai_agent = container.ai_agent()
+
+    _generate_for_candidate(candidate_store, ai_agent, candidate_id, tone, force_refresh,
+                            progress=container.progress_publisher())
+
+
+@celery_app.task(name="tasks.generate_doc_requests_chunk")
+def generate_doc_requests_chunk(candidate_ids: list, tone: str = None, force_refresh: bool = False,
+                                batch_id: str = None):
+    """
+    Celery task to generate document requests for a chunk of candidates one
+    after another. Bulk requests chain chunks per lane, so the number of
+    lanes caps how many generations run at once. Progress is also published
+    on `batch_id`'s channel.
+    """
+    candidate_store = container.candidate_store()
+    ai_agent = container.ai_agent()
+
+    logger.info(f"Generating document requests for a chunk of {len(candidate_ids)} candidates")
+    progress = container.progress_publisher()
+    refreshed = set()
+    for candidate_id in candidate_ids:
+        _generate_for_candidate(candidate_store, ai_agent, candidate_id, tone, force_refresh, refreshed, progress,
+                                batch_id)
+
+
+def _generate_for_candidate(candidate_store, ai_agent, candidate_id: str, tone: str, force_refresh: bool,
+                            refreshed: set = None, progress=None, batch_id: str = None):
+    """Generate and log one request; `refreshed` limits a forced refresh to once per template key."""
+    def report(stage, **data):
+        if progress is not None:
+            progress.publish(candidate_id, stage, batch_id=batch_id, **data)
 
     try:
         logger.info(f"🚀 Starting document request generation for candidate {candidate_id}")
@@ -27,32 +60,24 @@ def generate_doc_request_background(candidate_id: str):
             return
 
         parsed_data = candidate.get("parsed_data", {}).get("parsed_data", {}) or {}
-        request_message = ai_agent.generate_document_request(parsed_data)
-
-        # Load existing document requests list (or start fresh)
-        existing_requests = candidate.get("document_requests")
-        if isinstance(existing_requests, str):
-            try:
-                existing_requests = json.loads(existing_requests)
-            except json.JSONDecodeError:
-                existing_requests = []
-        elif not existing_requests:
-            existing_requests = []
-
-        # Append the new request log
+        if force_refresh and refreshed is not None:
+            key = ai_agent.template_key(parsed_data.get("designation"), tone or ai_agent.tone)
+            force_refresh = key not in refreshed
+            refreshed.add(key)
+        report("llm_started")
+        request_message = ai_agent.generate_document_request(parsed_data, tone=tone, force_refresh=force_refresh)
+
+        # Append the new request log in place
         new_request = {
             "timestamp": datetime.utcnow().isoformat(),
             "message": request_message,
             "status": "sent"
         }
-        existing_requests.append(new_request)
-
-        # Update candidate record
-        candidate_store.update_candidate(candidate_id, {
-            "document_requests": json.dumps(existing_requests),
+        candidate_store.append_document_request(candidate_id, new_request, changes={
             "status": "document_requested",
             "updated_at": datetime.utcnow().isoformat(),
         })
+        report("done", status="document_requested")
 
         logger.info(f"✅ Document request message generated for candidate {candidate_id}")
 
@@ -62,3 +87,4 @@ def generate_doc_request_background(candidate_id: str):
             "status": "document_request_failed",
             "updated_at": datetime.utcnow().isoformat(),
         })
+        report("failed", status="document_request_failed")
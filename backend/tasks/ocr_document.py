@@ -0,0 +1,55 @@
+import logging
+from datetime import datetime
+from celery_worker import celery_app
+from services import container
+import os, sys
+
+sys.path.append(os.getcwd())
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="tasks.ocr_document_background")
+def ocr_document_background(candidate_id: str, doc_type: str, filename: str, doc_path: str):
+    """
+    Celery task to read the text of an uploaded identity document and store
+    it under documents.<doc_type>.ocr
+    """
+    candidate_store = container.candidate_store()
+    ocr_engine = container.ocr_engine()
+    pdf_extractor = container.pdf_extractor()
+
+    try:
+        logger.info(f"Starting OCR for {doc_type} of candidate {candidate_id}")
+
+        # Use the PDF text layer when there is one; OCR only scans and images
+        text, pages, pages_per_sec, source = "", 0, None, "text_layer"
+        if doc_path.lower().endswith(".pdf"):
+            extraction = pdf_extractor.extract(doc_path)
+            text, pages = extraction.text, extraction.pages_extracted
+        if len(text.strip()) < 10:
+            if ocr_engine is None or not ocr_engine.available:
+                logger.warning(f"OCR unavailable, skipping {doc_path}")
+                return
+            result = ocr_engine.ocr_file(doc_path)
+            text, pages, pages_per_sec, source = result.text, result.pages, round(result.pages_per_sec, 2), "ocr"
+
+        # The document may have been replaced while this task was queued
+        candidate = candidate_store.get_candidate(candidate_id)
+        if not candidate or (candidate["documents"].get(doc_type) or {}).get("filename") != filename:
+            logger.info(f"Skipping OCR result for replaced document {filename}")
+            return
+
+        candidate_store.set_json_fields(candidate_id, "documents", {
+            f"$.{doc_type}.ocr": {
+                "text": text.strip(),
+                "source": source,
+                "pages": pages,
+                "pages_per_sec": pages_per_sec,
+                "processed_at": datetime.utcnow().isoformat(),
+            },
+        })
+        logger.info(f"✅ OCR completed for {doc_type} of candidate {candidate_id}")
+
+    except Exception as e:
+        logger.error(f"❌ Failed to OCR {doc_type} for {candidate_id}: {e}")
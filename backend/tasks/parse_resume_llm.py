@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime
 from celery_worker import celery_app
+from services import container
 import os, sys
 
 sys.path.append(os.getcwd())
@@ -8,21 +9,85 @@ sys.path.append(os.getcwd())
 
 logger = logging.getLogger(__name__)
 
+# Statuses whose parsed_data is not a finished parse: streamed partial fields land there
+# while the original is still parsing, and a failed parse leaves whatever it got to
+UNFINISHED_PARSE_STATUSES = {"parsing_resume", "parse_failed", "task_failed"}
+
 
 @celery_app.task(name="tasks.process_resume_background")
-def process_resume_background(candidate_id: str, resume_path: str):
-    """Celery task to parse resume and update candidate record"""
-    from app import resume_parser, candidate_store  
+def process_resume_background(candidate_id: str, resume_path: str, batch_id: str = None):
+    """Celery task to parse resume and update candidate record; progress also goes to `batch_id`'s channel"""
+    resume_parser = container.resume_parser()
+    candidate_store = container.candidate_store()
+    ranking_index = container.ranking_index()
+    duplicate_index = container.duplicate_index()
+    progress = container.progress_publisher()
+
+    def report(stage, **data):
+        if progress is not None:
+            progress.publish(candidate_id, stage, batch_id=batch_id, **data)
 
     try:
         logger.info(f"Starting background resume parsing for {candidate_id}")
-        parsed_data = resume_parser.parse_resume(resume_path)
+
+        def write_partial(partial):
+            # Surface each field on the candidate as soon as the LLM finishes it
+            values = {}
+            for key, value in partial["parsed_data"].items():
+                if not key.isidentifier():
+                    continue  # keys from the model end up in a JSON path
+                values[f"$.parsed_data.{key}"] = value
+                values[f"$.confidence.{key}"] = partial["confidence"].get(key)
+            candidate_store.set_json_fields(candidate_id, "parsed_data", values)
+            report("partial_fields", fields=sorted(partial["parsed_data"]))
+
+        # Extract first so the text is stored for full-text search even if parsing fails
+        resume_text = None
+        try:
+            resume_text = resume_parser.extract_text(resume_path)
+            candidate_store.update_candidate(candidate_id, {"resume_text": resume_text})
+            report("text_extracted", chars=len(resume_text))
+        except Exception as e:
+            logger.warning(f"Text extraction failed for {candidate_id}: {e}")
+
+        # Link near-duplicates (the same person sent by several agencies)
+        duplicate = None
+        if duplicate_index is not None and resume_text:
+            try:
+                duplicate = duplicate_index.add(candidate_id, resume_text)
+            except Exception as e:
+                logger.warning(f"Duplicate check failed for {candidate_id}: {e}")
+        if duplicate:
+            logger.info(f"Candidate {candidate_id} looks like a duplicate of {duplicate.candidate_id} "
+                        f"(similarity {duplicate.similarity})")
+            candidate_store.update_candidate(candidate_id, {"duplicate_of": duplicate.candidate_id})
+
+        parsed_data = None
+        if duplicate_index is not None and duplicate_index.can_reuse_parse(duplicate):
+            original = candidate_store.get_candidate(duplicate.candidate_id) or {}
+            existing = original.get("parsed_data") or {}
+            if original.get("status") in UNFINISHED_PARSE_STATUSES:
+                logger.info(f"Not reusing parse of {duplicate.candidate_id}: status {original.get('status')}")
+            elif existing.get("parsed_data") and not existing.get("error"):
+                parsed_data = resume_parser.reuse_parse(existing, resume_text)
+                logger.info(f"Reused parse of {duplicate.candidate_id} for {candidate_id}")
+        if parsed_data is None:
+            report("llm_started")
+            parsed_data = resume_parser.parse_resume(resume_path, on_partial=write_partial, text=resume_text)
         
         candidate_store.update_candidate(candidate_id, {
             "parsed_data": parsed_data,
             "status": "pending_documents",
             "updated_at": datetime.utcnow().isoformat(),
         })
+        report("done", status="pending_documents")
+
+        # Make the candidate rankable; the web process picks this up on its next sync
+        fields = parsed_data.get("parsed_data", {})
+        try:
+            ranking_index.upsert(candidate_id, fields.get("skills") or [], fields.get("designation"), resume_text)
+        except Exception as e:
+            logger.warning(f"Ranking index update failed for {candidate_id}: {e}")
         logger.info(f"✅ Resume parsing completed for candidate {candidate_id}")
     except Exception as e:
         logger.error(f"❌ Failed to parse resume for {candidate_id}: {e}")
@@ -30,3 +95,4 @@ def process_resume_background(candidate_id: str, resume_path: str):
             "status": "parse_failed",
             "updated_at": datetime.utcnow().isoformat(),
         })
+        report("failed", status="parse_failed")
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import fakeredis
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(redis_server):
+    return fakeredis.FakeRedis(server=redis_server)
+
+
+@pytest.fixture(scope="session")
+def flask_app(tmp_path_factory):
+    """The real app, with its folders under a temp dir and Redis faked."""
+    from config import Config
+    from services import container
+
+    root = tmp_path_factory.mktemp("app")
+    Config.UPLOAD_FOLDER = str(root / "uploads")
+    Config.RESUME_FOLDER = str(root / "uploads" / "resumes")
+    Config.DOCUMENTS_FOLDER = str(root / "uploads" / "documents")
+    Config.DATA_FOLDER = str(root / "data")
+    server = fakeredis.FakeServer()
+    container.reset()
+    container.redis_client = lambda: fakeredis.FakeRedis(server=server)
+
+    cwd = os.getcwd()
+    os.chdir(root)  # app.py writes logs/ relative to the working directory
+    try:
+        import app as app_module
+    finally:
+        os.chdir(cwd)
+    app_module.app.config["TESTING"] = True
+    return app_module
@@ -0,0 +1,82 @@
+import io
+import zipfile
+
+import pytest
+
+from services.admission import QueueAdmission
+from utils.exceptions import OverloadedError
+
+
+def test_admits_under_the_limit(redis_client):
+    redis_client.rpush("parsing", *range(3))
+    QueueAdmission(redis_client, queues=["parsing"], max_depth=5).admit(2)
+
+
+def test_refuses_when_queue_is_too_deep(redis_client):
+    redis_client.rpush("parsing", *range(4))
+    redis_client.rpush("parsing:9", *range(4))  # a lower priority step counts too
+    admission = QueueAdmission(
+        redis_client, queues=["parsing"], max_depth=8, retry_after=30, priority_steps=[0, 9],
+    )
+    with pytest.raises(OverloadedError) as exc:
+        admission.admit(2)
+    assert exc.value.retry_after == 38  # 30s scaled by 10 of 8
+
+
+def test_checks_only_the_named_queue(redis_client):
+    redis_client.rpush("bulk", *range(10))
+    admission = QueueAdmission(redis_client, queues=["parsing", "bulk"], max_depth=5)
+    admission.admit(1, queue="parsing")
+    with pytest.raises(OverloadedError):
+        admission.admit(1, queue="bulk")
+
+
+def test_admits_when_redis_is_down(redis_server, redis_client):
+    redis_server.connected = False
+    QueueAdmission(redis_client, queues=["parsing"], max_depth=0).admit(1)
+
+
+def test_upload_answers_429_with_retry_after(flask_app, redis_client, monkeypatch):
+    from routes import candidates
+
+    redis_client.rpush("parsing", *range(5))
+    admission = QueueAdmission(redis_client, queues=["parsing"], max_depth=5, retry_after=20)
+    monkeypatch.setattr(candidates, "g_admission", admission)
+
+    response = flask_app.app.test_client().post(
+        "/candidates/upload",
+        data={"file": (io.BytesIO(b"%PDF-1.4"), "cv.pdf")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "24"
+    assert response.get_json()["type"] == "overloaded"
+
+
+def _archive(count):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for i in range(count):
+            zf.writestr(f"cv{i}.pdf", b"%PDF-1.4")
+    manifest = "filename,name,email,curr_company\n" + "".join(
+        f"cv{i}.pdf,Person {i},p{i}@example.org,Acme\n" for i in range(count)
+    )
+    return {
+        "archive": (io.BytesIO(buffer.getvalue()), "batch.zip"),
+        "manifest": (io.BytesIO(manifest.encode()), "manifest.csv"),
+    }
+
+
+def test_zip_batch_is_admitted_by_its_member_count(flask_app, redis_client, monkeypatch):
+    from routes import candidates
+
+    admission = QueueAdmission(redis_client, queues=["bulk"], max_depth=5, retry_after=20)
+    monkeypatch.setattr(candidates, "g_admission", admission)
+    saved = []
+    monkeypatch.setattr(candidates.g_candidate_store, "save_candidates", lambda *a, **kw: saved.append(a))
+
+    response = flask_app.app.test_client().post(
+        "/candidates/upload-batch", data=_archive(6), content_type="multipart/form-data"
+    )
+    assert response.status_code == 429
+    assert saved == []
@@ -0,0 +1,81 @@
+from services.ai_agent import AIAgent, template_problem
+from services.template_cache import MessageTemplateCache
+
+GOOD = "Dear {name},\nPlease send your PAN and Aadhaar to {sender_email}.\nBest regards,\n{sender_name}"
+CANDIDATE = {"name": "Rahul Sharma", "designation": "Software Engineer"}
+
+
+class StubOllama:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate(self, model, prompt, **kwargs):
+        self.calls += 1
+        return self.replies.pop(0)
+
+
+def make_agent(tmp_path, *replies):
+    cache = MessageTemplateCache(str(tmp_path))
+    return AIAgent(ollama_client=StubOllama(*replies), template_cache=cache), cache
+
+
+def test_template_problem_flags_stray_placeholders_and_literal_names():
+    assert template_problem(GOOD) is None
+    assert "placeholder" in template_problem(GOOD + "\n{candidate_email}")
+    assert "placeholder" in template_problem(GOOD.replace("{sender_name}", "[Your Name]"))
+    assert "name" in template_problem("Dear John Doe, {name}")
+    assert "Priya" in template_problem("Dear Priya,\n{name}, please send your documents.")
+    assert "literal" in template_problem("Dear {name},\nSend them to hr@acme.com.\nBest regards,\n{sender_name}")
+    assert "Anita" in template_problem("Dear {name},\nPlease send them.\nBest regards,\nAnita Rao")
+
+
+def test_valid_template_is_cached_and_filled(tmp_path):
+    agent, cache = make_agent(tmp_path, GOOD)
+    message = agent.generate_document_request(CANDIDATE)
+    assert message.startswith("Dear Rahul Sharma,")
+    assert cache.get(agent.template_key("Software Engineer", "formal")) == GOOD
+
+
+def test_bad_template_is_not_cached(tmp_path):
+    agent, cache = make_agent(tmp_path, "Dear {name},\nSee {portal_link}.\nBest regards,\n{sender_name}")
+    message = agent.generate_document_request(CANDIDATE)
+    assert "{" not in message and "Rahul Sharma" in message
+    assert cache.get(agent.template_key("Software Engineer", "formal")) is None
+
+
+def test_cached_template_that_fails_to_render_is_evicted(tmp_path):
+    agent, cache = make_agent(tmp_path, GOOD)
+    key = agent.template_key("Software Engineer", "formal")
+    cache.put(key, "Dear John Doe,\nSend documents to {sender_email}. {name}")
+
+    message = agent.generate_document_request(CANDIDATE)
+
+    assert "John Doe" not in message
+    assert agent.ollama.calls == 1
+    assert cache.get(key) == GOOD
+
+
+def test_candidate_braces_do_not_evict_a_good_template(tmp_path):
+    agent, cache = make_agent(tmp_path, GOOD)
+    key = agent.template_key("Software Engineer", "formal")
+    cache.put(key, GOOD)
+
+    message = agent.generate_document_request({**CANDIDATE, "name": "Rahul {Raj} Sharma"})
+
+    assert message.startswith("Dear Rahul {Raj} Sharma,")
+    assert agent.ollama.calls == 0
+    assert cache.get(key) == GOOD
+
+
+def test_fill_failure_falls_back_for_that_candidate_only(tmp_path, monkeypatch):
+    agent, cache = make_agent(tmp_path, GOOD)
+    key = agent.template_key("Software Engineer", "formal")
+    cache.put(key, GOOD)
+    monkeypatch.setattr(agent, "fill_template", lambda template, data: 1 / 0)
+
+    message = agent.generate_document_request(CANDIDATE)
+
+    assert message.startswith("Dear Rahul Sharma,")  # the built-in fallback
+    assert agent.ollama.calls == 0
+    assert cache.get(key) == GOOD
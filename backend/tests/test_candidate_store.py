@@ -0,0 +1,204 @@
+import json
+
+import pytest
+
+from models.candidate import CandidateStore
+from utils.exceptions import ConflictError
+
+
+def make_candidate(cid, created_at, **parsed):
+    return {
+        "id": cid,
+        "name": f"Person {cid}",
+        "email": f"{cid}@example.org",
+        "curr_company": "Acme",
+        "status": "pending_documents",
+        "parsed_data": {"parsed_data": parsed} if parsed else None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CandidateStore(str(tmp_path))
+
+
+def test_projection_tolerates_malformed_parsed_data(store):
+    store.save_candidates([
+        make_candidate("good", "2026-01-02", designation="Data Engineer", skills=["Python"]),
+        make_candidate("legacy", "2026-01-01"),
+    ])
+    with store._get_connection() as conn:
+        conn.execute("UPDATE candidates SET parsed_data = '{not json' WHERE id = 'legacy'")
+        conn.commit()
+
+    fields = ["name", "designation", "skills"]
+    items = store.list_candidates(1, 10, fields=fields)["items"]
+    assert [(c["id"], c["designation"], c["skills"]) for c in items] == [
+        ("good", "Data Engineer", ["Python"]),
+        ("legacy", None, []),
+    ]
+    assert store.get_candidates_by_ids(["legacy"], fields=fields)["legacy"]["designation"] is None
+    assert [c["id"] for c in store.search_candidates("Person", 1, 10, fields=fields)["items"]]
+
+
+def test_keyset_pages_walk_every_candidate_once(store):
+    # Ties on created_at are broken by id, so no row is skipped or repeated at a page edge
+    store.save_candidates([
+        make_candidate(f"c{i:02d}", f"2026-01-{1 + i // 3:02d}") for i in range(10)
+    ])
+    expected = [c["id"] for c in store.list_candidates(1, 10)["items"]]
+
+    seen, after = [], None
+    while True:
+        result = store.list_candidates(1, 3, after=after, with_total=False, fields=["name"])
+        seen += [c["id"] for c in result["items"]]
+        assert result["total"] is None
+        if not result["next_cursor"]:
+            break
+        after = store.parse_cursor(result["next_cursor"])
+
+    assert seen == expected
+    assert seen[:3] == ["c09", "c08", "c07"]
+
+
+def test_keyset_page_respects_status(store):
+    store.save_candidates([make_candidate(f"c{i}", f"2026-01-0{i + 1}") for i in range(4)])
+    store.bulk_update_status(["c0", "c2"], "rejected")
+    first = store.list_candidates(1, 1, status="rejected")
+    second = store.list_candidates(1, 1, status="rejected", after=store.parse_cursor(first["next_cursor"]))
+    assert [c["id"] for c in first["items"] + second["items"]] == ["c2", "c0"]
+
+
+@pytest.mark.parametrize("cursor", ["", "2026-01-01", ",c1", "2026-01-01,"])
+def test_parse_cursor_rejects_malformed_cursors(cursor):
+    with pytest.raises(ValueError):
+        CandidateStore.parse_cursor(cursor)
+
+
+def test_update_writes_only_the_given_columns(store):
+    store.save_candidate(make_candidate("c1", "2026-01-01", designation="Analyst"))
+    store.update_candidate("c1", {"status": "documents_requested"})
+    candidate = store.get_candidate("c1")
+    assert candidate["status"] == "documents_requested"
+    assert candidate["name"] == "Person c1"
+    assert candidate["parsed_data"] == {"parsed_data": {"designation": "Analyst"}}
+    assert candidate["updated_at"] != "2026-01-01"
+
+
+def test_update_with_a_stale_version_conflicts(store):
+    store.save_candidate(make_candidate("c1", "2026-01-01"))
+    read_at = store.get_updated_at("c1")
+    store.update_candidate("c1", {"status": "verified"}, expected_updated_at=read_at)
+
+    with pytest.raises(ConflictError):
+        store.update_candidate("c1", {"status": "rejected"}, expected_updated_at=read_at)
+    with pytest.raises(ConflictError):
+        store.set_json_fields("c1", "documents", {"$.pan": {"file": "pan.pdf"}}, expected_updated_at=read_at)
+    assert store.get_candidate("c1")["status"] == "verified"
+    assert store.get_candidate("c1")["documents"] == {}
+
+    store.set_json_fields("c1", "documents", {"$.pan": {"file": "pan.pdf"}},
+                          expected_updated_at=store.get_updated_at("c1"))
+    assert store.get_candidate("c1")["documents"] == {"pan": {"file": "pan.pdf"}}
+
+
+def test_update_of_a_missing_candidate_is_not_a_conflict(store):
+    with pytest.raises(ValueError):
+        store.update_candidate("nope", {"status": "verified"}, expected_updated_at="2026-01-01")
+
+
+def test_json_edits_keep_the_rest_of_the_blob(store):
+    store.save_candidate(make_candidate("c1", "2026-01-01"))
+    store.set_json_fields("c1", "documents", {"$.pan": {"file": "pan.pdf"}})
+    store.set_json_fields("c1", "documents", {"$.aadhaar": {"file": "aadhaar.pdf"}})
+    store.append_document_request("c1", {"documents": ["pan"]})
+    store.append_document_request("c1", {"documents": ["aadhaar"]}, changes={"status": "documents_requested"})
+
+    candidate = store.get_candidate("c1")
+    assert candidate["documents"] == {"pan": {"file": "pan.pdf"}, "aadhaar": {"file": "aadhaar.pdf"}}
+    assert candidate["document_requests"] == [{"documents": ["pan"]}, {"documents": ["aadhaar"]}]
+    assert candidate["status"] == "documents_requested"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("python django", '"python" "django"'),
+    ("python OR go", '"python" OR "go"'),
+    ("python NOT java", '"python" NOT "java"'),
+    ("pyth*", '"pyth"*'),
+    ('"data engineer" skills:spark', '"data engineer" skills : "spark"'),
+    ("c++: AND)(", '"c++:" "AND)("'),
+    ("OR python NOT", '"python"'),
+])
+def test_build_search_query(query, expected):
+    assert CandidateStore.build_search_query(query) == expected
+
+
+@pytest.mark.parametrize("query", ["", "   ", "OR NOT", "*** ()"])
+def test_build_search_query_rejects_queries_without_terms(query):
+    with pytest.raises(ValueError):
+        CandidateStore.build_search_query(query)
+
+
+def test_search_ranks_and_tracks_edits(store):
+    store.save_candidates([
+        make_candidate("py", "2026-01-01", designation="Backend Engineer", skills=["Python", "Django"]),
+        make_candidate("go", "2026-01-02", designation="Python Enthusiast", skills=["Go"]),
+        make_candidate("java", "2026-01-03", designation="Engineer", skills=["Java"]),
+    ])
+
+    result = store.search_candidates("python", 1, 10)
+    assert {c["id"] for c in result["items"]} == {"py", "go"}
+    assert result["total"] == 2
+    assert all("score" in c and "<mark>" in c["snippet"] for c in result["items"])
+    assert [c["id"] for c in store.search_candidates("skills:python", 1, 10)["items"]] == ["py"]
+    assert [c["id"] for c in store.search_candidates("engin* NOT python", 1, 10)["items"]] == ["java"]
+
+    store.update_candidate("java", {"name": "Pythonista Rao"})
+    assert [c["id"] for c in store.search_candidates("pythonista", 1, 10)["items"]] == ["java"]
+    store.bulk_update_status(["py"], "rejected")
+    assert [c["id"] for c in store.search_candidates("python", 1, 10, status="rejected")["items"]] == ["py"]
+
+
+def assert_rendered_matches_live(store, candidate_id):
+    api_json, _ = store.get_candidate_json(candidate_id)
+    assert json.loads(api_json) == store.get_candidate(candidate_id)
+    [summary] = [
+        c for c in store.list_candidates(1, 100, fields=store.SUMMARY_FIELDS, rendered=True)["items"]
+        if json.loads(c)["id"] == candidate_id
+    ]
+    live = store.get_candidates_by_ids([candidate_id])[candidate_id]
+    assert json.loads(summary) == live
+
+
+def test_rendered_json_matches_the_live_projection(store):
+    store.save_candidates([
+        make_candidate(
+            "full", "2026-01-01", designation="Data Engineer", skills=["Python", "SQL"],
+            experience_years=4.5, location={"city": "Pune"}, education=[{"degree": "BTech"}],
+        ),
+        make_candidate("bare", "2026-01-02"),
+        make_candidate("odd", "2026-01-03", skills="Python, SQL", experience_years="5+"),
+    ])
+    for candidate_id in ("full", "bare", "odd"):
+        assert_rendered_matches_live(store, candidate_id)
+
+    store.update_candidate("full", {"name": 'Asha "AR" Rao', "curr_company": None})
+    store.set_json_fields("full", "documents", {"$.pan": {"file": "pan.pdf"}})
+    store.append_document_request("full", {"documents": ["pan"]}, changes={"status": "documents_requested"})
+    store.bulk_update_status(["bare"], "rejected")
+    with store._get_connection() as conn:
+        conn.execute("UPDATE candidates SET parsed_data = '{not json' WHERE id = 'odd'")
+        conn.commit()
+    for candidate_id in ("full", "bare", "odd"):
+        assert_rendered_matches_live(store, candidate_id)
+
+
+def test_rendered_list_is_only_used_for_the_summary_projection(store):
+    store.save_candidate(make_candidate("c1", "2026-01-01", designation="Analyst"))
+    assert store.list_candidates(1, 10, rendered=True)["rendered"]
+    assert store.list_candidates(1, 10, fields=store.SUMMARY_FIELDS, rendered=True)["rendered"]
+    partial = store.list_candidates(1, 10, fields=["name", "designation"], rendered=True)
+    assert not partial["rendered"]
+    assert partial["items"] == [{"id": "c1", "created_at": "2026-01-01", "name": "Person c1", "designation": "Analyst"}]
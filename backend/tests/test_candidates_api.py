@@ -0,0 +1,117 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def client(flask_app, monkeypatch):
+    from routes import candidates
+
+    candidates.g_candidate_store.save_candidate({
+        "id": str(uuid.uuid4()),
+        "name": "Asha Rao",
+        "email": "asha@example.org",
+        "status": "pending_documents",
+        "parsed_data": {"parsed_data": {"designation": "Data Engineer", "skills": ["Python"]}},
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+    })
+    monkeypatch.setitem(flask_app.app.config, "PRERENDERED_JSON", True)
+    return flask_app.app.test_client()
+
+
+@pytest.mark.parametrize("fields", ["name,nmae", "resume_text", "name;email"])
+def test_list_rejects_unknown_fields(client, fields):
+    response = client.get(f"/candidates?fields={fields}")
+    assert response.status_code == 400
+    assert "Unknown fields" in response.get_json()["error"]
+
+
+def test_list_honours_fields_with_prerendered_json(client):
+    candidate = client.get("/candidates?fields=name,designation").get_json()["candidates"][0]
+    assert set(candidate) == {"id", "created_at", "name", "designation"}
+    assert candidate["designation"] == "Data Engineer"
+
+
+def test_list_default_projection_is_the_summary(client):
+    from routes import candidates
+
+    candidate = client.get("/candidates").get_json()["candidates"][0]
+    assert set(candidate) == set(candidates.g_candidate_store.SUMMARY_FIELDS)
+
+
+def test_search_rejects_unknown_fields(client):
+    assert client.get("/candidates/search?q=asha&fields=bogus").status_code == 400
+
+
+def test_search_finds_by_skill(client):
+    response = client.get("/candidates/search?q=skills:python")
+    assert response.status_code == 200
+    assert "Asha Rao" in [c["name"] for c in response.get_json()["candidates"]]
+
+
+@pytest.mark.parametrize("q", ["OR", "***"])
+def test_search_rejects_queries_without_terms(client, q):
+    assert client.get(f"/candidates/search?q={q}").status_code == 400
+
+
+def save(candidate_id, **changes):
+    from routes import candidates
+
+    candidates.g_candidate_store.save_candidate({
+        "id": candidate_id,
+        "name": "Ravi Iyer",
+        "email": "ravi@example.org",
+        "status": "pending_documents",
+        "created_at": "2026-02-01T00:00:00",
+        "updated_at": "2026-02-01T00:00:00",
+        **changes,
+    })
+
+
+def test_candidate_revalidates_with_304_until_it_changes(client):
+    from routes import candidates
+
+    candidate_id = str(uuid.uuid4())
+    save(candidate_id)
+    first = client.get(f"/candidates/{candidate_id}")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and etag
+    assert first.headers["Cache-Control"].startswith("private")
+
+    again = client.get(f"/candidates/{candidate_id}", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b""
+    assert again.headers["ETag"] == etag
+    # A compressing proxy hands back the tag as weak
+    weak = client.get(f"/candidates/{candidate_id}", headers={"If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304
+
+    candidates.g_candidate_store.update_candidate(candidate_id, {"status": "verified"})
+    changed = client.get(f"/candidates/{candidate_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["candidate"]["status"] == "verified"
+
+
+def test_missing_candidate_is_404_even_with_if_none_match(client):
+    assert client.get("/candidates/nope", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_list_revalidates_with_304_until_any_candidate_changes(client):
+    first = client.get("/candidates?per_page=5")
+    etag = first.headers["ETag"]
+    assert client.get("/candidates?per_page=5", headers={"If-None-Match": etag}).status_code == 304
+    # The tag covers the query, so another page or projection is not served from it
+    assert client.get("/candidates?per_page=6", headers={"If-None-Match": etag}).status_code == 200
+
+    save(str(uuid.uuid4()))
+    changed = client.get("/candidates?per_page=5", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+@pytest.mark.parametrize("url", ["/candidates?per_page=100", "/candidates?per_page=100&fields=full"])
+def test_prerendered_list_matches_the_live_one(client, flask_app, monkeypatch, url):
+    prerendered = client.get(url).get_json()
+    monkeypatch.setitem(flask_app.app.config, "PRERENDERED_JSON", False)
+    assert client.get(url).get_json() == prerendered
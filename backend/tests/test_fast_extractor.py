@@ -0,0 +1,36 @@
+from services.fast_extractor import FastExtractor, FastPathPolicy
+
+REQUIRED = ["name", "email", "phone", "experience_years", "skills"]
+
+RESUME = """Curriculum Vitae
+Rahul Sharma
+rahul.sharma@example.com | +91 98765 43210
+
+Summary
+Backend developer with 6 years of experience.
+
+Skills
+Python, Django, PostgreSQL, Docker, AWS
+"""
+
+
+def test_heading_is_not_taken_as_the_name():
+    result = FastExtractor().extract(RESUME)
+    assert result["parsed_data"]["name"] == "Rahul Sharma"
+
+
+def test_job_title_line_is_not_taken_as_the_name():
+    result = FastExtractor().extract("Senior Software Engineer\nPriya Nair\npriya@example.com\n")
+    assert result["parsed_data"]["name"] == "Priya Nair"
+
+
+def test_guessed_name_cannot_skip_the_llm():
+    result = FastExtractor().extract(RESUME)
+    assert result["confidence"]["name"] < 0.8
+    assert not FastPathPolicy(REQUIRED, min_confidence=0.8).allows_skip(result)
+
+
+def test_labelled_name_can_skip_the_llm():
+    result = FastExtractor().extract("Name: Rahul Sharma\n" + RESUME)
+    assert result["parsed_data"]["name"] == "Rahul Sharma"
+    assert FastPathPolicy(REQUIRED, min_confidence=0.8).allows_skip(result)
@@ -0,0 +1,107 @@
+import hashlib
+import multiprocessing
+import time
+
+import pytest
+from PIL import Image
+
+from services import ocr
+from services.ocr import OcrCache, OcrEngine
+
+
+@pytest.fixture
+def tesseract(monkeypatch):
+    """Stands in for Tesseract: returns the image bytes' length and records each call."""
+    calls = []
+
+    def fake_ocr(image_bytes, lang, tesseract_cmd, timeout=0):
+        calls.append(image_bytes)
+        return f"text-{len(image_bytes)}"
+
+    monkeypatch.setattr(ocr, "pytesseract", object())
+    monkeypatch.setattr(ocr, "_ocr_image", fake_ocr)
+    return calls
+
+
+def test_counts_pages_not_images(tesseract):
+    result = OcrEngine(max_workers=1).ocr_pages([[b"a", b"bb"], [], [b"ccc"]])
+    assert result.pages == 2
+    assert result.text == "text-1\ntext-2\ntext-3"
+    assert len(tesseract) == 3
+
+
+def test_cached_pages_need_every_image_cached(tesseract, tmp_path):
+    engine = OcrEngine(cache=OcrCache(str(tmp_path)), max_workers=1)
+    engine.ocr_pages([[b"a"]])
+    result = engine.ocr_pages([[b"a"], [b"a", b"bb"]])
+    assert (result.pages, result.cached_pages) == (2, 1)
+    assert tesseract == [b"a", b"bb"]
+
+
+def test_pdf_cap_applies_to_pages(tesseract, tmp_path):
+    path = tmp_path / "scan.pdf"
+    scans = [Image.new("RGB", (40, 40), color) for color in ("white", "grey", "black")]
+    scans[0].save(path, save_all=True, append_images=scans[1:])
+
+    result = OcrEngine(max_workers=1, max_pages=2).ocr_file(str(path))
+    assert result.pages == 2
+    assert len(tesseract) == 2
+
+
+def test_unavailable_without_tesseract(monkeypatch):
+    monkeypatch.setattr(ocr, "pytesseract", None)
+    with pytest.raises(RuntimeError):
+        OcrEngine().ocr_pages([[b"a"]])
+
+
+def _slow_ocr(image_bytes, lang, tesseract_cmd, timeout=0):
+    time.sleep(0.3)
+    if image_bytes == b"stuck":
+        raise RuntimeError("Tesseract process timeout")
+    return f"text-{len(image_bytes)}"
+
+
+def _ocr_in_daemon(queue):
+    engine = OcrEngine(max_workers=3)
+    started = time.monotonic()
+    result = engine.ocr_pages([[b"a"], [b"bb"], [b"ccc"]])
+    queue.put((multiprocessing.current_process().daemon, time.monotonic() - started, result.text))
+
+
+def test_pages_run_in_parallel_inside_a_daemonic_process(monkeypatch):
+    # Celery prefork children are daemonic; OCR there must still run pages concurrently
+    monkeypatch.setattr(ocr, "pytesseract", object())
+    monkeypatch.setattr(ocr, "_ocr_image", _slow_ocr)
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_ocr_in_daemon, args=(queue,), daemon=True)
+    process.start()
+    daemon, elapsed, text = queue.get(timeout=30)
+    process.join(10)
+
+    assert daemon
+    assert elapsed < 0.8
+    assert text == "text-1\ntext-2\ntext-3"
+
+
+def test_timed_out_image_is_skipped_and_not_cached(monkeypatch, tmp_path):
+    monkeypatch.setattr(ocr, "pytesseract", object())
+    monkeypatch.setattr(ocr, "_ocr_image", _slow_ocr)
+    cache = OcrCache(str(tmp_path))
+    engine = OcrEngine(cache=cache, max_workers=2)
+
+    result = engine.ocr_pages([[b"a"], [b"stuck"]])
+
+    assert result.text == "text-1\n"
+    hashes = [hashlib.sha256(image).hexdigest() for image in (b"a", b"stuck")]
+    assert list(cache.get_many(hashes, "eng")) == [hashes[0]]
+
+
+def test_other_tesseract_errors_still_raise(monkeypatch):
+    def broken(image_bytes, lang, tesseract_cmd, timeout=0):
+        raise RuntimeError("Tesseract failed")
+
+    monkeypatch.setattr(ocr, "pytesseract", object())
+    monkeypatch.setattr(ocr, "_ocr_image", broken)
+    with pytest.raises(RuntimeError):
+        OcrEngine(max_workers=1).ocr_pages([[b"a"]])
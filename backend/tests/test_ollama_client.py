@@ -0,0 +1,67 @@
+import os
+import json
+import time
+
+from services.circuit_breaker import CircuitBreaker
+from services.latency import AdaptiveTimeout
+from services.ollama_client import OllamaClient
+
+
+class SlowStream:
+    """A 200 response whose headers arrive at once and whose tokens trickle in."""
+
+    status_code = 200
+
+    def __init__(self, tokens, delay):
+        self.tokens = tokens
+        self.delay = delay
+
+    def iter_lines(self):
+        for token in self.tokens:
+            time.sleep(self.delay)
+            yield json.dumps({"response": token, "done": False}).encode()
+        yield json.dumps({"response": "", "done": True}).encode()
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def post(self, url, json=None, timeout=None, stream=False):
+        return self.response
+
+
+def streaming_client(delay):
+    client = OllamaClient(
+        max_in_flight=1,
+        breaker=CircuitBreaker(failure_threshold=1, cooldown=60, slo_seconds=0.1),
+        adaptive_timeout=AdaptiveTimeout(min_samples=1),
+    )
+    client._session = FakeSession(SlowStream(["a", "b", "c"], delay))
+    client._session_pid = os.getpid()
+    return client
+
+
+def test_stream_latency_is_recorded_when_the_stream_ends():
+    client = streaming_client(delay=0.05)
+    tokens = client.generate_stream("m", "x" * 1000)
+    assert next(tokens) == "a"
+    assert client.adaptive_timeout.stats() == {}  # headers alone record nothing
+    assert list(tokens) == ["b", "c"]
+    samples = client.adaptive_timeout._samples["stream"]
+    assert len(samples) == 1 and samples[0] >= 0.15
+    # Over the 0.1s SLO, so the single allowed bad call trips the breaker
+    assert client.breaker.stats()["state"] == "open"
+
+
+def test_stream_closed_early_records_nothing():
+    client = streaming_client(delay=0.05)
+    tokens = client.generate_stream("m", "prompt")
+    next(tokens)
+    tokens.close()
+    assert client.adaptive_timeout.stats() == {}
+    assert client.breaker.stats()["state"] == "closed"
+    assert client._slots.acquire(blocking=False)
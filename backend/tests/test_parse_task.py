@@ -0,0 +1,83 @@
+import pytest
+
+from models.candidate import CandidateStore
+from services import container
+from services.dedupe import DuplicateMatch
+from tasks.parse_resume_llm import process_resume_background
+
+TEXT = "Rahul Sharma\nrahul@example.com\nBackend developer with Python and Django. " * 3
+FULL_PARSE = {"parsed_data": {"name": "LLM Name", "skills": ["Python"]}, "confidence": {"name": 0.9}}
+
+
+class StubParser:
+    def __init__(self):
+        self.llm_calls = 0
+
+    def extract_text(self, path):
+        return TEXT
+
+    def parse_resume(self, path, on_partial=None, text=None):
+        self.llm_calls += 1
+        return FULL_PARSE
+
+    def reuse_parse(self, existing, text):
+        return existing
+
+
+class StubDuplicates:
+    def add(self, candidate_id, text):
+        return DuplicateMatch("original", 0.99)
+
+    def can_reuse_parse(self, match):
+        return True
+
+
+class StubRanking:
+    def upsert(self, *args):
+        pass
+
+
+def _candidate(cid, status, parsed_data):
+    return {"id": cid, "status": status, "parsed_data": parsed_data, "documents": {}, "document_requests": [],
+            "created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}
+
+
+@pytest.fixture
+def task_env(tmp_path, monkeypatch):
+    store = CandidateStore(str(tmp_path))
+    parser = StubParser()
+    monkeypatch.setattr(container, "candidate_store", lambda: store)
+    monkeypatch.setattr(container, "resume_parser", lambda: parser)
+    monkeypatch.setattr(container, "duplicate_index", lambda: StubDuplicates())
+    monkeypatch.setattr(container, "ranking_index", lambda: StubRanking())
+    monkeypatch.setattr(container, "progress_publisher", lambda: None)
+    return store, parser
+
+
+def test_reuses_a_finished_parse(task_env):
+    store, parser = task_env
+    finished = {"parsed_data": {"name": "Rahul Sharma", "skills": ["Python", "Django"]}, "confidence": {}}
+    store.save_candidate(_candidate("original", "pending_documents", finished))
+    store.save_candidate(_candidate("copy", "parsing_resume", {}))
+
+    process_resume_background("copy", "copy.pdf")
+
+    assert parser.llm_calls == 0
+    copy = store.get_candidate("copy")
+    assert copy["parsed_data"] == finished
+    assert copy["duplicate_of"] == "original"
+
+
+def test_does_not_reuse_a_parse_still_in_progress(task_env):
+    store, parser = task_env
+    # Partial fields streamed in while the original's own task is still running
+    partial = {"parsed_data": {"name": "Rahul Sharma"}, "confidence": {"name": 0.9}}
+    store.save_candidate(_candidate("original", "parsing_resume", partial))
+    store.save_candidate(_candidate("copy", "parsing_resume", {}))
+
+    process_resume_background("copy", "copy.pdf")
+
+    assert parser.llm_calls == 1
+    copy = store.get_candidate("copy")
+    assert copy["parsed_data"] == FULL_PARSE
+    assert copy["status"] == "pending_documents"
@@ -0,0 +1,84 @@
+import multiprocessing
+import time
+
+from services import pdf_extractor
+from services.pdf_extractor import PdfTextExtractor
+
+
+def write_pdf(path, page_texts):
+    """A minimal PDF with one line of Helvetica text per page."""
+    count = len(page_texts)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count)), count),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = b"BT /F1 12 Tf 72 720 Td (%s) Tj ET" % text.encode()
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+    return str(path)
+
+
+def _extract_in_daemon(path, queue):
+    started = []
+
+    class CountingProcess(pdf_extractor.Process):
+        def start(self):
+            started.append(self)
+            super().start()
+
+    pdf_extractor.Process = CountingProcess
+    result = PdfTextExtractor("pypdf", parallel_min_pages=2, max_workers=2).extract(path)
+    queue.put((multiprocessing.current_process().daemon, len(started), result.text))
+
+
+def test_pool_runs_inside_a_daemonic_process(tmp_path):
+    # Celery prefork children are daemonic; extraction there must still use the pool
+    path = write_pdf(tmp_path / "cv.pdf", [f"Page {i}" for i in range(6)])
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    process = context.Process(target=_extract_in_daemon, args=(path, queue), daemon=True)
+    process.start()
+    daemon, workers, text = queue.get(timeout=30)
+    process.join(10)
+
+    assert daemon and workers == 2
+    assert text.split("\n") == [f"Page {i}" for i in range(6)]
+
+
+def _stuck_on_first_page(backend, file_path, pages, deadline):
+    for index in pages:
+        if index == 0:
+            time.sleep(60)
+        yield index, f"page {index}", 0.0
+
+
+def test_stuck_page_is_killed_at_the_budget(tmp_path, monkeypatch):
+    path = write_pdf(tmp_path / "cv.pdf", [f"Page {i}" for i in range(4)])
+    monkeypatch.setattr(pdf_extractor, "_extract_pages", _stuck_on_first_page)
+    monkeypatch.setattr(pdf_extractor, "PAGE_GRACE_SECONDS", 0.5)
+    extractor = PdfTextExtractor("pypdf", time_budget=0.5, parallel_min_pages=4, max_workers=2)
+
+    started = time.monotonic()
+    result = extractor.extract(path)
+
+    assert time.monotonic() - started < 10
+    assert result.truncated
+    # Pages 0 and 2 share the stuck worker; page 2 is lost with it, pages 1 and 3 arrive
+    assert result.text == "page 1\npage 3"
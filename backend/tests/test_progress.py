@@ -0,0 +1,34 @@
+import json
+
+from services.progress import ProgressPublisher, ProgressStream
+
+
+def events(chunks):
+    return [chunk.split("\n", 1)[0].removeprefix("event: ") for chunk in chunks]
+
+
+def test_batch_events_go_to_the_candidate_and_batch_channels(redis_client):
+    publisher = ProgressPublisher(redis_client)
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(publisher.channel("c1"), publisher.batch_channel("b1"))
+
+    publisher.publish("c1", "done", batch_id="b1", status="pending_documents")
+
+    received = [m for m in (pubsub.get_message(timeout=0.1) for _ in range(10)) if m]
+    assert {m["channel"].decode() for m in received} == {"progress:candidate:c1", "progress:batch:b1"}
+    assert json.loads(received[0]["data"])["candidate_id"] == "c1"
+
+
+def test_batch_stream_uses_one_subscription(redis_client):
+    publisher = ProgressPublisher(redis_client)
+    stream = ProgressStream(publisher, poll_interval=0.05, max_seconds=5)
+    members = [f"c{i}" for i in range(50)]
+
+    chunks = stream.stream(publisher.batch_channel("b1"), lambda: ({"total": 50}, set(members)))
+    first = next(chunks)
+    assert redis_client.pubsub_numsub(publisher.batch_channel("b1"))[0][1] == 1
+    assert redis_client.pubsub_channels() == [publisher.batch_channel("b1").encode()]
+
+    for cid in members:
+        publisher.publish(cid, "done", batch_id="b1")
+    assert events([first, *chunks]) == ["snapshot"] + ["progress"] * 50 + ["end"]
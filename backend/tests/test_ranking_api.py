@@ -0,0 +1,37 @@
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def client(flask_app):
+    return flask_app.app.test_client()
+
+
+@pytest.mark.parametrize("fields", ["name,email", [1, 2], ["name", "nmae"], {"name": True}])
+def test_rank_rejects_bad_fields(client, fields):
+    response = client.post("/candidates/rank", json={"query": "python", "fields": fields})
+    assert response.status_code == 400
+
+
+def test_rank_accepts_known_fields(client):
+    response = client.post("/candidates/rank", json={"query": "python", "fields": ["name", "skills"]})
+    assert response.status_code == 200
+
+
+def test_worker_backfills_an_empty_ranking_index(flask_app):
+    import celery_worker
+    from services import container
+
+    container.candidate_store().save_candidate({
+        "id": str(uuid.uuid4()),
+        "name": "Meera Iyer",
+        "status": "pending_documents",
+        "parsed_data": {"parsed_data": {"skills": ["Python", "Django"], "designation": "Backend Engineer"}},
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00",
+    })
+    assert container.ranking_index().count() == 0  # the web process no longer backfills at import
+
+    assert celery_worker.backfill_ranking_index() >= 1
+    assert celery_worker.backfill_ranking_index() == 0
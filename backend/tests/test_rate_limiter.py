@@ -0,0 +1,89 @@
+import time
+
+import pytest
+import redis
+
+from services.ollama_client import OllamaClient
+from services.rate_limiter import RedisSemaphore
+
+
+def test_acquire_up_to_limit(redis_client):
+    sem = RedisSemaphore(redis_client, limit=2)
+    first, second = sem.acquire(timeout=1), sem.acquire(timeout=1)
+    assert first and second and first != second
+    assert sem.in_use() == 2
+
+
+def test_acquire_past_limit_times_out(redis_client):
+    sem = RedisSemaphore(redis_client, limit=1, poll_interval=0.02)
+    assert sem.acquire(timeout=1)
+    started = time.monotonic()
+    assert sem.acquire(timeout=0.2) is None
+    assert time.monotonic() - started >= 0.2
+
+
+def test_release_frees_a_slot(redis_client):
+    sem = RedisSemaphore(redis_client, limit=1, poll_interval=0.02)
+    token = sem.acquire(timeout=1)
+    sem.release(token)
+    assert sem.acquire(timeout=0.2)
+
+
+def test_expired_lease_is_reclaimed(redis_client):
+    sem = RedisSemaphore(redis_client, limit=1, lease_seconds=0.2, poll_interval=0.02)
+    assert sem.acquire(timeout=1)  # never released, like a worker that died mid-call
+    assert sem.acquire(timeout=1)
+    assert redis_client.zcard(sem.key) == 1
+
+
+def test_fails_open_when_redis_is_down(redis_server, redis_client):
+    sem = RedisSemaphore(redis_client, limit=1)
+    redis_server.connected = False
+    assert sem.acquire(timeout=1) == ""
+    sem.release("")
+    assert sem.in_use() == -1
+
+
+class TimingOutRedis:
+    """A client whose every command times out, like Redis behind socket_timeout."""
+
+    def __getattr__(self, name):
+        def timeout(*args, **kwargs):
+            raise redis.exceptions.TimeoutError("Timeout reading from socket")
+        return timeout
+
+
+def test_fails_open_when_redis_times_out():
+    sem = RedisSemaphore(TimingOutRedis(), limit=1)
+    assert sem.acquire(timeout=1) == ""
+    sem.release("token")
+    assert sem.in_use() == -1
+
+
+class BrokenLimiter:
+    def acquire(self, timeout=None):
+        raise RuntimeError("limiter bug")
+
+    def release(self, token):
+        raise RuntimeError("limiter bug")
+
+
+def test_client_gives_back_its_local_slot_when_the_limiter_fails():
+    client = OllamaClient(max_in_flight=1, cluster_limiter=BrokenLimiter())
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            client._acquire_slot()
+    client.cluster_limiter = RedisSemaphore(TimingOutRedis(), limit=1)
+    for _ in range(3):
+        lease = client._acquire_slot()
+        client._release_slot(lease)
+    assert client._slots.acquire(blocking=False)
+
+
+def test_client_releases_its_local_slot_even_if_cluster_release_fails():
+    client = OllamaClient(max_in_flight=1)
+    client.cluster_limiter = BrokenLimiter()
+    client._slots.acquire()
+    with pytest.raises(RuntimeError):
+        client._release_slot("lease")
+    assert client._slots.acquire(blocking=False)
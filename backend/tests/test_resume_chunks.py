@@ -0,0 +1,58 @@
+import json
+
+from services.resume_parser import ResumeParser
+
+HEADER = "Rahul Sharma\nrahul@example.com | +91 98765 43210\n"
+BODY = "\n".join(f"Experience\nBackend developer at Acme {i}, built Python services." for i in range(12))
+
+
+class StubOllama:
+    """Answers header prompts with the real contact details and other prompts with the examples."""
+
+    def __init__(self, header_fields):
+        self.header_fields = header_fields
+        self.prompts = []
+
+    def generate(self, model, prompt, **kwargs):
+        self.prompts.append(prompt)
+        if "Rahul Sharma" in prompt:
+            fields = self.header_fields
+        else:
+            fields = {
+                "name": {"value": "John Doe", "confidence": 0.95},
+                "email": {"value": "john@example.com", "confidence": 0.98},
+                "designation": {"value": "Backend Developer", "confidence": 0.9},
+                "skills": {"value": ["Python"], "confidence": 0.9},
+            }
+        return json.dumps({"fields": fields})
+
+
+def _parser(ollama, chunk_chars):
+    return ResumeParser(ollama_client=ollama, stream=False, chunk_chars=chunk_chars)
+
+
+def test_identity_fields_come_only_from_the_header_chunk():
+    ollama = StubOllama({
+        "name": {"value": "Rahul Sharma", "confidence": 0.8},
+        "email": {"value": "rahul@example.com", "confidence": 0.9},
+    })
+    result = _parser(ollama, chunk_chars=300)._extract_with_llm(HEADER + BODY)
+
+    assert len(ollama.prompts) > 1
+    assert sum("- name" in p for p in ollama.prompts) == 1
+    assert result["parsed_data"]["name"] == "Rahul Sharma"
+    assert result["parsed_data"]["email"] == "rahul@example.com"
+    assert result["parsed_data"]["designation"] == "Backend Developer"
+
+
+def test_prompt_examples_echoed_back_are_dropped():
+    ollama = StubOllama({
+        "name": {"value": "John Doe", "confidence": 0.95},
+        "phone": {"value": "+123456789", "confidence": 0.85},
+        "location": {"value": "Pune", "confidence": 0.8},
+    })
+    result = _parser(ollama, chunk_chars=4000)._extract_with_llm(HEADER)
+
+    assert "name" not in result["parsed_data"]
+    assert "phone" not in result["parsed_data"]
+    assert result["parsed_data"]["location"] == "Pune"
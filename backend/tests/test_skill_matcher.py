@@ -0,0 +1,43 @@
+import pytest
+
+from services.skill_matcher import AhoCorasick, get_skill_matcher
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return get_skill_matcher()
+
+
+def test_automaton_finds_overlapping_patterns():
+    ac = AhoCorasick()
+    for word in ("he", "she", "hers"):
+        ac.add(word, word)
+    assert sorted(v for _, _, v in ac.find_all("ushers")) == ["he", "hers", "she"]
+
+
+def test_longest_match_and_aliases(matcher):
+    assert matcher.find("Built services in C++ and Spring Boot with golang") == ["C++", "Spring Boot", "Go"]
+
+
+def test_word_boundaries(matcher):
+    assert "Java" not in matcher.find("Frontend work in JavaScript")
+
+
+@pytest.mark.parametrize("text", [
+    "Rahul C. Sharma",
+    "Led R&D team of five",
+    "Owned the Go-to-market strategy",
+    "Ruby Singh, Senior Analyst",
+    "Reviewed by D. Rust",
+])
+def test_names_and_abbreviations_are_not_skills(matcher, text):
+    assert matcher.find(text) == []
+
+
+def test_ambiguous_terms_count_in_a_list(matcher):
+    assert matcher.find("Languages: C, R, Go, Ruby | Rust") == ["C", "R", "Go", "Ruby", "Rust"]
+
+
+def test_ambiguous_terms_count_in_a_skills_section(matcher):
+    assert matcher.find("Swift and Rust", skills_section=True) == ["Swift", "Rust"]
+    assert matcher.find("Swift and Rust") == []
@@ -14,6 +14,11 @@ class NotFoundError(Exception):
     pass
 
 
+class ConflictError(Exception):
+    """Raised when a write loses an optimistic concurrency check"""
+    pass
+
+
 class StorageError(Exception):
     """Raised when storage operation fails"""
     pass
@@ -21,4 +26,16 @@ class StorageError(Exception):
 
 class AIServiceError(Exception):
     """Raised when AI service call fails"""
-    pass
\ No newline at end of file
+    pass
+
+
+class CircuitOpenError(AIServiceError):
+    """Raised instead of calling the AI service while its circuit breaker is open"""
+    pass
+
+class OverloadedError(Exception):
+    """Raised when work is refused to protect a saturated backend; carries a Retry-After hint"""
+
+    def __init__(self, message: str, retry_after: int = 30):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,82 @@
+import gzip
+from typing import Any, Union
+
+import orjson
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not handle natively but Flask's provider does."""
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, which encodes straight to bytes."""
+
+    option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=self.option).decode("utf-8")
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option)
+        return self._app.response_class(body, mimetype="application/json")
+
+
+def raw_json_response(body: str, status: int = 200) -> Response:
+    """A JSON response from text that is already serialized (e.g. stored api_json)."""
+    return Response(body, status=status, mimetype="application/json")
+
+
+def init_compression(app: Flask, min_bytes: int = 1024, level: int = 6) -> None:
+    """
+    Compress JSON responses of at least `min_bytes` with brotli when the
+    client accepts it and the package is installed, else gzip. Streamed
+    responses (Server-Sent Events) are left alone. A strong ETag becomes weak
+    since the bytes now depend on the encoding; conditional GETs compare weakly.
+    """
+
+    @app.after_request
+    def compress(response: Response) -> Response:
+        if (
+            response.status_code != 200
+            or response.mimetype != "application/json"
+            or response.is_streamed
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+        ):
+            return response
+        response.vary.add("Accept-Encoding")
+
+        accepted = request.accept_encodings
+        if brotli is not None and accepted["br"]:
+            encoding = "br"
+        elif accepted["gzip"]:
+            encoding = "gzip"
+        else:
+            return response
+        data = response.get_data()
+        if len(data) < min_bytes:
+            return response
+
+        if encoding == "br":
+            response.set_data(brotli.compress(data, quality=min(11, level)))
+        else:
+            response.set_data(gzip.compress(data, compresslevel=level, mtime=0))
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
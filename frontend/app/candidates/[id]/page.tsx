@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from "react";
 import { useParams } from "next/navigation";
-import { getCandidate, requestDocuments } from "@/lib/client";
+import { getCandidate, requestDocuments, subscribeCandidateEvents } from "@/lib/client";
 import type { CandidateProfileData } from "@/lib/types";
 import { utcToIndianTime } from "@/utils/utcToIndianTime";
 import Link from "next/link";
@@ -37,6 +37,17 @@ export default function CandidateProfilePage() {
     return () => controller.abort();
   }, [id]);
 
+  // Refresh as the background task fills in fields instead of polling
+  const status = data?.candidate?.status;
+  useEffect(() => {
+    if (!id || (status !== "parsing_resume" && status !== "document_request_pending")) return;
+    return subscribeCandidateEvents(id, (event) => {
+      if (event.stage === "partial_fields" || event.stage === "done" || event.stage === "failed") {
+        getCandidate(id).then((res) => setData(res || null)).catch(() => {});
+      }
+    });
+  }, [id, status]);
+
   useEffect(() => {
     document.title = data?.candidate?.name
       ? `${data.candidate.name} - HireBuddy`
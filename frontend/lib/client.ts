@@ -6,7 +6,8 @@ export async function listCandidates(page: number, pageSize: number = 10, signal
   console.log("Fetching:", url);
 
   try {
-    const res = await fetch(url, { signal, cache: "no-store" });
+    // no-cache revalidates with the stored ETag; unchanged pages come back as a bodiless 304
+    const res = await fetch(url, { signal, cache: "no-cache" });
     const text = await res.text();
     console.log("Raw response:", res.status, text);
 
@@ -43,7 +44,7 @@ export async function listCandidates(page: number, pageSize: number = 10, signal
 
 
 export async function getCandidate(id: string, signal?: AbortSignal): Promise<CandidateProfileData> {
-  const res = await fetch(`${API_BASE_URL}/candidates/${id}`, { signal, cache: 'no-store' });
+  const res = await fetch(`${API_BASE_URL}/candidates/${id}`, { signal, cache: 'no-cache' });
   if (!res.ok) throw new Error('Failed to fetch candidate');
   return res.json();
 }
@@ -113,3 +114,32 @@ export async function submitDocuments(
 
   return data;
 }
+
+export type ProgressEvent = {
+  candidate_id: string;
+  stage: "text_extracted" | "llm_started" | "partial_fields" | "done" | "failed";
+  status?: string;
+  fields?: string[];
+  timestamp: string;
+};
+
+/**
+ * Follows a candidate's background task over Server-Sent Events.
+ * Returns a function that closes the stream.
+ */
+export function subscribeCandidateEvents(
+  candidateId: string,
+  onProgress: (event: ProgressEvent) => void,
+  onEnd?: () => void
+): () => void {
+  const source = new EventSource(`${API_BASE_URL}/candidates/${candidateId}/events`);
+  source.addEventListener("progress", (e) => onProgress(JSON.parse((e as MessageEvent).data)));
+  // Close explicitly, otherwise EventSource reconnects once the server ends the stream
+  const close = () => {
+    source.close();
+    onEnd?.();
+  };
+  source.addEventListener("end", close);
+  source.addEventListener("error", close);
+  return () => source.close();
+}